@@ -32,30 +32,47 @@ except ImportError:
     class SimpleApiPlugin(object):
         pass
 import os
+import sqlite3
 import time
 import threading
+import uuid
+from collections import deque
 try:
-    from flask import make_response, request, jsonify
+    from flask import Response, make_response, request, jsonify, stream_with_context
 except ImportError:
     request = None
 
+    def Response(*args, **kwargs):
+        raise RuntimeError("Flask is required for response generation")
+
+    def stream_with_context(generator):
+        return generator
+
     def make_response(*args, **kwargs):
         raise RuntimeError("Flask is required for response generation")
 
     def jsonify(*args, **kwargs):
         raise RuntimeError("Flask is required for JSON responses")
-import csv
 from .phase1_pure import (
-    compute_elapsed_seconds,
-    accumulate_tool_seconds,
-    accumulate_nozzle_seconds,
-    extract_tool_id_from_command,
+    carry_elapsed_units,
+    compute_elapsed_units,
+    accumulate_tool_seconds_inplace,
+    accumulate_nozzle_seconds_inplace,
 )
 from .phase1_settings import (
     ensure_phase2_settings,
     dedupe_profiles,
     reset_tool_state,
+    build_nozzle_detail,
+    build_status_delta,
+    build_status_nozzle_entry,
     build_status_payload,
+    build_status_payload_index,
+    build_status_etag,
+    etag_matches,
+    normalize_status_fields,
+    patch_status_payload_runtime,
+    project_status_payload,
     normalize_tool_id,
     validate_unique_nozzle_assignments,
     validate_assign_nozzle_allowed,
@@ -64,15 +81,64 @@ from .phase1_settings import (
     RETIRE_ASSIGNED_NOZZLE_MESSAGE,
 )
 from .runtime_state import (
+    RUNTIME_JOURNAL_FILENAME,
     RUNTIME_STATE_FILENAME,
+    append_runtime_journal,
     apply_runtime_state_to_nozzles,
+    build_runtime_journal_record,
     build_runtime_state,
+    compact_runtime_state_file,
     has_legacy_runtime_state,
-    load_runtime_state_file,
-    save_runtime_state_file,
+    load_runtime_state_generations,
+    runtime_state_view,
     should_snapshot_runtime_state,
-    strip_runtime_state_from_settings,
 )
+from .runtime_writer import RuntimeStateWriter
+from .records import ProfileRecord, ToolStateRecord
+from .state_snapshot import (
+    PublishingLock,
+    StateSnapshot,
+    live_counters,
+    refresh_inventory_section,
+    refresh_small_section,
+)
+from .counter_store import (
+    COUNTER_FILENAME,
+    RUNTIME_STORAGE_BACKENDS,
+    CounterFile,
+    apply_counters_to_runtime_state,
+    nozzle_counter_key,
+    runtime_state_counters,
+    tool_counter_key,
+)
+from .job_ledger import JOB_LEDGER_FILENAME, JobLedger
+from .replacement_archive import REPLACEMENT_ARCHIVE_DIRNAME, ReplacementLogArchive
+from .export_stream import (
+    EXPORT_CSV_FIELDS,
+    EXPORT_FORMATS,
+    gzip_stream,
+    iter_job_records,
+    iter_nozzle_records,
+    iter_replacement_records,
+    normalize_export_datasets,
+    parse_export_bound,
+    stream_csv,
+    stream_jsonl,
+)
+from .inventory_store import (
+    INVENTORY_FILENAME,
+    INVENTORY_JOURNAL_FILENAME,
+    INVENTORY_SECTIONS,
+    append_inventory_journal,
+    build_inventory,
+    build_inventory_journal_records,
+    compact_inventory_file,
+    default_inventory,
+    has_inventory,
+    load_inventory_file,
+)
+from .nozzle_index import NozzleInventoryIndex, NOZZLE_QUERY_FILTERS
+from .tool_change_matcher import ToolChangeMatcher, build_tool_change_matcher
 
 __plugin_name__ = "Nozzle Life Tracker"
 __plugin_version__ = "0.3.7"
@@ -87,6 +153,24 @@ PHASE1_TICK_SECONDS = 5
 PHASE1_PERSIST_SECONDS = 60
 PHASE1_PERSIST_INTERVAL_SECONDS = PHASE1_PERSIST_SECONDS
 PHASE1_PERSIST_CHECK_INTERVAL_SECONDS = PHASE1_TICK_SECONDS
+PHASE1_JOURNAL_COMPACT_RECORDS = 1024
+INVENTORY_JOURNAL_COMPACT_RECORDS = 512
+PHASE1_SHUTDOWN_FLUSH_TIMEOUT_SECONDS = 10
+STATUS_CHANGE_HISTORY_SIZE = 256
+STATUS_PUSH_MAX_RATE_HZ = 1.0
+PERSIST_DURABILITY_MODES = ("strict", "group", "periodic")
+PERSIST_DEFAULT_DURABILITY = "group"
+PERSIST_GROUP_COMMIT_MS = 250
+ACCOUNTING_MODES = ("tick", "tickless")
+NOZZLE_QUERY_DEFAULT_LIMIT = 50
+NOZZLE_QUERY_MAX_LIMIT = 500
+JOB_QUERY_DEFAULT_LIMIT = 100
+JOB_QUERY_MAX_LIMIT = 1000
+JOB_FINISH_STATUSES = {
+    "PrintDone": "done",
+    "PrintFailed": "failed",
+    "PrintCancelled": "cancelled",
+}
 
 class NozzleLifeTrackerPlugin(StartupPlugin,
                               ShutdownPlugin,
@@ -99,22 +183,62 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
     def __init__(self):
         self._current_nozzle = None
         self._print_start_time = None
-        self._lock = threading.Lock()
+        # Every critical section ends by publishing a StateSnapshot for lock-free readers.
+        self._lock = PublishingLock(self._publish_state_snapshot_locked)
         self._nozzles = {}
-        self._print_log = []
         self._nozzle_profiles = {}
         self._tool_state = {}
         self._tool_map = {}
-        self._replacement_log = []
+        self._replacement_archive = None
         self._phase2_error_flags = {}
+        # Set at startup when runtime state came from an older snapshot
+        # generation (or none was valid); merged into meta.error_flags.
+        self._runtime_recovery_flags = {}
         self._is_printing = False
+        # Monotonic start of the open print interval; wall-clock jumps do not move it.
         self._last_tick_ts = None
+        # Sub-second remainders per ("n", nozzle_id) / ("t", tool_id), in microseconds.
+        self._runtime_carry_units = {}
         self._active_tool_id = DEFAULT_TOOL_ID
         self._active_tool_source = "fallback"
         self._phase1_runtime_dirty = False
         self._last_phase1_persist_ts = 0
+        self._runtime_journal_pending = {}
+        self._runtime_journal_records = None
+        # Writer sequence number whose commit leaves nothing dirty; None once newer changes exist.
+        self._runtime_clean_seq = None
         self._persist_worker = None
         self._persist_worker_stop = threading.Event()
+        self._runtime_writer = None
+        self._inventory_writer = None
+        self._inventory_dirty = {section: set() for section in INVENTORY_SECTIONS}
+        self._inventory_dirty_full = True
+        self._inventory_journal_records = None
+        self._state_generation = 0
+        self._status_version = 0
+        self._status_changes = deque(maxlen=STATUS_CHANGE_HISTORY_SIZE)
+        self._status_instance_token = uuid.uuid4().hex[:12]
+        self._state_snapshot = None
+        self._snapshot_sources = None
+        self._snapshot_changes = {"nozzles": set(), "tools": set(), "profiles": set()}
+        self._snapshot_full = True
+        self._status_push_event = threading.Event()
+        self._status_push_min_interval = 1.0 / STATUS_PUSH_MAX_RATE_HZ
+        self._status_pushed_version = 0
+        self._status_last_push_ts = 0.0
+        self._nozzle_index = NozzleInventoryIndex()
+        self._nozzle_index_lock = threading.Lock()
+        self._nozzle_index_version = None
+        self._pending_tool_changes = deque()
+        self._tool_change_matcher = ToolChangeMatcher()
+        self._tickless_accounting = False
+        self._job_ledger = None
+        self._active_job_id = None
+        self._active_job_started_at = None
+        self._counter_file = None
+        self._persist_durability = PERSIST_DEFAULT_DURABILITY
+        self._persist_commit_delay = PERSIST_GROUP_COMMIT_MS / 1000.0
+        self._runtime_snapshot_pretty = False
 
     ##~~ StartupPlugin
 
@@ -122,6 +246,13 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
         self._logger.info("NozzleLifeTracker plugin started.")
         self._load_nozzles()
         self._ensure_phase1_settings(save=True)
+        self._load_status_push_settings()
+        self._load_persist_settings()
+        self._load_tool_change_settings()
+        self._load_accounting_settings()
+        self._open_job_ledger()
+        self._start_runtime_writer()
+        self._start_inventory_writer()
         self._start_phase1_persist_worker()
 
     def on_shutdown(self):
@@ -131,6 +262,7 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
         try:
             if stop_event is not None:
                 stop_event.set()
+            self._status_push_event.set()
             if worker is not None and worker.is_alive():
                 worker.join(timeout=3)
         except Exception:
@@ -138,21 +270,52 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
 
         try:
             with self._lock:
-                self._ensure_phase1_settings(save=False)
+                self._drain_tool_changes_locked()
                 was_printing = self._is_printing
                 if was_printing:
-                    self._phase1_tick_locked(now_ts=time.time(), persist_if_due=False)
+                    self._phase1_tick_locked(now_ts=time.monotonic(), persist_if_due=False)
                 runtime_saved = self._save_phase1_settings(tool_state_only=True)
-                if runtime_saved:
-                    if was_printing:
-                        self._logger.info("Flushed active-print runtime state during shutdown")
-                    else:
-                        self._logger.debug("Flushed runtime state during shutdown")
+            writer = self._runtime_writer
+            if writer is not None and writer.is_alive():
+                # The flush covers the snapshot just queued and reports whether it reached disk.
+                runtime_saved = writer.flush(timeout=PHASE1_SHUTDOWN_FLUSH_TIMEOUT_SECONDS)
+            if runtime_saved:
+                if was_printing:
+                    self._logger.info("Flushed active-print runtime state during shutdown")
                 else:
-                    self._logger.warning("Runtime-state flush during shutdown did not complete")
+                    self._logger.debug("Flushed runtime state during shutdown")
+            else:
+                self._logger.warning("Runtime-state flush during shutdown did not complete")
         except Exception:
             self._logger.exception("Error flushing runtime state during shutdown")
 
+        try:
+            writer = getattr(self, "_runtime_writer", None)
+            if writer is not None:
+                writer.stop(timeout=PHASE1_SHUTDOWN_FLUSH_TIMEOUT_SECONDS)
+        except Exception:
+            self._logger.exception("Error stopping runtime-state writer")
+
+        try:
+            if self._counter_file is not None:
+                self._counter_file.close()
+        except Exception:
+            self._logger.exception("Error closing runtime counter file")
+
+        try:
+            if self._job_ledger is not None:
+                self._job_ledger.close()
+        except Exception:
+            self._logger.exception("Error closing job ledger")
+
+        try:
+            writer = getattr(self, "_inventory_writer", None)
+            if writer is not None:
+                # stop() drains anything still queued before the thread exits.
+                writer.stop(timeout=PHASE1_SHUTDOWN_FLUSH_TIMEOUT_SECONDS)
+        except Exception:
+            self._logger.exception("Error stopping inventory writer")
+
     ##~~ Assets
 
     def get_assets(self):
@@ -166,39 +329,39 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
 
     def get_settings_defaults(self):
         return {
-            "nozzles": {},
             "default_nozzle_id": None,
             "prompt_before_print": False,
             "display_mode": "circle",  # Options: circle, bar, both
             "legacy_runtime_enabled": False,
+            "status_push_max_rate_hz": STATUS_PUSH_MAX_RATE_HZ,
+            # strict, group (within persist_group_commit_ms) or periodic
+            "persist_durability": PERSIST_DEFAULT_DURABILITY,
+            "persist_group_commit_ms": PERSIST_GROUP_COMMIT_MS,
+            # e.g. {"command": "SELECT_TOOL", "pattern": "T=(\\d+)"} or {"command": "M1001", "tool": "T1"}
+            "tool_change_patterns": [],
+            # "tick" or "tickless" (fold the open interval only at transitions and persists)
+            "accounting_mode": "tick",
+            # "json" or "mmap" (counters persisted in place in runtime_counters.bin)
+            "runtime_storage": "json",
+            # Write runtime_state.json indented instead of compact, for debugging.
+            "runtime_snapshot_pretty": False,
+            # Legacy inventory and job log locations, read once to migrate.
             "print_log": [],
-            "nozzle_profiles": {
-                DEFAULT_PROFILE_ID: {
-                    "id": DEFAULT_PROFILE_ID,
-                    "name": DEFAULT_PROFILE_NAME,
-                    "interval_hours": DEFAULT_PROFILE_INTERVAL_HOURS,
-                    "notes": ""
-                }
-            },
-            "tool_state": {
-                "T0": {
-                    "tool_id": "T0",
-                    "profile_id": DEFAULT_PROFILE_ID,
-                    "accumulated_seconds": 0
-                }
-            },
-            "tool_map": {
-                "T0": {
-                    "active_nozzle_id": "nozzle_T0_legacy"
-                }
-            },
+            "nozzles": {},
+            "nozzle_profiles": {},
+            "tool_state": {},
+            "tool_map": {},
             "replacement_log": []
         }
 
     def on_settings_save(self, data):
         SettingsPlugin.on_settings_save(self, data)
-        self._load_nozzles()
-        self._ensure_phase1_settings(save=False)
+        # The inventory is not part of config.yaml, so only configuration reloads.
+        self._current_nozzle = self._settings.get(["default_nozzle_id"])
+        self._load_status_push_settings()
+        self._load_persist_settings()
+        self._load_tool_change_settings()
+        self._load_accounting_settings()
 
     def get_template_configs(self):
         # Explicit template mapping; forces OctoPrint to inject both panes
@@ -217,10 +380,14 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
     ##~~ EventHandlerPlugin
 
     def on_event(self, event, payload):
+        job_event = None
         with self._lock:
+            # Tool changes queued before this event happened before it.
+            self._drain_tool_changes_locked()
             if event == "PrintStarted":
                 self._phase1_handle_print_start_or_resume_locked()
                 self._print_start_time = time.time()
+                job_event = self._job_start_fields_locked(payload)
 
             elif event == "PrintResumed":
                 # Resume timing after a paused print
@@ -239,6 +406,97 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
                 if self._settings.get(["legacy_runtime_enabled"]):
                     self._accumulate_runtime(payload)
                 self._print_start_time = None
+                job_event = {"status": JOB_FINISH_STATUSES[event], "payload": payload}
+
+        # SQLite commits stay outside the plugin lock so the tick path never waits on them.
+        if job_event is not None:
+            self._record_job_event(job_event)
+
+    def _job_start_fields_locked(self, payload):
+        payload = payload if isinstance(payload, dict) else {}
+        tool_id = self._active_tool_id or DEFAULT_TOOL_ID
+        nozzle_id = str((self._tool_map.get(tool_id) or {}).get("active_nozzle_id") or "") or None
+        nozzle = self._nozzles.get(nozzle_id) if nozzle_id else None
+        return {
+            "status": "printing",
+            "started_at": time.time(),
+            "file": payload.get("name") or payload.get("path"),
+            "tool_id": tool_id,
+            "nozzle_id": nozzle_id,
+            "nozzle_name": (nozzle or {}).get("name"),
+        }
+
+    def _record_job_event(self, job_event):
+        ledger = self._job_ledger
+        if ledger is None:
+            return
+        try:
+            if job_event["status"] == "printing":
+                self._active_job_started_at = job_event["started_at"]
+                self._active_job_id = ledger.start_job(
+                    started_at=job_event["started_at"],
+                    file=job_event["file"],
+                    tool_id=job_event["tool_id"],
+                    nozzle_id=job_event["nozzle_id"],
+                    nozzle_name=job_event["nozzle_name"],
+                )
+                return
+            if self._active_job_id is None:
+                return
+            ended_at = time.time()
+            payload = job_event.get("payload") if isinstance(job_event.get("payload"), dict) else {}
+            try:
+                duration_seconds = int(float(payload.get("time")))
+            except (TypeError, ValueError):
+                duration_seconds = int(ended_at - (self._active_job_started_at or ended_at))
+            ledger.finish_job(
+                self._active_job_id,
+                ended_at=ended_at,
+                status=job_event["status"],
+                duration_seconds=duration_seconds,
+            )
+            self._active_job_id = None
+            self._active_job_started_at = None
+        except sqlite3.Error:
+            self._logger.exception("Failed recording %s job in the job ledger", job_event["status"])
+
+    def _open_job_ledger(self):
+        ledger_path = os.path.join(self.get_plugin_data_folder(), JOB_LEDGER_FILENAME)
+        try:
+            ledger = JobLedger(ledger_path)
+            ledger.open()
+            migrated = ledger.migrate_print_log(self._settings.get(["print_log"]) or [])
+        except (sqlite3.Error, OSError):
+            self._logger.exception("Failed opening job ledger at %s; job history is disabled", ledger_path)
+            self._job_ledger = None
+            return
+        self._job_ledger = ledger
+        if migrated:
+            self._logger.info("Migrated %s print_log entries from settings to %s", migrated, ledger_path)
+            self._settings.set(["print_log"], [])
+            self._settings.save()
+
+    def query_jobs(self, query):
+        query = query or {}
+        if self._job_ledger is None:
+            return {"jobs": [], "next_cursor": None}
+        try:
+            limit = int(query.get("limit") or JOB_QUERY_DEFAULT_LIMIT)
+            since = float(query["since"]) if query.get("since") is not None else None
+            until = float(query["until"]) if query.get("until") is not None else None
+        except (TypeError, ValueError):
+            raise ValueError("limit, since and until must be numbers")
+        if limit <= 0:
+            raise ValueError("limit must be > 0")
+        jobs, next_cursor = self._job_ledger.query(
+            since=since,
+            until=until,
+            nozzle_id=query.get("nozzle_id"),
+            tool_id=normalize_tool_id(query.get("tool_id")) if query.get("tool_id") else None,
+            cursor=query.get("cursor"),
+            limit=min(limit, JOB_QUERY_MAX_LIMIT),
+        )
+        return {"jobs": jobs, "next_cursor": next_cursor}
 
     ##~~ SimpleApiPlugin (for frontend interaction)
     def is_api_protected(self):
@@ -247,17 +505,40 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
     def on_api_get(self, request):
         command = request.values.get("command")
         if command in (None, "status"):
-            return jsonify(self.get_api_status())
-        if command == "export_log_csv":
-            output = make_response(self._generate_csv())
-            output.headers["Content-Disposition"] = "attachment; filename=nozzle_log.csv"
-            output.headers["Content-type"] = "text/csv"
-            return output
+            if_none_match = request.headers.get("If-None-Match")
+            since = request.values.get("since")
+            try:
+                fields = normalize_status_fields(request.values.get("fields"))
+            except ValueError as exc:
+                return make_response(str(exc), 400)
+            snapshot = self._current_state_snapshot()
+            if since is None:
+                etag, payload, _ = self._snapshot_status(snapshot, fields)
+            else:
+                etag, payload = self._snapshot_status_delta(snapshot, since, fields)
+            if etag_matches(if_none_match, etag):
+                response = make_response("", 304)
+            else:
+                response = jsonify(payload)
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        if command in ("export_log_csv", "export_log"):
+            query = request.values.to_dict()
+            if command == "export_log_csv":
+                query["format"] = "csv"
+            try:
+                return self._export_response(query)
+            except ValueError as exc:
+                return make_response(str(exc), 400)
         return make_response("Unknown command", 400)
 
     def get_api_commands(self):
         return {
             "status": [],
+            "nozzle_detail": ["nozzle_id"],
+            "query_nozzles": [],
+            "repair_state": [],
             "set_tool_profile": ["tool_id", "profile_id"],
             "reset_tool": ["tool_id"],
             "assign_nozzle": ["tool_id", "nozzle_id"],
@@ -266,15 +547,46 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
             "select_nozzle": ["nozzle_id"],
             "get_status": [],
             "get_log": [],
+            "query_jobs": [],
+            "persist_stats": [],
             "retire_nozzle": ["nozzle_id"],
             "add_nozzle": ["size", "material"],
-            "export_log_csv": []
+            "export_log_csv": [],
+            "export_log": []
         }
 
     def on_api_command(self, command, data):
         data = data or {}
         if command == "status":
-            return jsonify(self.get_api_status())
+            try:
+                fields = normalize_status_fields(data.get("fields"))
+            except ValueError as exc:
+                return jsonify({"error": str(exc)}), 400
+            if data.get("since") is not None:
+                return jsonify(self._snapshot_status_delta(self._current_state_snapshot(), data.get("since"), fields)[1])
+            return jsonify(self._snapshot_status(self._current_state_snapshot(), fields)[1])
+
+        elif command == "nozzle_detail":
+            nozzle_id = str(data.get("nozzle_id") or "").strip()
+            snapshot = self._current_state_snapshot()
+            nozzles = live_counters(snapshot, time.monotonic())[0]
+            detail = build_nozzle_detail(nozzle_id, nozzles, snapshot.nozzle_profiles, snapshot.tool_map)
+            if detail is None:
+                return jsonify({"error": "Unknown nozzle_id"}), 404
+            return jsonify(detail)
+
+        elif command == "repair_state":
+            changed = self.repair_state()
+            if changed:
+                self._logger.info("Repaired nozzle tracker state via explicit repair pass")
+            return jsonify({"success": True, "changed": changed})
+
+        elif command == "query_nozzles":
+            try:
+                return jsonify(self.query_nozzles(data))
+            except ValueError as exc:
+                self._logger.debug("Phase2 API query_nozzles error: %s", exc)
+                return jsonify({"error": str(exc)}), 400
 
         elif command == "set_tool_profile":
             tool_id = normalize_tool_id(data.get("tool_id"))
@@ -287,7 +599,6 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
                 return jsonify({"error": "Missing profile_id"}), 400
 
             with self._lock:
-                self._ensure_phase1_settings(save=False)
                 if profile_id not in self._nozzle_profiles:
                     self._logger.debug("Phase1 API set_tool_profile unknown profile_id: %r", profile_id)
                     return jsonify({"error": "Unknown profile_id"}), 400
@@ -376,10 +687,12 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
             return {"success": True}
 
         elif command == "get_status":
-            active_tool = self._active_tool_id or DEFAULT_TOOL_ID
-            active_mapping = self._tool_map.get(active_tool) or {}
+            snapshot = self._current_state_snapshot()
+            nozzles = live_counters(snapshot, time.monotonic())[0]
+            active_tool = snapshot.active_tool_id or DEFAULT_TOOL_ID
+            active_mapping = snapshot.tool_map.get(active_tool) or {}
             active_nozzle_id = active_mapping.get("active_nozzle_id")
-            active_nozzle = self._nozzles.get(active_nozzle_id) if active_nozzle_id else {}
+            active_nozzle = nozzles.get(active_nozzle_id) if active_nozzle_id else {}
             return {
                 "current_tool": active_tool,
                 "current_nozzle": active_nozzle_id,
@@ -391,7 +704,21 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
             }
 
         elif command == "get_log":
-            return {"log": self._print_log}
+            # Legacy print_log shape: the export's legacy job columns, oldest first.
+            legacy_fields = EXPORT_CSV_FIELDS["jobs"][:5]
+            records = list(iter_job_records(self._job_ledger))
+            records.reverse()
+            return {"log": [{field: record[field] for field in legacy_fields} for record in records]}
+
+        elif command == "query_jobs":
+            try:
+                return jsonify(self.query_jobs(data))
+            except ValueError as exc:
+                self._logger.debug("API query_jobs error: %s", exc)
+                return jsonify({"error": str(exc)}), 400
+
+        elif command == "persist_stats":
+            return jsonify(self.get_persist_stats())
 
         elif command == "retire_nozzle":
             nozzle_id = data.get("nozzle_id")
@@ -417,36 +744,325 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
                 return {"success": False, "error": str(exc)}
             return {"success": True, "nozzle_id": nozzle["id"], "name": nozzle["name"]}
 
-        elif command == "export_log_csv":
-            output = make_response(self._generate_csv())
-            output.headers["Content-Disposition"] = "attachment; filename=nozzle_log.csv"
-            output.headers["Content-type"] = "text/csv"
-            return output
+        elif command in ("export_log_csv", "export_log"):
+            query = dict(data)
+            if command == "export_log_csv":
+                query["format"] = "csv"
+            try:
+                return self._export_response(query)
+            except ValueError as exc:
+                return jsonify({"success": False, "error": str(exc)}), 400
 
         self._logger.debug("Unknown API command: %r", command)
         return jsonify({"error": "Unknown command"}), 400
 
-    def _generate_csv(self):
-        import io
-        output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=["timestamp", "nozzle_id", "nozzle_name", "file", "duration"])
-        writer.writeheader()
-        for entry in self._print_log:
-            writer.writerow(entry)
-        return output.getvalue()
+    def build_export(self, query):
+        """Validate an export query and return lazily produced (chunks, mimetype, filename)."""
+        query = query or {}
+        export_format = str(query.get("format") or "csv").strip().lower()
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError("format must be one of: {}".format(", ".join(EXPORT_FORMATS)))
+        datasets = normalize_export_datasets(query.get("dataset"), export_format)
+        since = parse_export_bound(query.get("from"))
+        until = parse_export_bound(query.get("to"))
+        nozzle_id = str(query.get("nozzle_id") or "").strip() or None
+        tool_id = None
+        if query.get("tool_id"):
+            tool_id = normalize_tool_id(query.get("tool_id"))
+            if tool_id is None:
+                raise ValueError("Invalid tool_id")
+        compress = str(query.get("gzip") or "").strip().lower() in ("1", "true", "yes")
+
+        # The snapshot never changes, so rows can be produced long after this returns.
+        snapshot = self._current_state_snapshot()
+        ledger = self._job_ledger
+
+        def _records(dataset):
+            if dataset == "jobs":
+                return iter_job_records(ledger, since=since, until=until, nozzle_id=nozzle_id, tool_id=tool_id)
+            if dataset == "replacements":
+                archive = self._replacement_archive
+                return iter_replacement_records(
+                    archive.iter_entries(since=since, until=until) if archive is not None else (),
+                    since=since,
+                    until=until,
+                    nozzle_id=nozzle_id,
+                    tool_id=tool_id,
+                )
+            return iter_nozzle_records(snapshot.nozzles, snapshot.tool_map, nozzle_id=nozzle_id, tool_id=tool_id)
+
+        if export_format == "csv":
+            chunks = stream_csv(_records(datasets[0]), EXPORT_CSV_FIELDS[datasets[0]])
+            mimetype = "text/csv"
+            filename = "nozzle_log.csv" if datasets[0] == "jobs" else "nozzle_{}.csv".format(datasets[0])
+        else:
+            chunks = stream_jsonl((dataset, record) for dataset in datasets for record in _records(dataset))
+            mimetype = "application/x-ndjson"
+            filename = "nozzle_export.jsonl"
+        if compress:
+            chunks = gzip_stream(chunks)
+            mimetype = "application/gzip"
+            filename += ".gz"
+        return chunks, mimetype, filename
+
+    def _export_response(self, query):
+        chunks, mimetype, filename = self.build_export(query)
+        response = Response(stream_with_context(chunks), mimetype=mimetype)
+        response.headers["Content-Disposition"] = "attachment; filename={}".format(filename)
+        return response
 
     def get_api_status(self):
-        with self._lock:
-            return build_status_payload(
+        return self._snapshot_status(self._current_state_snapshot())[1]
+
+    def _current_state_snapshot(self):
+        """Return the latest published StateSnapshot; locks only before the first publication."""
+        snapshot = self._state_snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._publish_state_snapshot_locked()
+        return snapshot
+
+    def _publish_state_snapshot_locked(self):
+        """Publish the state as a new StateSnapshot if anything changed."""
+        previous = self._state_snapshot
+        sources = (self._nozzle_profiles, self._nozzles, self._tool_state, self._tool_map)
+        open_interval = self._open_interval_locked()
+        if (
+            previous is not None
+            and previous.open_interval == open_interval
+            and previous.version == self._status_version
+            and previous.generation == self._state_generation
+            and all(source is published for source, published in zip(sources, self._snapshot_sources))
+        ):
+            return previous
+
+        full = self._snapshot_full or previous is None
+        changes = self._snapshot_changes
+
+        def _rebuild(position):
+            return full or sources[position] is not self._snapshot_sources[position]
+
+        snapshot = StateSnapshot(
+            version=self._status_version,
+            generation=self._state_generation,
+            nozzle_profiles=refresh_small_section(
+                None if full else previous.nozzle_profiles,
                 self._nozzle_profiles,
+                changes["profiles"],
+                _rebuild(0),
+                freeze=ProfileRecord.from_dict,
+            ),
+            nozzles=refresh_inventory_section(
+                None if full else previous.nozzles, self._nozzles, changes["nozzles"], _rebuild(1)
+            ),
+            tool_state=refresh_small_section(
+                None if full else previous.tool_state,
                 self._tool_state,
-                nozzles=self._nozzles,
-                tool_map=self._tool_map,
-                errors=self._phase2_error_flags,
-                active_tool_id=self._active_tool_id,
-                tool_source=self._active_tool_source,
-                now_ts=time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-            )
+                changes["tools"],
+                _rebuild(2),
+                freeze=ToolStateRecord.from_dict,
+            ),
+            tool_map=refresh_small_section(
+                None if full else previous.tool_map, self._tool_map, changes["tools"], _rebuild(3)
+            ),
+            error_flags=dict(self._phase2_error_flags or {}, **self._runtime_recovery_flags),
+            active_tool_id=self._active_tool_id,
+            tool_source=self._active_tool_source,
+            open_interval=open_interval,
+            status_changes=(
+                previous.status_changes
+                if previous is not None and previous.version == self._status_version
+                else tuple(self._status_changes)
+            ),
+            status_base=(
+                previous.status_base
+                if previous is not None and previous.generation == self._state_generation
+                else None
+            ),
+        )
+        self._state_snapshot = snapshot
+        self._snapshot_sources = sources
+        self._snapshot_changes = {"nozzles": set(), "tools": set(), "profiles": set()}
+        self._snapshot_full = False
+        return snapshot
+
+    def _open_interval_locked(self):
+        if not self._tickless_accounting or not self._is_printing or self._last_tick_ts is None:
+            return None
+        tool_id = self._active_tool_id
+        nozzle_id = str((self._tool_map.get(tool_id) or {}).get("active_nozzle_id") or "").strip()
+        if nozzle_id not in self._nozzles or tool_id not in self._tool_state:
+            return None
+        carries = self._runtime_carry_units
+        return (self._last_tick_ts, nozzle_id, carries.get(("n", nozzle_id)), tool_id, carries.get(("t", tool_id)))
+
+    def _snapshot_status(self, snapshot, fields=None):
+        """Return (etag, payload, index) for a snapshot, showing an open interval live."""
+        nozzles, tool_state, live_seconds = live_counters(snapshot, time.monotonic())
+        response = snapshot.status_responses.get((fields, live_seconds))
+        if response is not None:
+            return response
+
+        base = snapshot.status_base.get(fields)
+        if base is None:
+            full_base = snapshot.status_base.get(None)
+            if fields is not None and full_base is not None:
+                # Positions are unchanged by projection, so the full index applies.
+                base = (project_status_payload(full_base[0], fields), full_base[1])
+            else:
+                payload = build_status_payload(
+                    snapshot.nozzle_profiles,
+                    snapshot.tool_state,
+                    nozzles=snapshot.nozzles,
+                    tool_map=snapshot.tool_map,
+                    errors=snapshot.error_flags,
+                    active_tool_id=snapshot.active_tool_id,
+                    tool_source=snapshot.tool_source,
+                    fields=fields,
+                    validated=True,
+                )
+                base = (payload, build_status_payload_index(payload))
+            snapshot.status_base[fields] = base
+
+        # generated_at is the time this content was produced, so repeated reads of
+        # the same snapshot return byte-identical bodies for the strong ETag.
+        payload = patch_status_payload_runtime(
+            base[0],
+            base[1],
+            nozzles,
+            tool_state,
+            now_ts=time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        )
+        payload["version"] = snapshot.version
+        etag = build_status_etag(
+            self._status_instance_token, snapshot.generation, snapshot.version, fields, live_seconds=live_seconds
+        )
+        response = (etag, payload, base[1])
+        snapshot.status_responses[(fields, live_seconds)] = response
+        return response
+
+    def _get_api_status_locked(self, fields=None):
+        return self._snapshot_status(self._publish_state_snapshot_locked(), fields)[:2]
+
+    def _snapshot_status_delta(self, snapshot, since_version, fields=None):
+        etag, payload, index = self._snapshot_status(snapshot, fields)
+        # The patched payload keeps the cached entry order, so its index applies.
+        return etag, build_status_delta(
+            payload,
+            index,
+            snapshot.status_changes,
+            since_version,
+            snapshot.version,
+        )
+
+    def _mark_state_changed_locked(self, nozzle_ids=(), tool_ids=(), profile_ids=(), full=False):
+        # Any change other than the active nozzle/tool counters advancing must
+        # bump the generation so the cached status payload is rebuilt.
+        self._state_generation += 1
+        if full:
+            self._inventory_dirty_full = True
+        else:
+            self._inventory_dirty["nozzles"].update(nozzle_ids)
+            self._inventory_dirty["tool_map"].update(tool_ids)
+            self._inventory_dirty["nozzle_profiles"].update(profile_ids)
+        self._record_status_change_locked(nozzle_ids, tool_ids, profile_ids, full, structural=True)
+
+    def _record_status_change_locked(self, nozzle_ids=(), tool_ids=(), profile_ids=(), full=False, structural=False):
+        if full:
+            self._snapshot_full = True
+        else:
+            self._snapshot_changes["nozzles"].update(nozzle_ids)
+            self._snapshot_changes["tools"].update(tool_ids)
+            self._snapshot_changes["profiles"].update(profile_ids)
+        self._status_version += 1
+        self._status_changes.append(
+            (self._status_version, tuple(nozzle_ids), tuple(tool_ids), tuple(profile_ids), bool(full), bool(structural))
+        )
+        self._status_push_event.set()
+
+    def _load_status_push_settings(self):
+        try:
+            rate_hz = float(self._settings.get(["status_push_max_rate_hz"]))
+        except (TypeError, ValueError):
+            rate_hz = STATUS_PUSH_MAX_RATE_HZ
+        if rate_hz <= 0:
+            rate_hz = STATUS_PUSH_MAX_RATE_HZ
+        self._status_push_min_interval = 1.0 / rate_hz
+
+    def _load_persist_settings(self):
+        durability = str(self._settings.get(["persist_durability"]) or PERSIST_DEFAULT_DURABILITY).strip().lower()
+        if durability not in PERSIST_DURABILITY_MODES:
+            self._logger.warning("Unknown persist_durability %r; using %s", durability, PERSIST_DEFAULT_DURABILITY)
+            durability = PERSIST_DEFAULT_DURABILITY
+        try:
+            group_commit_ms = float(self._settings.get(["persist_group_commit_ms"]))
+        except (TypeError, ValueError):
+            group_commit_ms = PERSIST_GROUP_COMMIT_MS
+        if durability == "strict":
+            commit_delay = 0.0
+        elif durability == "group":
+            commit_delay = max(0.0, group_commit_ms) / 1000.0
+        else:
+            commit_delay = float(PHASE1_PERSIST_INTERVAL_SECONDS)
+        self._persist_durability = durability
+        self._persist_commit_delay = commit_delay
+        self._runtime_snapshot_pretty = bool(self._settings.get(["runtime_snapshot_pretty"]))
+        for writer in (self._runtime_writer, self._inventory_writer):
+            if writer is not None:
+                writer.set_commit_delay(commit_delay)
+
+    def _load_tool_change_settings(self):
+        matcher, errors = build_tool_change_matcher(self._settings.get(["tool_change_patterns"]))
+        for error in errors:
+            self._logger.warning("Ignoring tool change pattern: %s", error)
+        self._tool_change_matcher = matcher
+
+    def _load_accounting_settings(self):
+        mode = str(self._settings.get(["accounting_mode"]) or "tick").strip().lower()
+        if mode not in ACCOUNTING_MODES:
+            self._logger.warning("Unknown accounting_mode %r; using tick", mode)
+            mode = "tick"
+        with self._lock:
+            self._tickless_accounting = mode == "tickless"
+        # Let the worker re-plan its sleep for the new mode.
+        self._status_push_event.set()
+
+    def get_persist_stats(self):
+        return {
+            "durability": self._persist_durability,
+            "commit_delay_ms": round(self._persist_commit_delay * 1000.0, 3),
+            "runtime": self._runtime_writer.stats() if self._runtime_writer is not None else None,
+            "inventory": self._inventory_writer.stats() if self._inventory_writer is not None else None,
+        }
+
+    def _status_push_delay_locked(self, now_ts):
+        if self._status_version == self._status_pushed_version:
+            return None
+        return max(0.0, self._status_last_push_ts + self._status_push_min_interval - now_ts)
+
+    def _collect_status_push_locked(self, now_ts):
+        delay = self._status_push_delay_locked(now_ts)
+        if delay is None or delay > 0:
+            return None
+        # One coalesced delta per interval, shared by every connected client.
+        message = self._snapshot_status_delta(self._publish_state_snapshot_locked(), self._status_pushed_version)[1]
+        self._status_pushed_version = self._status_version
+        self._status_last_push_ts = now_ts
+        return dict(message, type="status")
+
+    def _publish_status_update(self, now_ts=None):
+        if now_ts is None:
+            now_ts = time.monotonic()
+        with self._lock:
+            message = self._collect_status_push_locked(now_ts)
+        if message is None:
+            return False
+        try:
+            self._plugin_manager.send_plugin_message(self._identifier, message)
+        except Exception:
+            self._logger.exception("Failed to push status update")
+            return False
+        return True
 
     ##~~ Helper Methods
 
@@ -454,95 +1070,409 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
         legacy_nozzles = self._settings.get(["nozzles"]) or {}
         legacy_tool_state = self._settings.get(["tool_state"]) or {}
         legacy_replacement_log = self._settings.get(["replacement_log"]) or []
-        self._nozzles = legacy_nozzles
+        inventory, migrate_inventory = self._load_inventory(
+            legacy_profiles=self._settings.get(["nozzle_profiles"]) or {},
+            legacy_nozzles=legacy_nozzles,
+            legacy_tool_map=self._settings.get(["tool_map"]) or {},
+        )
+        self._nozzles = inventory["nozzles"]
         self._current_nozzle = self._settings.get(["default_nozzle_id"])
-        self._print_log = self._settings.get(["print_log"]) or []
-        self._nozzle_profiles = self._settings.get(["nozzle_profiles"]) or {}
-        self._tool_map = self._settings.get(["tool_map"]) or {}
+        self._nozzle_profiles = inventory["nozzle_profiles"]
+        self._tool_map = inventory["tool_map"]
         self._tool_state = {}
-        self._replacement_log = []
         self._phase2_error_flags = {}
         if self._active_tool_id is None:
             self._active_tool_id = DEFAULT_TOOL_ID
         if not getattr(self, "_active_tool_source", None):
             self._active_tool_source = "fallback"
-        self._load_runtime_state(
+        runtime_migrated = self._load_runtime_state(
             legacy_tool_state=legacy_tool_state,
             legacy_replacement_log=legacy_replacement_log,
             legacy_nozzles=legacy_nozzles,
         )
+        self._mark_state_changed_locked(full=True)
+        if migrate_inventory or runtime_migrated:
+            if self._save_inventory_state():
+                self._clear_settings_inventory()
+
+    def _inventory_path(self):
+        return os.path.join(self.get_plugin_data_folder(), INVENTORY_FILENAME)
+
+    def _inventory_journal_path(self):
+        return os.path.join(self.get_plugin_data_folder(), INVENTORY_JOURNAL_FILENAME)
+
+    def _load_inventory(self, legacy_profiles, legacy_nozzles, legacy_tool_map):
+        inventory_path = self._inventory_path()
+        inventory, status = load_inventory_file(inventory_path, journal_path=self._inventory_journal_path())
+        self._inventory_journal_records = None
+        self._inventory_dirty_full = True
+
+        if status == "loaded":
+            self._logger.debug("Loaded nozzle inventory from %s", inventory_path)
+            return inventory, False
+        if status == "malformed":
+            # Keep the unreadable file for manual recovery instead of overwriting it.
+            backup_path = inventory_path + ".malformed"
+            self._logger.warning("Nozzle inventory is malformed at %s; moving it to %s", inventory_path, backup_path)
+            try:
+                os.replace(inventory_path, backup_path)
+            except OSError:
+                self._logger.exception("Failed moving malformed nozzle inventory aside")
+
+        legacy_inventory = build_inventory(legacy_profiles, legacy_nozzles, legacy_tool_map)
+        if has_inventory(legacy_inventory):
+            self._logger.info("Migrating nozzle inventory from settings to %s", inventory_path)
+            return legacy_inventory, True
+        self._logger.debug("Nozzle inventory not found at %s; using defaults", inventory_path)
+        return default_inventory(), False
+
+    def _clear_settings_inventory(self):
+        for key in ("nozzle_profiles", "tool_state", "nozzles", "tool_map", "replacement_log"):
+            self._settings.set([key], [] if key == "replacement_log" else {})
+        self._settings.save()
+        self._logger.info("Removed migrated nozzle inventory from config.yaml")
 
     def _runtime_state_path(self):
         return os.path.join(self.get_plugin_data_folder(), RUNTIME_STATE_FILENAME)
 
+    def _runtime_journal_path(self):
+        return os.path.join(self.get_plugin_data_folder(), RUNTIME_JOURNAL_FILENAME)
+
     def _runtime_state_payload(self):
-        return build_runtime_state(self._tool_state, self._replacement_log, self._nozzles)
+        # The published snapshot is never mutated, so the writer thread can
+        # encode it after the lock is released without copying anything.
+        snapshot = self._publish_state_snapshot_locked()
+        return runtime_state_view(snapshot.tool_state, snapshot.nozzles)
 
     def _load_runtime_state(self, legacy_tool_state, legacy_replacement_log, legacy_nozzles):
         runtime_state_path = self._runtime_state_path()
-        runtime_state, status = load_runtime_state_file(runtime_state_path)
-
+        runtime_state, status, recovery = load_runtime_state_generations(
+            runtime_state_path,
+            journal_path=self._runtime_journal_path(),
+        )
+        self._runtime_recovery_flags = {"runtime_snapshot_recovered": recovery} if recovery["skipped"] else {}
+        self._runtime_journal_pending = {}
+        self._runtime_journal_records = None
+        self._open_replacement_archive()
+        backend_switched = self._load_runtime_counters(runtime_state)
+
+        if backend_switched and status != "missing":
+            # Re-save right away so the JSON snapshot and the counter file agree
+            # on the counters before the first persist uses the new backend.
+            self._apply_runtime_state(runtime_state)
+            self._archive_legacy_replacement_log(runtime_state.get("replacement_log"))
+            if self._save_runtime_state():
+                self._remove_stale_counter_file()
+            return False
         if status == "loaded":
-            self._logger.debug("Loaded runtime state from %s", runtime_state_path)
+            if recovery["skipped"]:
+                self._logger.warning(
+                    "Skipped invalid runtime snapshot(s) %s; recovered generation %s",
+                    ", ".join(recovery["skipped"]),
+                    recovery["generation"],
+                )
+            else:
+                self._logger.debug("Loaded runtime state from %s", runtime_state_path)
+            if runtime_state.get("replacement_log"):
+                # Snapshot from before the archive: move the log out, then rewrite
+                # the snapshot without it.
+                self._archive_legacy_replacement_log(runtime_state["replacement_log"])
+                self._apply_runtime_state(runtime_state)
+                self._save_runtime_state()
+                return False
         elif status == "malformed":
-            self._logger.warning("Runtime state file is malformed at %s; using defaults", runtime_state_path)
+            self._logger.warning("No valid runtime snapshot generation at %s; using defaults", runtime_state_path)
         elif has_legacy_runtime_state(legacy_tool_state, legacy_replacement_log, legacy_nozzles):
-            runtime_state = build_runtime_state(legacy_tool_state, legacy_replacement_log, legacy_nozzles)
+            runtime_state = build_runtime_state(legacy_tool_state, legacy_nozzles)
             self._logger.info("Migrating legacy runtime state from settings to %s", runtime_state_path)
+            self._archive_legacy_replacement_log(legacy_replacement_log)
             self._apply_runtime_state(runtime_state)
-            if self._save_runtime_state():
-                self._save_settings_state()
-            return
+            return self._save_runtime_state()
         else:
             self._logger.debug("Runtime state file not found at %s; using defaults", runtime_state_path)
 
         self._apply_runtime_state(runtime_state)
+        return False
+
+    def _counter_file_path(self):
+        return os.path.join(self.get_plugin_data_folder(), COUNTER_FILENAME)
+
+    def _load_runtime_counters(self, runtime_state):
+        """Overlay the counter file onto runtime_state; True when the backend changed on disk."""
+        backend = str(self._settings.get(["runtime_storage"]) or "json").strip().lower()
+        if backend not in RUNTIME_STORAGE_BACKENDS:
+            self._logger.warning("Unknown runtime_storage %r; using json", backend)
+            backend = "json"
+
+        counter_path = self._counter_file_path()
+        counter_file = CounterFile(counter_path)
+        counters, status = counter_file.load()
+        if status == "loaded":
+            apply_counters_to_runtime_state(runtime_state, counters)
+            self._logger.debug("Loaded %s runtime counter(s) from %s", len(counters), counter_path)
+        elif status == "malformed":
+            self._logger.warning("Runtime counter file is malformed at %s; using the JSON snapshot", counter_path)
+
+        if backend == "mmap":
+            self._counter_file = counter_file
+            return status != "loaded"
+        counter_file.close()
+        self._counter_file = None
+        return status != "missing"
+
+    def _remove_stale_counter_file(self):
+        if self._counter_file is not None:
+            return
+        try:
+            os.remove(self._counter_file_path())
+        except FileNotFoundError:
+            pass
+        except OSError:
+            self._logger.exception("Failed removing stale runtime counter file")
+
+    def _open_replacement_archive(self):
+        archive_path = os.path.join(self.get_plugin_data_folder(), REPLACEMENT_ARCHIVE_DIRNAME)
+        archive = ReplacementLogArchive(archive_path)
+        try:
+            archive.open()
+        except OSError:
+            self._logger.exception("Failed opening replacement log archive at %s", archive_path)
+            archive = None
+        self._replacement_archive = archive
+
+    def _archive_legacy_replacement_log(self, entries):
+        archive = self._replacement_archive
+        if archive is None or not entries:
+            return
+        if not archive.is_empty():
+            # Already imported by an earlier start that crashed before rewriting the snapshot.
+            return
+        try:
+            archive.append(entries)
+        except OSError:
+            self._logger.exception("Failed migrating the replacement log into the archive")
+            return
+        self._logger.info("Moved %s replacement log entries into the replacement archive", len(entries))
+
+    def _append_replacement_entry(self, entry):
+        archive = self._replacement_archive
+        if archive is None:
+            self._logger.warning("Replacement archive unavailable; dropping replacement record %r", entry)
+            return
+        try:
+            archive.append([entry])
+        except OSError:
+            self._logger.exception("Failed appending to the replacement log archive")
 
     def _apply_runtime_state(self, runtime_state):
         normalized_runtime = build_runtime_state(
             runtime_state.get("tool_state"),
-            runtime_state.get("replacement_log"),
             apply_runtime_state_to_nozzles(self._nozzles, runtime_state),
         )
         self._tool_state = normalized_runtime["tool_state"]
-        self._replacement_log = normalized_runtime["replacement_log"]
         self._nozzles = apply_runtime_state_to_nozzles(self._nozzles, normalized_runtime)
 
     def _save_runtime_state(self):
+        # Synchronous save; used at startup before the writer thread is running.
         runtime_state_path = self._runtime_state_path()
         try:
-            save_runtime_state_file(runtime_state_path, self._runtime_state_payload())
+            self._write_runtime_snapshot(self._runtime_state_payload())
         except (OSError, ValueError, TypeError):
             self._logger.exception("Failed saving runtime state to %s", runtime_state_path)
             return False
+        self._runtime_journal_pending = {}
+        self._runtime_journal_records = 0
+        self._runtime_clean_seq = None
+        self._phase1_runtime_dirty = False
+        return True
+
+    def _write_runtime_snapshot(self, runtime_state):
+        runtime_state_path = self._runtime_state_path()
+        if self._counter_file is not None:
+            # Counters first: load treats them as at least as new as the snapshot.
+            self._counter_file.write(runtime_state_counters(runtime_state))
+        compact_runtime_state_file(
+            runtime_state_path,
+            self._runtime_journal_path(),
+            runtime_state,
+            pretty=self._runtime_snapshot_pretty,
+        )
         self._logger.debug("Saved runtime state to %s", runtime_state_path)
+
+    def _write_runtime_journal(self, records):
+        if self._counter_file is not None:
+            slots = self._counter_file.write({record["k"]: record["v"] for record in records})
+            self._logger.debug("Wrote %s runtime counter slot(s) in place", slots)
+            return
+        journal_path = self._runtime_journal_path()
+        append_runtime_journal(journal_path, records)
+        self._logger.debug("Appended %s runtime journal record(s) to %s", len(records), journal_path)
+
+    def _on_runtime_write_error(self, exc):
+        self._logger.error("Failed persisting runtime state: %s", exc)
+        with self._lock:
+            # Pending records were dropped with the failed write; the next persist
+            # must be a full snapshot so nothing accumulated in memory is lost.
+            self._phase1_runtime_dirty = True
+            self._runtime_journal_records = None
+            self._runtime_clean_seq = None
+
+    def _on_runtime_write_committed(self, seq):
+        with self._lock:
+            if self._runtime_clean_seq is not None and seq >= self._runtime_clean_seq:
+                self._phase1_runtime_dirty = False
+                self._runtime_clean_seq = None
+
+    def _start_runtime_writer(self):
+        if self._runtime_writer is not None and self._runtime_writer.is_alive():
+            return
+        self._runtime_writer = RuntimeStateWriter(
+            self._write_runtime_snapshot,
+            self._write_runtime_journal,
+            on_error=self._on_runtime_write_error,
+            on_commit=self._on_runtime_write_committed,
+            commit_delay=self._persist_commit_delay,
+        )
+        self._runtime_writer.start()
+
+    def _flush_runtime_writer(self, timeout=None):
+        writer = self._runtime_writer
+        if writer is None or not writer.is_alive():
+            return True
+        return writer.flush(timeout=timeout)
+
+    def _queue_runtime_snapshot_locked(self):
+        """Queue a full snapshot; False if runtime-state persistence is failing."""
+        writer = self._runtime_writer
+        if writer is None or not writer.is_alive():
+            return self._save_runtime_state()
+        self._runtime_clean_seq = writer.submit_snapshot(self._runtime_state_payload())
+        self._runtime_journal_pending = {}
+        self._runtime_journal_records = 0
+        return writer.last_error() is None
+
+    def _queue_runtime_journal_locked(self):
+        writer = self._runtime_writer
+        if (
+            writer is None
+            or not writer.is_alive()
+            or self._runtime_journal_records is None
+            or self._runtime_journal_records >= PHASE1_JOURNAL_COMPACT_RECORDS
+        ):
+            # No journal matching the current snapshot yet, or it is due for compaction.
+            return self._queue_runtime_snapshot_locked()
+
+        if self._counter_file is not None:
+            # Absolute values overwrite their slots, so nothing accumulates to compact.
+            records = []
+            for nozzle_id, tool_id in self._runtime_journal_pending:
+                if nozzle_id in self._nozzles:
+                    records.append(
+                        {"k": nozzle_counter_key(nozzle_id), "v": self._nozzles[nozzle_id]["accumulated_seconds"]}
+                    )
+                if tool_id in self._tool_state:
+                    records.append(
+                        {"k": tool_counter_key(tool_id), "v": self._tool_state[tool_id]["accumulated_seconds"]}
+                    )
+            self._runtime_clean_seq = writer.submit_journal(records)
+            self._runtime_journal_pending = {}
+            return writer.last_error() is None
+
+        now_ts = time.time()
+        records = [
+            build_runtime_journal_record(nozzle_id, tool_id, delta_seconds, now_ts)
+            for (nozzle_id, tool_id), delta_seconds in self._runtime_journal_pending.items()
+        ]
+        self._runtime_clean_seq = writer.submit_journal(records)
+        self._runtime_journal_pending = {}
+        self._runtime_journal_records += len(records)
+        return writer.last_error() is None
+
+    def _save_inventory_state(self):
+        writer = self._inventory_writer
+        writer_alive = writer is not None and writer.is_alive()
+        snapshot = (
+            self._inventory_dirty_full
+            or self._inventory_journal_records is None
+            or self._inventory_journal_records >= INVENTORY_JOURNAL_COMPACT_RECORDS
+        )
+        records = None
+        inventory = None
+        if snapshot:
+            inventory = build_inventory(self._nozzle_profiles, self._nozzles, self._tool_map)
+        else:
+            records = build_inventory_journal_records(
+                {"nozzle_profiles": self._nozzle_profiles, "nozzles": self._nozzles, "tool_map": self._tool_map},
+                self._inventory_dirty,
+            )
+
+        try:
+            if snapshot and writer_alive:
+                writer.submit_snapshot(inventory)
+            elif snapshot:
+                self._write_inventory_snapshot(inventory)
+            elif records and writer_alive:
+                writer.submit_journal(records)
+            elif records:
+                self._write_inventory_journal(records)
+        except (OSError, ValueError, TypeError):
+            self._logger.exception("Failed saving nozzle inventory to %s", self._inventory_path())
+            return False
+
+        if snapshot:
+            self._inventory_journal_records = 0
+        else:
+            self._inventory_journal_records += len(records)
+        self._inventory_dirty = {section: set() for section in INVENTORY_SECTIONS}
+        self._inventory_dirty_full = False
         return True
 
-    def _save_settings_state(self):
-        sanitized_tool_state, sanitized_replacement_log, sanitized_nozzles = strip_runtime_state_from_settings(
-            self._tool_state,
-            self._replacement_log,
-            self._nozzles,
+    def _write_inventory_snapshot(self, inventory):
+        inventory_path = self._inventory_path()
+        compact_inventory_file(inventory_path, self._inventory_journal_path(), inventory)
+        self._logger.debug("Saved nozzle inventory to %s", inventory_path)
+
+    def _write_inventory_journal(self, records):
+        journal_path = self._inventory_journal_path()
+        append_inventory_journal(journal_path, records)
+        self._logger.debug("Appended %s inventory journal record(s) to %s", len(records), journal_path)
+
+    def _on_inventory_write_error(self, exc):
+        self._logger.error("Failed persisting nozzle inventory: %s", exc)
+        with self._lock:
+            # The dropped write may have been a journal append, so only a fresh
+            # snapshot is known to be complete.
+            self._inventory_dirty_full = True
+            self._inventory_journal_records = None
+
+    def _start_inventory_writer(self):
+        if self._inventory_writer is not None and self._inventory_writer.is_alive():
+            return
+        self._inventory_writer = RuntimeStateWriter(
+            self._write_inventory_snapshot,
+            self._write_inventory_journal,
+            on_error=self._on_inventory_write_error,
+            name="NozzleLifeInventoryWriter",
+            commit_delay=self._persist_commit_delay,
         )
-        self._settings.set(["nozzle_profiles"], self._nozzle_profiles)
-        self._settings.set(["tool_state"], sanitized_tool_state)
-        self._settings.set(["nozzles"], sanitized_nozzles)
-        self._settings.set(["tool_map"], self._tool_map)
-        self._settings.set(["replacement_log"], sanitized_replacement_log)
-        self._settings.save()
-        self._logger.debug("Saved stable plugin settings after runtime-state update")
+        self._inventory_writer.start()
 
     def get_profiles(self):
-        self._ensure_phase1_settings(save=False)
         return self._nozzle_profiles
 
     def get_tool_state(self):
-        self._ensure_phase1_settings(save=False)
         return self._tool_state
 
+    def repair_state(self):
+        """Run the full normalization pass over the in-memory state."""
+        with self._lock:
+            changed = self._ensure_phase1_settings(save=False)
+            if changed:
+                self._save_phase1_settings(tool_state_only=False)
+            return changed
+
     def assign_nozzle(self, tool_id, nozzle_id):
         with self._lock:
-            self._ensure_phase1_settings(save=False)
             tool_id = normalize_tool_id(tool_id)
             nozzle_id = str(nozzle_id or "").strip()
             allowed, message = validate_assign_nozzle_allowed(tool_id, nozzle_id, self._nozzles, self._tool_map)
@@ -555,26 +1485,34 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
             if conflicts:
                 raise ValueError("nozzle_id already assigned to another tool")
 
+            previous_nozzle_id = str((self._tool_map.get(tool_id) or {}).get("active_nozzle_id") or "")
             self._tool_map = proposed
             self._tool_state.setdefault(tool_id, self._default_tool_state_entry(tool_id=tool_id))
             self._tool_state[tool_id]["profile_id"] = self._nozzles[nozzle_id].get("profile_id", DEFAULT_PROFILE_ID)
             self._phase2_error_flags = {}
+            self._mark_state_changed_locked(
+                nozzle_ids=tuple(changed_id for changed_id in (previous_nozzle_id, nozzle_id) if changed_id),
+                tool_ids=(tool_id,),
+            )
             self._save_phase1_settings(tool_state_only=False)
             return self._tool_map[tool_id]
 
     def create_nozzle(self, name, profile_id, notes=None, life_seconds=None, material=None, size_mm=None, metadata=None):
         with self._lock:
-            self._ensure_phase1_settings(save=False)
             if profile_id not in self._nozzle_profiles:
                 raise ValueError("profile_id not found")
 
             nozzle_id = generate_nozzle_id(name, self._nozzles.keys())
+            try:
+                parsed_size_mm = float(size_mm) if size_mm is not None else 0.4
+            except (TypeError, ValueError):
+                raise ValueError("size_mm must be a number")
             nozzle = {
                 "id": nozzle_id,
                 "name": str(name),
                 "profile_id": profile_id,
                 "material": str(material or "brass"),
-                "size_mm": float(size_mm) if size_mm is not None else 0.4,
+                "size_mm": parsed_size_mm,
                 "accumulated_seconds": 0,
                 "retired": False,
                 "metadata": {},
@@ -600,25 +1538,29 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
 
             self._nozzles[nozzle_id] = nozzle
             self._phase2_error_flags = {}
+            self._mark_state_changed_locked(nozzle_ids=(nozzle_id,))
             self._save_phase1_settings(tool_state_only=False)
             return nozzle
 
     def reset_nozzle(self, nozzle_id):
         with self._lock:
-            self._ensure_phase1_settings(save=False)
             nozzle_id = str(nozzle_id or "").strip()
             if nozzle_id not in self._nozzles:
                 raise ValueError("nozzle_id not found")
             self._nozzles[nozzle_id]["accumulated_seconds"] = 0
+            self._clear_runtime_carry_locked(nozzle_ids=(nozzle_id,))
+            reset_tool_ids = []
             for tool_id, mapping in (self._tool_map or {}).items():
                 if str((mapping or {}).get("active_nozzle_id") or "") == nozzle_id and tool_id in self._tool_state:
                     self._tool_state[tool_id]["accumulated_seconds"] = 0
+                    self._clear_runtime_carry_locked(tool_ids=(tool_id,))
+                    reset_tool_ids.append(tool_id)
+            self._mark_state_changed_locked(nozzle_ids=(nozzle_id,), tool_ids=reset_tool_ids)
             self._save_phase1_settings(tool_state_only=True)
             return self._nozzles[nozzle_id]
 
     def retire_nozzle(self, nozzle_id):
         with self._lock:
-            self._ensure_phase1_settings(save=False)
             nozzle_id = str(nozzle_id or "").strip()
             if nozzle_id not in self._nozzles:
                 raise ValueError("nozzle_id not found")
@@ -626,6 +1568,7 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
             if not allowed:
                 raise ValueError(message or RETIRE_ASSIGNED_NOZZLE_MESSAGE)
             self._nozzles[nozzle_id]["retired"] = True
+            self._mark_state_changed_locked(nozzle_ids=(nozzle_id,))
             self._save_phase1_settings(tool_state_only=False)
             return self._nozzles[nozzle_id]
 
@@ -634,11 +1577,14 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
             raise ValueError("tool_id is required")
 
         with self._lock:
-            self._ensure_phase1_settings(save=False)
-            tool_id = str(tool_id).upper()
+            tool_id = normalize_tool_id(tool_id)
+            if not tool_id:
+                raise ValueError("Invalid tool_id")
 
             if profile_id not in self._nozzle_profiles:
                 raise ValueError("profile_id not found")
+            # Heals a missing mapping for this tool only, not the whole state.
+            self._ensure_tool_state_entry_locked(tool_id)
 
             state = self._normalize_tool_state_entry(
                 tool_id,
@@ -651,38 +1597,127 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
             nozzle_id = str(mapping.get("active_nozzle_id") or "").strip()
             if nozzle_id in self._nozzles:
                 self._nozzles[nozzle_id]["profile_id"] = profile_id
+            self._mark_state_changed_locked(nozzle_ids=(nozzle_id,), tool_ids=(tool_id,))
             self._save_phase1_settings(tool_state_only=False)
             return state
 
+    def query_nozzles(self, query):
+        query = query or {}
+        try:
+            offset = int(query.get("offset") or 0)
+            limit = int(query.get("limit") or NOZZLE_QUERY_DEFAULT_LIMIT)
+        except (TypeError, ValueError):
+            raise ValueError("offset and limit must be integers")
+        if offset < 0 or limit <= 0:
+            raise ValueError("offset must be >= 0 and limit must be > 0")
+        limit = min(limit, NOZZLE_QUERY_MAX_LIMIT)
+        overdue = query.get("overdue")
+        if isinstance(overdue, str):
+            overdue = overdue.strip().lower() in ("1", "true", "yes")
+        filters = {field: query.get(field) for field in NOZZLE_QUERY_FILTERS if query.get(field) is not None}
+
+        # The index has its own lock and follows published snapshots, so queries
+        # never wait for the state lock.
+        with self._nozzle_index_lock:
+            snapshot = self._current_state_snapshot()
+            live_nozzles = live_counters(snapshot, time.monotonic())[0]
+            self._sync_nozzle_index(snapshot, live_nozzles)
+            page_ids, total = self._nozzle_index.query(
+                filters=filters,
+                overdue=overdue,
+                sort=str(query.get("sort") or "id"),
+                descending=str(query.get("order") or "asc").lower() == "desc",
+                offset=offset,
+                limit=limit,
+            )
+        nozzles = [
+            build_status_nozzle_entry(nozzle_id, live_nozzles[nozzle_id], snapshot.nozzle_profiles)
+            for nozzle_id in page_ids
+        ]
+
+        next_offset = offset + len(nozzles)
+        return {
+            "nozzles": nozzles,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "next_offset": next_offset if next_offset < total else None,
+        }
+
+    def _sync_nozzle_index(self, snapshot, nozzles):
+        index = self._nozzle_index
+        synced_version = self._nozzle_index_version
+        changes = [change for change in snapshot.status_changes if synced_version is None or change[0] > synced_version]
+        if synced_version is None or (
+            snapshot.version != synced_version and (not changes or changes[0][0] != synced_version + 1)
+        ):
+            # The history window no longer reaches the last sync.
+            index.mark_changed(full=True)
+        for change in changes:
+            index.mark_changed(change[1], change[4] or bool(change[3]))
+        if snapshot.open_interval is not None:
+            index.mark_changed((snapshot.open_interval[1],))
+        index.sync(nozzles, snapshot.nozzle_profiles)
+        self._nozzle_index_version = snapshot.version
+
     def reset_tool(self, tool_id):
         if not tool_id:
             raise ValueError("tool_id is required")
 
         with self._lock:
-            self._ensure_phase1_settings(save=False)
-            tool_id = str(tool_id).upper()
-            self._tool_state, self._replacement_log = reset_tool_state(
+            tool_id = normalize_tool_id(tool_id)
+            if not tool_id:
+                raise ValueError("Invalid tool_id")
+            self._tool_state, replacement_log = reset_tool_state(
                 self._tool_state,
-                self._replacement_log,
+                [],
                 tool_id=tool_id,
                 timestamp=time.strftime('%Y-%m-%d %H:%M:%S'),
                 default_profile_id=DEFAULT_PROFILE_ID,
             )
-            state = self._tool_state[tool_id]
+            state = self._ensure_tool_state_entry_locked(tool_id)
             mapping = self._tool_map.get(tool_id) or {}
             nozzle_id = str(mapping.get("active_nozzle_id") or "").strip()
+            self._clear_runtime_carry_locked(tool_ids=(tool_id,))
             if nozzle_id in self._nozzles:
                 self._nozzles[nozzle_id]["accumulated_seconds"] = 0
+                self._clear_runtime_carry_locked(nozzle_ids=(nozzle_id,))
+                replacement_log[-1]["nozzle_id"] = nozzle_id
+            self._mark_state_changed_locked(nozzle_ids=(nozzle_id,), tool_ids=(tool_id,))
             self._save_phase1_settings(tool_state_only=True)
-            return state
+        self._append_replacement_entry(replacement_log[-1])
+        return state
 
     def hook_gcode_queuing(self, comm_instance, phase, cmd, cmd_type, gcode, *args, **kwargs):
-        tool_id = extract_tool_id_from_command(cmd)
+        # Fast path: nearly every line is a move. Reject on OctoPrint's parsed
+        # code, or the first character when there is none, before any regex.
+        matcher = self._tool_change_matcher
+        if gcode is not None:
+            if gcode not in matcher.gcodes:
+                return
+        elif not cmd or cmd[0] not in matcher.first_chars:
+            return
+        tool_id = matcher.match(cmd)
         if not tool_id:
             return
 
-        with self._lock:
-            self._phase1_handle_tool_change_locked(tool_id)
+        # Runs on the comm thread for every queued line: deque.append is atomic,
+        # so the change is handed to the worker without touching the plugin lock.
+        self._pending_tool_changes.append((tool_id, time.monotonic()))
+        self._status_push_event.set()
+
+    def _drain_tool_changes_locked(self):
+        if not self._pending_tool_changes:
+            return 0
+        drained = 0
+        while True:
+            try:
+                tool_id, captured_ts = self._pending_tool_changes.popleft()
+            except IndexError:
+                break
+            self._phase1_handle_tool_change_locked(tool_id, now_ts=captured_ts)
+            drained += 1
+        return drained
 
     def _default_profile_dict(self):
         return {
@@ -737,14 +1772,14 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
         (
             normalized_profiles,
             normalized_tool_state,
-            normalized_replacement_log,
+            _,
             normalized_nozzles,
             normalized_tool_map,
             phase2_errors,
         ) = ensure_phase2_settings(
-            self._settings.get(["nozzle_profiles"]),
+            self._nozzle_profiles,
             self._tool_state,
-            self._replacement_log,
+            [],
             self._nozzles,
             self._tool_map,
             default_profile_id=DEFAULT_PROFILE_ID,
@@ -758,8 +1793,6 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
             changed = True
         if self._tool_state != normalized_tool_state:
             changed = True
-        if self._replacement_log != normalized_replacement_log:
-            changed = True
         if self._nozzles != normalized_nozzles:
             changed = True
         if self._tool_map != normalized_tool_map:
@@ -769,7 +1802,6 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
 
         self._nozzle_profiles = normalized_profiles
         self._tool_state = normalized_tool_state
-        self._replacement_log = normalized_replacement_log
         self._nozzles = normalized_nozzles
         self._tool_map = normalized_tool_map
         self._phase2_error_flags = phase2_errors
@@ -784,19 +1816,21 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
             changed = True
 
         if changed:
+            self._mark_state_changed_locked(full=True)
             if save:
-                self._save_settings_state()
+                self._save_inventory_state()
                 self._save_runtime_state()
+        return changed
 
     def _phase1_handle_print_start_or_resume_locked(self):
-        now_ts = time.time()
+        now_ts = time.monotonic()
         if self._is_printing:
             self._phase1_tick_locked(now_ts=now_ts, persist_if_due=True)
         if not self._active_tool_id:
             self._active_tool_id = DEFAULT_TOOL_ID
         self._ensure_tool_state_entry_locked(self._active_tool_id)
         if not self._is_printing:
-            self._last_phase1_persist_ts = now_ts
+            self._last_phase1_persist_ts = time.monotonic()
             self._logger.debug(
                 "Active print tracking started for %s; runtime snapshots enabled every %ss",
                 self._active_tool_id,
@@ -806,16 +1840,27 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
         self._last_tick_ts = now_ts
 
     def _phase1_handle_print_pause_or_stop_locked(self, force_persist=False):
-        self._phase1_tick_locked(now_ts=time.time(), persist_if_due=False)
+        self._phase1_tick_locked(now_ts=time.monotonic(), persist_if_due=False)
         self._is_printing = False
         self._last_tick_ts = None
         if force_persist:
             self._maybe_persist_phase1_tool_state_locked(force=True)
 
-    def _phase1_handle_tool_change_locked(self, next_tool_id):
+    def _phase1_handle_tool_change_locked(self, next_tool_id, now_ts=None):
         next_tool_id = str(next_tool_id).upper()
-        self._active_tool_source = "printer"
-        now_ts = time.time()
+        previous_tool_id = self._active_tool_id
+        if previous_tool_id != next_tool_id or self._active_tool_source != "printer":
+            # A repeated Tn for the active tool changes nothing readers can see.
+            self._active_tool_source = "printer"
+            self._mark_state_changed_locked(
+                tool_ids=tuple(tool_id for tool_id in (previous_tool_id, next_tool_id) if tool_id)
+            )
+        if now_ts is None:
+            now_ts = time.monotonic()
+        if self._is_printing and self._last_tick_ts is not None:
+            # A change captured just before a tick that ran ahead of the drain
+            # must not rewind the tick clock and count that span twice.
+            now_ts = max(now_ts, self._last_tick_ts)
         if self._is_printing:
             self._phase1_tick_locked(now_ts=now_ts, persist_if_due=False)
             self._active_tool_id = next_tool_id
@@ -831,56 +1876,112 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
             return 0
 
         if now_ts is None:
-            now_ts = time.time()
+            now_ts = time.monotonic()
 
-        delta_seconds = compute_elapsed_seconds(self._last_tick_ts, now_ts)
+        delta_units = compute_elapsed_units(self._last_tick_ts, now_ts)
         self._last_tick_ts = now_ts
-        if delta_seconds <= 0:
+        if delta_units <= 0:
             return 0
 
-        self._ensure_tool_state_entry_locked(self._active_tool_id)
+        # Only the active tool and nozzle entries are touched per tick; the full
+        # ensure/heal path runs only when the active tool is not fully mapped.
+        tool_entry = self._tool_state.get(self._active_tool_id)
         mapping = self._tool_map.get(self._active_tool_id) or {}
         assigned_nozzle_id = str(mapping.get("active_nozzle_id") or "").strip()
+        if not isinstance(tool_entry, dict) or assigned_nozzle_id not in self._nozzles:
+            tool_entry = self._ensure_tool_state_entry_locked(self._active_tool_id)
+            mapping = self._tool_map.get(self._active_tool_id) or {}
+            assigned_nozzle_id = str(mapping.get("active_nozzle_id") or "").strip()
         if not assigned_nozzle_id or assigned_nozzle_id not in self._nozzles:
-            self._phase2_error_flags["missing_tool_assignment"] = {
-                str(self._active_tool_id): True
-            }
-            return delta_seconds
+            missing = {str(self._active_tool_id): True}
+            # Re-flagging the same tool every tick must not invalidate the cache.
+            if self._phase2_error_flags.get("missing_tool_assignment") != missing:
+                self._phase2_error_flags["missing_tool_assignment"] = missing
+                self._mark_state_changed_locked()
+            return 0
+
+        # Nozzle and tool carry their own remainders: a tool can move between
+        # nozzles, and each counter must floor only its own total.
+        carries = self._runtime_carry_units
+        nozzle_carry_key = ("n", assigned_nozzle_id)
+        tool_carry_key = ("t", self._active_tool_id)
+        nozzle_seconds, carries[nozzle_carry_key] = carry_elapsed_units(carries.get(nozzle_carry_key), delta_units)
+        tool_seconds, carries[tool_carry_key] = carry_elapsed_units(carries.get(tool_carry_key), delta_units)
 
-        updated_nozzles, nozzle_changed = accumulate_nozzle_seconds(
+        nozzle_changed = accumulate_nozzle_seconds_inplace(
             self._nozzles,
             assigned_nozzle_id,
-            delta_seconds,
-            default_profile_id=self._tool_state.get(self._active_tool_id, {}).get("profile_id", DEFAULT_PROFILE_ID),
+            nozzle_seconds,
+            default_profile_id=tool_entry.get("profile_id", DEFAULT_PROFILE_ID),
         )
-        updated_tool_state, tool_changed = accumulate_tool_seconds(
+        tool_changed = accumulate_tool_seconds_inplace(
             self._tool_state,
             self._active_tool_id,
-            delta_seconds
+            tool_seconds
         )
         if nozzle_changed or tool_changed:
-            self._nozzles = updated_nozzles
-            self._tool_state = updated_tool_state
-            if assigned_nozzle_id in self._nozzles:
-                self._tool_state[self._active_tool_id]["profile_id"] = self._nozzles[assigned_nozzle_id].get(
-                    "profile_id",
-                    DEFAULT_PROFILE_ID,
+            self._record_status_change_locked(nozzle_ids=(assigned_nozzle_id,), tool_ids=(self._active_tool_id,))
+            if nozzle_seconds == tool_seconds:
+                journal_deltas = (((assigned_nozzle_id, self._active_tool_id), nozzle_seconds),)
+            else:
+                journal_deltas = (
+                    ((assigned_nozzle_id, ""), nozzle_seconds),
+                    (("", self._active_tool_id), tool_seconds),
                 )
+            for journal_key, delta_seconds in journal_deltas:
+                if delta_seconds > 0:
+                    self._runtime_journal_pending[journal_key] = (
+                        self._runtime_journal_pending.get(journal_key, 0) + delta_seconds
+                    )
+            self._tool_state[self._active_tool_id]["profile_id"] = self._nozzles[assigned_nozzle_id].get(
+                "profile_id",
+                DEFAULT_PROFILE_ID,
+            )
             self._phase1_runtime_dirty = True
-            self._phase2_error_flags = {}
+            self._runtime_clean_seq = None
+            if self._phase2_error_flags:
+                self._phase2_error_flags = {}
+                self._mark_state_changed_locked()
             if persist_if_due:
                 self._maybe_persist_phase1_tool_state_locked(force=False)
-        return delta_seconds
+        return nozzle_seconds
+
+    def _settle_open_interval_locked(self, persist_if_due=False):
+        """Fold whole seconds of the open print interval into the counters."""
+        if not self._tickless_accounting or not self._is_printing or self._last_tick_ts is None:
+            return 0
+        return self._phase1_tick_locked(now_ts=time.monotonic(), persist_if_due=persist_if_due)
+
+    def _clear_runtime_carry_locked(self, nozzle_ids=(), tool_ids=()):
+        for nozzle_id in nozzle_ids:
+            self._runtime_carry_units.pop(("n", nozzle_id), None)
+        for tool_id in tool_ids:
+            self._runtime_carry_units.pop(("t", tool_id), None)
+
+    def _tickless_deadline_locked(self, last_settle_ts):
+        if not self._is_printing:
+            return None
+        # A persist that did not happen (nothing dirty, write failed) must not pin
+        # the deadline in the past, so the last settle attempt also pushes it out.
+        return max(self._last_phase1_persist_ts or 0.0, last_settle_ts) + PHASE1_PERSIST_INTERVAL_SECONDS
 
     def _ensure_tool_state_entry_locked(self, tool_id):
         tool_id = str(tool_id).upper()
-        state = self._normalize_tool_state_entry(tool_id, self._tool_state.get(tool_id))
+        existing = self._tool_state.get(tool_id)
+        state = self._normalize_tool_state_entry(tool_id, existing)
         if state["profile_id"] not in self._nozzle_profiles:
             state["profile_id"] = DEFAULT_PROFILE_ID
-        self._tool_state[tool_id] = state
+        # Only creating or healing an entry is a change; an entry that is
+        # already whole is kept as is so readers are not invalidated.
+        changed = state != existing
+        if changed:
+            self._tool_state[tool_id] = state
+        else:
+            state = existing
         mapping = self._tool_map.get(tool_id) or {}
         nozzle_id = str(mapping.get("active_nozzle_id") or "").strip()
         if not nozzle_id or nozzle_id not in self._nozzles:
+            changed = True
             legacy_nozzle_id = "nozzle_{}_legacy".format(tool_id)
             if legacy_nozzle_id not in self._nozzles:
                 self._nozzles[legacy_nozzle_id] = {
@@ -894,21 +1995,23 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
                     "metadata": {},
                 }
             self._tool_map[tool_id] = {"active_nozzle_id": legacy_nozzle_id}
+            nozzle_id = legacy_nozzle_id
+        if changed:
+            self._mark_state_changed_locked(nozzle_ids=(nozzle_id,), tool_ids=(tool_id,))
         return state
 
     def _save_phase1_settings(self, tool_state_only=False):
-        runtime_saved = self._save_runtime_state()
+        runtime_saved = self._queue_runtime_snapshot_locked()
         if not tool_state_only and not runtime_saved:
             self._logger.warning("Skipping stable settings save because runtime-state persistence failed")
         if not tool_state_only and runtime_saved:
-            self._save_settings_state()
+            self._save_inventory_state()
         if runtime_saved:
-            self._phase1_runtime_dirty = False
-            self._last_phase1_persist_ts = time.time()
+            self._last_phase1_persist_ts = time.monotonic()
         return runtime_saved
 
     def _maybe_persist_phase1_tool_state_locked(self, force=False):
-        now_ts = time.time()
+        now_ts = time.monotonic()
         should_snapshot = should_snapshot_runtime_state(
             is_printing=self._is_printing,
             is_dirty=self._phase1_runtime_dirty,
@@ -920,7 +2023,12 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
         if not should_snapshot:
             return False
 
-        runtime_saved = self._save_phase1_settings(tool_state_only=True)
+        if force:
+            runtime_saved = self._save_phase1_settings(tool_state_only=True)
+        else:
+            runtime_saved = self._queue_runtime_journal_locked()
+            if runtime_saved:
+                self._last_phase1_persist_ts = now_ts
         if runtime_saved and force:
             self._logger.debug("Saved runtime state at print-state transition")
         elif runtime_saved:
@@ -944,11 +2052,43 @@ class NozzleLifeTrackerPlugin(StartupPlugin,
         self._persist_worker.start()
 
     def _phase1_persist_worker_loop(self):
-        while not self._persist_worker_stop.wait(PHASE1_PERSIST_CHECK_INTERVAL_SECONDS):
+        next_tick_ts = time.monotonic() + PHASE1_PERSIST_CHECK_INTERVAL_SECONDS
+        last_settle_ts = 0.0
+        while not self._persist_worker_stop.is_set():
+            now_ts = time.monotonic()
+            with self._lock:
+                self._drain_tool_changes_locked()
+                if self._tickless_accounting:
+                    deadline_ts = self._tickless_deadline_locked(last_settle_ts)
+                    if deadline_ts is not None and now_ts >= deadline_ts:
+                        last_settle_ts = now_ts
+                        self._settle_open_interval_locked(persist_if_due=True)
+                elif now_ts >= next_tick_ts:
+                    next_tick_ts = now_ts + PHASE1_PERSIST_CHECK_INTERVAL_SECONDS
+                    if self._is_printing:
+                        self._phase1_tick_locked(now_ts=time.monotonic(), persist_if_due=True)
+
+            self._publish_status_update(now_ts=time.monotonic())
+
+            # Changes set the event; clearing before the pending check means a
+            # change racing with it still wakes the wait below.
+            self._status_push_event.clear()
+            if self._persist_worker_stop.is_set():
+                break
             with self._lock:
-                if not self._is_printing:
-                    continue
-                self._phase1_tick_locked(now_ts=time.time(), persist_if_due=True)
+                push_delay = self._status_push_delay_locked(time.monotonic())
+                if self._tickless_accounting:
+                    deadline_ts = self._tickless_deadline_locked(last_settle_ts)
+                    wait_seconds = None if deadline_ts is None else deadline_ts - time.monotonic()
+                else:
+                    wait_seconds = next_tick_ts - time.monotonic()
+            if push_delay is not None:
+                wait_seconds = push_delay if wait_seconds is None else min(wait_seconds, push_delay)
+            if wait_seconds is None:
+                # Idle in tickless mode: only a transition or shutdown wakes us.
+                self._status_push_event.wait()
+            elif wait_seconds > 0:
+                self._status_push_event.wait(wait_seconds)
 
 
 def __plugin_load__():
@@ -0,0 +1,255 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+
+from .runtime_state import _fsync_directory
+
+
+COUNTER_FILENAME = "runtime_counters.bin"
+COUNTER_FILE_MAGIC = b"NLTC"
+COUNTER_FILE_VERSION = 1
+RUNTIME_STORAGE_BACKENDS = ("json", "mmap")
+
+# magic, version, reserved, generation, slot_count, bank_crc, directory_length,
+# directory_crc; the header CRC over these bytes follows immediately after.
+_HEADER = struct.Struct("<4sHHQIIII")
+_HEADER_CRC = struct.Struct("<I")
+_HEADER_SIZE = 64
+_SLOT = struct.Struct("<q")
+_DATA_OFFSET = 2 * _HEADER_SIZE
+
+
+def nozzle_counter_key(nozzle_id):
+    return "n:{}".format(nozzle_id)
+
+
+def tool_counter_key(tool_id):
+    return "t:{}".format(tool_id)
+
+
+def runtime_state_counters(runtime_state):
+    """Flatten the accumulated_seconds of a runtime state into counter-file keys."""
+    counters = {}
+    for tool_id, entry in ((runtime_state or {}).get("tool_state") or {}).items():
+        counters[tool_counter_key(tool_id)] = int((entry or {}).get("accumulated_seconds", 0) or 0)
+    for nozzle_id, entry in ((runtime_state or {}).get("nozzle_runtime") or {}).items():
+        counters[nozzle_counter_key(nozzle_id)] = int((entry or {}).get("accumulated_seconds", 0) or 0)
+    return counters
+
+
+def apply_counters_to_runtime_state(runtime_state, counters):
+    """Overlay counter-file values onto a runtime state loaded from JSON, in place."""
+    tool_state = runtime_state.setdefault("tool_state", {})
+    nozzle_runtime = runtime_state.setdefault("nozzle_runtime", {})
+    for key, value in (counters or {}).items():
+        kind, _, entry_id = key.partition(":")
+        if not entry_id:
+            continue
+        value = max(0, int(value))
+        if kind == "n":
+            nozzle_runtime.setdefault(entry_id, {})["accumulated_seconds"] = value
+        elif kind == "t":
+            entry = tool_state.setdefault(entry_id, {"tool_id": entry_id})
+            entry["accumulated_seconds"] = value
+    return runtime_state
+
+
+def _bank_offset(bank, slot_count):
+    return _DATA_OFFSET + bank * slot_count * _SLOT.size
+
+
+def _pack_header(generation, slot_count, bank_crc, directory_length, directory_crc):
+    header = _HEADER.pack(
+        COUNTER_FILE_MAGIC,
+        COUNTER_FILE_VERSION,
+        0,
+        generation,
+        slot_count,
+        bank_crc,
+        directory_length,
+        directory_crc,
+    )
+    header += _HEADER_CRC.pack(zlib.crc32(header))
+    return header.ljust(_HEADER_SIZE, b"\0")
+
+
+def _unpack_header(data):
+    if len(data) < _HEADER.size + _HEADER_CRC.size:
+        return None
+    fields = _HEADER.unpack_from(data, 0)
+    (stored_crc,) = _HEADER_CRC.unpack_from(data, _HEADER.size)
+    if fields[0] != COUNTER_FILE_MAGIC or fields[1] != COUNTER_FILE_VERSION:
+        return None
+    if zlib.crc32(data[: _HEADER.size]) != stored_crc:
+        return None
+    return {
+        "generation": fields[3],
+        "slot_count": fields[4],
+        "bank_crc": fields[5],
+        "directory_length": fields[6],
+        "directory_crc": fields[7],
+    }
+
+
+class CounterFile(object):
+    """Memory-mapped counter file: two headers, two slot banks, then a JSON key directory."""
+
+    def __init__(self, path):
+        self._path = path
+        self._handle = None
+        self._mmap = None
+        self._keys = []
+        self._slots = {}
+        self._values = []
+        self._bank = 0
+        self._generation = 0
+        self._directory_length = 0
+        self._directory_crc = 0
+        # Slots the non-current bank is missing: written only to the current one.
+        self._stale = set()
+
+    def load(self):
+        """Map the file and return (counters, status) like load_runtime_state_file."""
+        self.close()
+        if not os.path.exists(self._path):
+            return {}, "missing"
+        try:
+            self._map()
+        except (OSError, ValueError):
+            self.close()
+            return {}, "malformed"
+
+        best = None
+        for bank in (0, 1):
+            header = _unpack_header(self._mmap[bank * _HEADER_SIZE : (bank + 1) * _HEADER_SIZE])
+            if header is None or not self._header_is_consistent(bank, header):
+                continue
+            if best is None or header["generation"] > best[1]["generation"]:
+                best = (bank, header)
+        if best is None:
+            self.close()
+            return {}, "malformed"
+
+        bank, header = best
+        slot_count = header["slot_count"]
+        directory_offset = _bank_offset(2, slot_count)
+        directory = json.loads(bytes(self._mmap[directory_offset : directory_offset + header["directory_length"]]))
+        offset = _bank_offset(bank, slot_count)
+        self._keys = [str(key) for key in directory]
+        self._slots = {key: index for index, key in enumerate(self._keys)}
+        self._values = [_SLOT.unpack_from(self._mmap, offset + index * _SLOT.size)[0] for index in range(slot_count)]
+        self._bank = bank
+        self._generation = header["generation"]
+        self._directory_length = header["directory_length"]
+        self._directory_crc = header["directory_crc"]
+        # The other bank may hold an older generation; refresh every slot on the next write.
+        self._stale = set(range(slot_count))
+        return dict(zip(self._keys, self._values)), "loaded"
+
+    def write(self, counters):
+        """Persist changed counters; returns the number of slots written."""
+        counters = {str(key): int(value) for key, value in (counters or {}).items()}
+        if not counters:
+            return 0
+        if self._mmap is None or any(key not in self._slots for key in counters):
+            merged = dict(zip(self._keys, self._values))
+            merged.update(counters)
+            self._rewrite(merged)
+            return len(merged)
+
+        changed = set()
+        for key, value in counters.items():
+            slot = self._slots[key]
+            if self._values[slot] != value:
+                self._values[slot] = value
+                changed.add(slot)
+        if not changed:
+            return 0
+
+        target = 1 - self._bank
+        slot_count = len(self._keys)
+        offset = _bank_offset(target, slot_count)
+        dirty = changed | self._stale
+        for slot in dirty:
+            _SLOT.pack_into(self._mmap, offset + slot * _SLOT.size, self._values[slot])
+        bank_crc = zlib.crc32(self._mmap[offset : offset + slot_count * _SLOT.size])
+        generation = self._generation + 1
+        self._mmap[target * _HEADER_SIZE : (target + 1) * _HEADER_SIZE] = _pack_header(
+            generation, slot_count, bank_crc, self._directory_length, self._directory_crc
+        )
+        self._mmap.flush()
+        self._bank = target
+        self._generation = generation
+        self._stale = changed
+        return len(dirty)
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _map(self):
+        self._handle = open(self._path, "r+b")
+        self._mmap = mmap.mmap(self._handle.fileno(), 0)
+
+    def _header_is_consistent(self, bank, header):
+        slot_count = header["slot_count"]
+        directory_offset = _bank_offset(2, slot_count)
+        if directory_offset + header["directory_length"] > len(self._mmap):
+            return False
+        directory = self._mmap[directory_offset : directory_offset + header["directory_length"]]
+        if zlib.crc32(directory) != header["directory_crc"]:
+            return False
+        offset = _bank_offset(bank, slot_count)
+        return zlib.crc32(self._mmap[offset : offset + slot_count * _SLOT.size]) == header["bank_crc"]
+
+    def _rewrite(self, counters):
+        keys = sorted(counters)
+        values = [counters[key] for key in keys]
+        bank = b"".join(_SLOT.pack(value) for value in values)
+        directory = json.dumps(keys, separators=(",", ":")).encode("utf-8")
+        generation = self._generation + 1
+        header = _pack_header(generation, len(keys), zlib.crc32(bank), len(directory), zlib.crc32(directory))
+        # Bank 1 is left without a valid header until the first in-place write.
+        payload = header + b"\0" * _HEADER_SIZE + bank + bank + directory
+
+        self.close()
+        directory_path = os.path.dirname(self._path) or "."
+        os.makedirs(directory_path, exist_ok=True)
+        temp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                mode="wb",
+                dir=directory_path,
+                prefix=os.path.basename(self._path) + ".",
+                suffix=".tmp",
+                delete=False,
+            ) as handle:
+                temp_path = handle.name
+                handle.write(payload)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temp_path, self._path)
+            _fsync_directory(directory_path)
+        finally:
+            if temp_path and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+        self._map()
+        self._keys = keys
+        self._slots = {key: index for index, key in enumerate(keys)}
+        self._values = values
+        self._bank = 0
+        self._generation = generation
+        self._directory_length = len(directory)
+        self._directory_crc = zlib.crc32(directory)
+        self._stale = set()
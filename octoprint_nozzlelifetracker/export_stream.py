@@ -0,0 +1,180 @@
+import csv
+import io
+import json
+import time
+import zlib
+from collections.abc import Mapping
+
+from .job_ledger import parse_job_timestamp
+
+
+EXPORT_DATASETS = ("jobs", "replacements", "nozzles")
+EXPORT_FORMATS = ("csv", "jsonl")
+EXPORT_PAGE_SIZE = 500
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+EXPORT_CSV_FIELDS = {
+    # The first five job columns are the legacy print_log export layout.
+    "jobs": ("timestamp", "nozzle_id", "nozzle_name", "file", "duration", "tool_id", "status"),
+    "replacements": ("timestamp", "tool_id", "nozzle_id", "profile_id", "accumulated_seconds_at_reset"),
+    "nozzles": (
+        "id",
+        "name",
+        "profile_id",
+        "material",
+        "size_mm",
+        "accumulated_seconds",
+        "retired",
+        "assigned_tool_id",
+    ),
+}
+
+
+def parse_export_bound(value):
+    """Parse a from/to bound given as epoch seconds or a local date/time string."""
+    if value is None or str(value).strip() == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    text = str(value).strip()
+    if len(text) == 10:
+        text += " 00:00:00"
+    parsed = parse_job_timestamp(text)
+    if not parsed:
+        raise ValueError("Invalid time bound: {!r}".format(value))
+    return parsed
+
+
+def normalize_export_datasets(value, export_format):
+    if value is None or str(value).strip() == "":
+        # CSV has one column layout per file, so it keeps the legacy jobs-only default.
+        return ("jobs",) if export_format == "csv" else EXPORT_DATASETS
+    names = [name.strip() for name in str(value).split(",") if name.strip()]
+    unknown = [name for name in names if name not in EXPORT_DATASETS]
+    if unknown:
+        raise ValueError("Unknown export dataset(s): {}".format(", ".join(unknown)))
+    if export_format == "csv" and len(names) != 1:
+        raise ValueError("CSV exports take exactly one dataset")
+    return tuple(name for name in EXPORT_DATASETS if name in names)
+
+
+def _format_local_timestamp(ts):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+
+
+def _in_range(ts, since, until):
+    if since is not None and ts < since:
+        return False
+    if until is not None and ts >= until:
+        return False
+    return True
+
+
+def iter_job_records(ledger, since=None, until=None, nozzle_id=None, tool_id=None, page_size=EXPORT_PAGE_SIZE):
+    """Yield job rows newest first, one ledger page in memory at a time."""
+    cursor = None
+    while ledger is not None:
+        jobs, cursor = ledger.query(
+            since=since,
+            until=until,
+            nozzle_id=nozzle_id,
+            tool_id=tool_id,
+            cursor=cursor,
+            limit=page_size,
+        )
+        for job in jobs:
+            yield {
+                "timestamp": _format_local_timestamp(job["started_at"]),
+                "nozzle_id": job["nozzle_id"],
+                "nozzle_name": job["nozzle_name"],
+                "file": job["file"],
+                "duration": job["duration_seconds"],
+                "tool_id": job["tool_id"],
+                "status": job["status"],
+            }
+        if cursor is None:
+            break
+
+
+def iter_replacement_records(replacement_log, since=None, until=None, nozzle_id=None, tool_id=None):
+    for entry in replacement_log or ():
+        if not isinstance(entry, Mapping):
+            continue
+        if tool_id and entry.get("tool_id") != tool_id:
+            continue
+        if nozzle_id and entry.get("nozzle_id") != nozzle_id:
+            continue
+        if (since is not None or until is not None) and not _in_range(
+            parse_job_timestamp(entry.get("timestamp")), since, until
+        ):
+            continue
+        yield {field: entry.get(field) for field in EXPORT_CSV_FIELDS["replacements"]}
+
+
+def iter_nozzle_records(nozzles, tool_map, nozzle_id=None, tool_id=None):
+    assigned = {}
+    for mapped_tool_id, mapping in (tool_map or {}).items():
+        mapped_nozzle_id = str((mapping or {}).get("active_nozzle_id") or "")
+        if mapped_nozzle_id:
+            assigned[mapped_nozzle_id] = mapped_tool_id
+    for current_id in sorted(nozzles or {}):
+        if nozzle_id and current_id != nozzle_id:
+            continue
+        if tool_id and assigned.get(current_id) != tool_id:
+            continue
+        nozzle = nozzles[current_id]
+        record = {field: nozzle.get(field) for field in EXPORT_CSV_FIELDS["nozzles"]}
+        record["id"] = current_id
+        record["assigned_tool_id"] = assigned.get(current_id)
+        yield record
+
+
+def _chunked(buffer, min_bytes):
+    # Hands back the buffered text once it is large enough and empties the buffer.
+    if buffer.tell() < min_bytes:
+        return None
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate(0)
+    return text
+
+
+def stream_csv(records, fieldnames, chunk_bytes=EXPORT_CHUNK_BYTES):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(fieldnames), extrasaction="ignore")
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        chunk = _chunked(buffer, chunk_bytes)
+        if chunk:
+            yield chunk
+    chunk = _chunked(buffer, 0)
+    if chunk:
+        yield chunk
+
+
+def stream_jsonl(tagged_records, chunk_bytes=EXPORT_CHUNK_BYTES):
+    """Serialize (dataset, record) pairs as one JSON object per line."""
+    buffer = io.StringIO()
+    for dataset, record in tagged_records:
+        line = dict(record)
+        line["record"] = dataset
+        buffer.write(json.dumps(line, sort_keys=True, separators=(",", ":")))
+        buffer.write("\n")
+        chunk = _chunked(buffer, chunk_bytes)
+        if chunk:
+            yield chunk
+    chunk = _chunked(buffer, 0)
+    if chunk:
+        yield chunk
+
+
+def gzip_stream(chunks, level=6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,127 @@
+import copy
+import json
+import os
+import uuid
+
+from .runtime_state import (
+    append_runtime_journal,
+    read_runtime_journal,
+    reset_runtime_journal,
+    strip_runtime_state_from_settings,
+    write_json_file_atomic,
+)
+
+
+INVENTORY_FILENAME = "inventory.json"
+INVENTORY_JOURNAL_FILENAME = "inventory.journal"
+INVENTORY_SECTIONS = ("nozzle_profiles", "nozzles", "tool_map")
+
+
+def default_inventory():
+    return {section: {} for section in INVENTORY_SECTIONS}
+
+
+def normalize_inventory(inventory):
+    inventory_in = inventory if isinstance(inventory, dict) else {}
+    normalized = {}
+    for section in INVENTORY_SECTIONS:
+        entries = inventory_in.get(section) if isinstance(inventory_in.get(section), dict) else {}
+        normalized[section] = {
+            str(entry_id): copy.deepcopy(entry)
+            for entry_id, entry in entries.items()
+            if isinstance(entry, dict)
+        }
+    return normalized
+
+
+def has_inventory(inventory):
+    inventory_in = inventory if isinstance(inventory, dict) else {}
+    return any(inventory_in.get(section) for section in INVENTORY_SECTIONS)
+
+
+def _stable_inventory_entry(section, entry_id, entry):
+    # Runtime counters live in runtime_state.json; the inventory keeps them at zero.
+    if section == "nozzles":
+        return strip_runtime_state_from_settings({}, [], {entry_id: entry})[2][entry_id]
+    return copy.deepcopy(entry)
+
+
+def build_inventory(nozzle_profiles, nozzles, tool_map):
+    _, _, sanitized_nozzles = strip_runtime_state_from_settings({}, [], nozzles)
+    return normalize_inventory(
+        {
+            "nozzle_profiles": nozzle_profiles,
+            "nozzles": sanitized_nozzles,
+            "tool_map": tool_map,
+        }
+    )
+
+
+def build_inventory_journal_records(sections, dirty):
+    """Build upsert/delete records for the dirty ids of each inventory section."""
+    records = []
+    for section in INVENTORY_SECTIONS:
+        live = sections.get(section) or {}
+        for entry_id in sorted(str(entry_id) for entry_id in (dirty.get(section) or ()) if entry_id):
+            entry = live.get(entry_id)
+            records.append(
+                {
+                    "s": section,
+                    "id": entry_id,
+                    "v": _stable_inventory_entry(section, entry_id, entry) if isinstance(entry, dict) else None,
+                }
+            )
+    return records
+
+
+def apply_inventory_journal(inventory, records):
+    normalized = normalize_inventory(inventory)
+    for record in records or []:
+        if not isinstance(record, dict):
+            continue
+        section = record.get("s")
+        entry_id = str(record.get("id") or "")
+        if section not in INVENTORY_SECTIONS or not entry_id:
+            continue
+        value = record.get("v")
+        if isinstance(value, dict):
+            normalized[section][entry_id] = value
+        else:
+            normalized[section].pop(entry_id, None)
+    return normalized
+
+
+def load_inventory_file(path, journal_path=None):
+    if not path or not os.path.exists(path):
+        return default_inventory(), "missing"
+
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            raw = json.load(handle)
+    except (OSError, ValueError, TypeError):
+        return default_inventory(), "malformed"
+    if not isinstance(raw, dict):
+        return default_inventory(), "malformed"
+
+    normalized = normalize_inventory(raw)
+    snapshot_epoch = raw.get("journal_epoch")
+    if journal_path and snapshot_epoch:
+        journal_epoch, records = read_runtime_journal(journal_path)
+        if journal_epoch == snapshot_epoch:
+            normalized = apply_inventory_journal(normalized, records)
+
+    return normalized, "loaded"
+
+
+def append_inventory_journal(journal_path, records):
+    return append_runtime_journal(journal_path, records)
+
+
+def compact_inventory_file(path, journal_path, inventory):
+    # Same ordering as the runtime snapshot: a crash between the two writes
+    # leaves a journal with a stale epoch, which load ignores.
+    epoch = uuid.uuid4().hex
+    payload = normalize_inventory(inventory)
+    payload["journal_epoch"] = epoch
+    write_json_file_atomic(path, payload)
+    return reset_runtime_journal(journal_path, epoch)
@@ -0,0 +1,202 @@
+import sqlite3
+import threading
+import time
+
+
+JOB_LEDGER_FILENAME = "job_ledger.sqlite3"
+JOB_LEDGER_FIELDS = (
+    "id",
+    "started_at",
+    "ended_at",
+    "status",
+    "file",
+    "tool_id",
+    "nozzle_id",
+    "nozzle_name",
+    "duration_seconds",
+)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        started_at REAL NOT NULL,
+        ended_at REAL,
+        status TEXT NOT NULL,
+        file TEXT,
+        tool_id TEXT,
+        nozzle_id TEXT,
+        nozzle_name TEXT,
+        duration_seconds INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS jobs_started_at ON jobs (started_at, id)",
+    "CREATE INDEX IF NOT EXISTS jobs_nozzle_id ON jobs (nozzle_id, started_at, id)",
+    "CREATE INDEX IF NOT EXISTS jobs_tool_id ON jobs (tool_id, started_at, id)",
+    "CREATE TABLE IF NOT EXISTS ledger_meta (key TEXT PRIMARY KEY, value TEXT)",
+)
+
+
+def parse_job_timestamp(value):
+    if value is None:
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    text = str(value).strip().replace("T", " ").rstrip("Z")
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M"):
+        try:
+            return time.mktime(time.strptime(text, fmt))
+        except ValueError:
+            continue
+    return 0.0
+
+
+def encode_job_cursor(row):
+    return "{!r}:{}".format(float(row["started_at"]), int(row["id"]))
+
+
+def decode_job_cursor(cursor):
+    try:
+        started_at, row_id = str(cursor).rsplit(":", 1)
+        return float(started_at), int(row_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor: {!r}".format(cursor))
+
+
+class JobLedger(object):
+    """SQLite (WAL) job history with separate, separately locked write and read connections."""
+
+    def __init__(self, path):
+        self._path = path
+        self._lock = threading.Lock()
+        self._connection = None
+        self._read_lock = threading.Lock()
+        self._read_connection = None
+
+    def open(self):
+        with self._lock:
+            if self._connection is not None:
+                return
+            connection = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            read_connection = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+            read_connection.row_factory = sqlite3.Row
+            read_connection.execute("PRAGMA query_only=ON")
+            with self._read_lock:
+                self._read_connection = read_connection
+            self._connection = connection
+
+    def close(self):
+        with self._lock:
+            if self._connection is None:
+                return
+            with self._read_lock:
+                self._read_connection.close()
+                self._read_connection = None
+            self._connection.close()
+            self._connection = None
+
+    def start_job(self, *, started_at, file=None, tool_id=None, nozzle_id=None, nozzle_name=None):
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT INTO jobs (started_at, status, file, tool_id, nozzle_id, nozzle_name) "
+                "VALUES (?, 'printing', ?, ?, ?, ?)",
+                (float(started_at), file, tool_id, nozzle_id, nozzle_name),
+            )
+            return cursor.lastrowid
+
+    def finish_job(self, job_id, *, ended_at, status, duration_seconds):
+        with self._lock:
+            self._connection.execute(
+                "UPDATE jobs SET ended_at = ?, status = ?, duration_seconds = ? WHERE id = ?",
+                (float(ended_at), str(status), max(0, int(duration_seconds)), int(job_id)),
+            )
+
+    def migrate_print_log(self, entries):
+        """Import legacy settings print_log entries once; returns rows imported."""
+        with self._lock:
+            connection = self._connection
+            done = connection.execute(
+                "SELECT value FROM ledger_meta WHERE key = 'print_log_migrated'"
+            ).fetchone()
+            if done is not None:
+                return 0
+            rows = []
+            for entry in entries or []:
+                if not isinstance(entry, dict):
+                    continue
+                try:
+                    duration_seconds = max(0, int(float(entry.get("duration") or 0)))
+                except (TypeError, ValueError):
+                    duration_seconds = 0
+                started_at = parse_job_timestamp(entry.get("timestamp"))
+                rows.append(
+                    (
+                        started_at,
+                        started_at + duration_seconds,
+                        "done",
+                        entry.get("file"),
+                        entry.get("tool_id"),
+                        entry.get("nozzle_id"),
+                        entry.get("nozzle_name"),
+                        duration_seconds,
+                    )
+                )
+            connection.execute("BEGIN")
+            try:
+                connection.executemany(
+                    "INSERT INTO jobs (started_at, ended_at, status, file, tool_id, nozzle_id, nozzle_name, "
+                    "duration_seconds) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                connection.execute(
+                    "INSERT INTO ledger_meta (key, value) VALUES ('print_log_migrated', ?)",
+                    (str(len(rows)),),
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+            return len(rows)
+
+    def query(self, *, since=None, until=None, nozzle_id=None, tool_id=None, cursor=None, limit=100):
+        """Return (rows, next_cursor), newest first, keyset-paginated by (started_at, id)."""
+        clauses = []
+        params = []
+        if nozzle_id:
+            clauses.append("nozzle_id = ?")
+            params.append(str(nozzle_id))
+        if tool_id:
+            clauses.append("tool_id = ?")
+            params.append(str(tool_id))
+        if since is not None:
+            clauses.append("started_at >= ?")
+            params.append(float(since))
+        if until is not None:
+            clauses.append("started_at < ?")
+            params.append(float(until))
+        if cursor:
+            cursor_started_at, cursor_id = decode_job_cursor(cursor)
+            clauses.append("(started_at < ? OR (started_at = ? AND id < ?))")
+            params.extend((cursor_started_at, cursor_started_at, cursor_id))
+        limit = max(1, int(limit))
+
+        sql = "SELECT {} FROM jobs".format(", ".join(JOB_LEDGER_FIELDS))
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY started_at DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        with self._read_lock:
+            rows = [dict(row) for row in self._read_connection.execute(sql, params).fetchall()]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_job_cursor(rows[-1])
+        return rows, next_cursor
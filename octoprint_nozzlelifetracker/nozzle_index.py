@@ -0,0 +1,209 @@
+import bisect
+from collections.abc import Mapping
+
+from .phase1_settings import resolve_effective_life_seconds
+
+
+NOZZLE_QUERY_SORTS = ("id", "hours", "percent")
+NOZZLE_QUERY_FILTERS = ("retired", "material", "size_mm", "profile_id")
+
+
+def _bucket_value(field, value):
+    if field == "retired":
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "yes")
+        return bool(value)
+    if field == "size_mm":
+        try:
+            return round(float(value), 3)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid size_mm filter: {!r}".format(value))
+    if field == "material":
+        return str(value or "").strip().lower()
+    return str(value or "").strip()
+
+
+class NozzleInventoryIndex(object):
+    """Secondary indexes over the nozzle inventory for paged queries."""
+
+    def __init__(self):
+        self._keys = {}
+        self._buckets = {field: {} for field in NOZZLE_QUERY_FILTERS}
+        self._by_id = []
+        self._by_seconds = []
+        self._by_ratio = []
+        self._dirty = set()
+        self._needs_rebuild = True
+
+    def __len__(self):
+        return len(self._keys)
+
+    def mark_changed(self, nozzle_ids=(), full=False):
+        if full:
+            self._needs_rebuild = True
+            self._dirty.clear()
+        elif not self._needs_rebuild:
+            self._dirty.update(nozzle_ids)
+
+    def sync(self, nozzles, profiles):
+        nozzles = nozzles if isinstance(nozzles, Mapping) else {}
+        if self._needs_rebuild:
+            self._rebuild(nozzles, profiles)
+            return
+        for nozzle_id in self._dirty:
+            self._remove(nozzle_id)
+            nozzle = nozzles.get(nozzle_id)
+            if isinstance(nozzle, Mapping):
+                self._insert(nozzle_id, self._index_key(nozzle, profiles))
+        self._dirty.clear()
+
+    def _rebuild(self, nozzles, profiles):
+        self._keys = {}
+        self._buckets = {field: {} for field in NOZZLE_QUERY_FILTERS}
+        for nozzle_id, nozzle in nozzles.items():
+            if not isinstance(nozzle, Mapping):
+                continue
+            key = self._index_key(nozzle, profiles)
+            self._keys[str(nozzle_id)] = key
+            self._add_to_buckets(str(nozzle_id), key)
+        self._by_id = sorted(self._keys)
+        self._by_seconds = sorted((key["seconds"], nozzle_id) for nozzle_id, key in self._keys.items())
+        self._by_ratio = sorted((key["ratio"], nozzle_id) for nozzle_id, key in self._keys.items())
+        self._dirty.clear()
+        self._needs_rebuild = False
+
+    def _index_key(self, nozzle, profiles):
+        try:
+            seconds = max(0, int(float(nozzle.get("accumulated_seconds", 0))))
+        except (TypeError, ValueError):
+            seconds = 0
+        life_seconds = resolve_effective_life_seconds(nozzle, profiles)
+        return {
+            "retired": _bucket_value("retired", nozzle.get("retired", False)),
+            "material": _bucket_value("material", nozzle.get("material") or "brass"),
+            "size_mm": _bucket_value("size_mm", nozzle.get("size_mm") or 0.4),
+            "profile_id": _bucket_value("profile_id", nozzle.get("profile_id")),
+            "seconds": seconds,
+            # Zero-life nozzles are never overdue, matching the status payload.
+            "ratio": float(seconds) / float(life_seconds) if life_seconds > 0 else 0.0,
+        }
+
+    def _add_to_buckets(self, nozzle_id, key):
+        for field in NOZZLE_QUERY_FILTERS:
+            self._buckets[field].setdefault(key[field], set()).add(nozzle_id)
+
+    def _insert(self, nozzle_id, key):
+        self._keys[nozzle_id] = key
+        self._add_to_buckets(nozzle_id, key)
+        bisect.insort(self._by_id, nozzle_id)
+        bisect.insort(self._by_seconds, (key["seconds"], nozzle_id))
+        bisect.insort(self._by_ratio, (key["ratio"], nozzle_id))
+
+    def _remove(self, nozzle_id):
+        key = self._keys.pop(nozzle_id, None)
+        if key is None:
+            return
+        for field in NOZZLE_QUERY_FILTERS:
+            bucket = self._buckets[field].get(key[field])
+            if bucket is not None:
+                bucket.discard(nozzle_id)
+                if not bucket:
+                    del self._buckets[field][key[field]]
+        self._delete_sorted(self._by_id, nozzle_id)
+        self._delete_sorted(self._by_seconds, (key["seconds"], nozzle_id))
+        self._delete_sorted(self._by_ratio, (key["ratio"], nozzle_id))
+
+    @staticmethod
+    def _delete_sorted(values, item):
+        position = bisect.bisect_left(values, item)
+        if position < len(values) and values[position] == item:
+            del values[position]
+
+    def _overdue_slice(self, overdue):
+        split = bisect.bisect_left(self._by_ratio, (1.0, ""))
+        if overdue:
+            return self._by_ratio[split:]
+        return self._by_ratio[:split]
+
+    def query(self, *, filters=None, overdue=None, sort="id", descending=False, offset=0, limit=50):
+        """Return (page_ids, total) for the filtered, sorted inventory."""
+        if sort not in NOZZLE_QUERY_SORTS:
+            raise ValueError("Unknown sort: {}".format(sort))
+        offset = max(0, int(offset))
+        limit = max(0, int(limit))
+
+        buckets = []
+        for field, value in (filters or {}).items():
+            if field not in NOZZLE_QUERY_FILTERS:
+                raise ValueError("Unknown filter: {}".format(field))
+            if value is None:
+                continue
+            buckets.append(self._buckets[field].get(_bucket_value(field, value), set()))
+
+        candidates = None
+        if buckets:
+            buckets.sort(key=len)
+            candidates = set(buckets[0])
+            for bucket in buckets[1:]:
+                candidates &= bucket
+                if not candidates:
+                    break
+
+        if overdue is not None:
+            if candidates is None and sort == "percent":
+                # The overdue split is a contiguous run of the ratio order.
+                ordered = [nozzle_id for _, nozzle_id in self._overdue_slice(bool(overdue))]
+                if descending:
+                    ordered.reverse()
+                return ordered[offset:offset + limit], len(ordered)
+            if candidates is None:
+                candidates = set(nozzle_id for _, nozzle_id in self._overdue_slice(bool(overdue)))
+            else:
+                candidates = set(
+                    nozzle_id
+                    for nozzle_id in candidates
+                    if (self._keys[nozzle_id]["ratio"] >= 1.0) == bool(overdue)
+                )
+
+        if sort == "hours":
+            ordered = self._by_seconds
+        elif sort == "percent":
+            ordered = self._by_ratio
+        else:
+            ordered = self._by_id
+
+        if candidates is None:
+            total = len(ordered)
+            if descending:
+                start = max(0, total - offset - limit)
+                page = ordered[start:total - offset] if offset < total else []
+                page = page[::-1]
+            else:
+                page = ordered[offset:offset + limit]
+            return [entry[1] if isinstance(entry, tuple) else entry for entry in page], total
+
+        total = len(candidates)
+        if total * 8 <= len(ordered):
+            # Small result sets are cheaper to sort directly than to walk.
+            if sort == "hours":
+                sort_key = lambda nozzle_id: (self._keys[nozzle_id]["seconds"], nozzle_id)
+            elif sort == "percent":
+                sort_key = lambda nozzle_id: (self._keys[nozzle_id]["ratio"], nozzle_id)
+            else:
+                sort_key = None
+            page = sorted(candidates, key=sort_key, reverse=bool(descending))[offset:offset + limit]
+            return page, total
+
+        page = []
+        skipped = 0
+        for entry in (reversed(ordered) if descending else ordered):
+            nozzle_id = entry[1] if isinstance(entry, tuple) else entry
+            if nozzle_id not in candidates:
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            if len(page) >= limit:
+                break
+            page.append(nozzle_id)
+        return page, total
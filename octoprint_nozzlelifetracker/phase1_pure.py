@@ -3,6 +3,10 @@ import re
 
 DEFAULT_PROFILE_ID = "default_0_4_brass"
 TOOL_CHANGE_CMD_RE = re.compile(r"^\s*T(\d+)\s*(?:;.*)?$", re.IGNORECASE)
+# OctoPrint's parsed command code for tool selection lines ("T1" -> "T").
+TOOL_CHANGE_GCODE = "T"
+# First characters a tool change line can start with when no parsed code is given.
+TOOL_CHANGE_FIRST_CHARS = frozenset("Tt \t")
 
 
 def compute_elapsed_seconds(last_tick_ts, now_ts):
@@ -17,6 +21,27 @@ def compute_elapsed_seconds(last_tick_ts, now_ts):
     return int(delta)
 
 
+# Tick accounting resolution. Timestamps are rounded to it, so successive
+# deltas telescope exactly and remainders add up without float drift.
+ELAPSED_UNITS_PER_SECOND = 1000000
+
+
+def compute_elapsed_units(last_tick_ts, now_ts):
+    """Like compute_elapsed_seconds, but in whole microseconds."""
+    if last_tick_ts is None or now_ts is None:
+        return 0
+    try:
+        delta = round(float(now_ts) * ELAPSED_UNITS_PER_SECOND) - round(float(last_tick_ts) * ELAPSED_UNITS_PER_SECOND)
+    except (TypeError, ValueError):
+        return 0
+    return delta if delta > 0 else 0
+
+
+def carry_elapsed_units(carry_units, delta_units):
+    """Add delta_units to a carried remainder; returns (whole_seconds, new_carry)."""
+    return divmod(max(0, int(carry_units or 0)) + max(0, int(delta_units or 0)), ELAPSED_UNITS_PER_SECOND)
+
+
 def accumulate_tool_seconds(tool_state, tool_id, delta_seconds, default_profile_id=DEFAULT_PROFILE_ID):
     if not tool_id:
         return tool_state or {}, False
@@ -79,6 +104,64 @@ def accumulate_nozzle_seconds(nozzles, nozzle_id, delta_seconds, default_profile
     return updated, True
 
 
+def _coerce_delta_seconds(delta_seconds):
+    try:
+        delta_seconds = int(delta_seconds)
+    except (TypeError, ValueError):
+        return 0
+    return delta_seconds if delta_seconds > 0 else 0
+
+
+def _add_accumulated_seconds(entry, delta_seconds):
+    current_seconds = entry.get("accumulated_seconds", 0)
+    if type(current_seconds) is not int:
+        try:
+            current_seconds = int(float(current_seconds))
+        except (TypeError, ValueError):
+            current_seconds = 0
+    entry["accumulated_seconds"] = max(0, current_seconds) + delta_seconds
+
+
+def accumulate_tool_seconds_inplace(tool_state, tool_id, delta_seconds, default_profile_id=DEFAULT_PROFILE_ID):
+    # Mutating variant of accumulate_tool_seconds for the tick path: only the one
+    # tool entry is touched, so the cost does not depend on how many tools exist.
+    if not tool_id or tool_state is None:
+        return False
+    delta_seconds = _coerce_delta_seconds(delta_seconds)
+    if delta_seconds <= 0:
+        return False
+
+    normalized_tool_id = str(tool_id).upper()
+    entry = tool_state.get(normalized_tool_id)
+    if not isinstance(entry, dict):
+        updated, changed = accumulate_tool_seconds({}, normalized_tool_id, delta_seconds, default_profile_id)
+        tool_state[normalized_tool_id] = updated[normalized_tool_id]
+        return changed
+
+    _add_accumulated_seconds(entry, delta_seconds)
+    return True
+
+
+def accumulate_nozzle_seconds_inplace(nozzles, nozzle_id, delta_seconds, default_profile_id=DEFAULT_PROFILE_ID):
+    # Mutating variant of accumulate_nozzle_seconds for the tick path: existing
+    # entries are assumed normalized and only their counter is updated.
+    if not nozzle_id or nozzles is None:
+        return False
+    delta_seconds = _coerce_delta_seconds(delta_seconds)
+    if delta_seconds <= 0:
+        return False
+
+    normalized_nozzle_id = str(nozzle_id).strip()
+    entry = nozzles.get(normalized_nozzle_id)
+    if not isinstance(entry, dict):
+        updated, changed = accumulate_nozzle_seconds({}, normalized_nozzle_id, delta_seconds, default_profile_id)
+        nozzles[normalized_nozzle_id] = updated[normalized_nozzle_id]
+        return changed
+
+    _add_accumulated_seconds(entry, delta_seconds)
+    return True
+
+
 def extract_tool_id_from_command(cmd):
     if not cmd:
         return None
@@ -1,3 +1,6 @@
+from collections.abc import Mapping
+
+
 def normalize_tool_id(tool_id):
     if tool_id is None:
         return None
@@ -436,14 +439,14 @@ def ensure_phase2_settings(
 
 
 def resolve_effective_life_seconds(nozzle, profiles):
-    nozzle_entry = nozzle if isinstance(nozzle, dict) else {}
+    nozzle_entry = nozzle if isinstance(nozzle, Mapping) else {}
     life_override = _coerce_life_seconds(nozzle_entry.get("life_seconds"))
     if life_override is not None:
         return life_override
 
-    profiles_in = profiles if isinstance(profiles, dict) else {}
+    profiles_in = profiles if isinstance(profiles, Mapping) else {}
     profile_id = str(nozzle_entry.get("profile_id") or "")
-    profile = profiles_in.get(profile_id) if isinstance(profiles_in.get(profile_id), dict) else {}
+    profile = profiles_in.get(profile_id) if isinstance(profiles_in.get(profile_id), Mapping) else {}
     try:
         interval_hours = float(profile.get("interval_hours", 0.0) or 0.0)
     except (TypeError, ValueError):
@@ -499,6 +502,118 @@ def _tool_sort_key(tool_id):
     return (0, int(normalized[1:]), normalized)
 
 
+def _nozzle_runtime_fields(accumulated_seconds, effective_life_seconds):
+    if effective_life_seconds <= 0:
+        percent_to_interval = 0.0
+        is_overdue = False
+    else:
+        percent_to_interval = round(min(100.0, (float(accumulated_seconds) / float(effective_life_seconds)) * 100.0), 1)
+        is_overdue = accumulated_seconds >= effective_life_seconds
+    return {
+        "accumulated_seconds": accumulated_seconds,
+        "accumulated_hours": round(accumulated_seconds / 3600.0, 2),
+        "percent_to_interval": percent_to_interval,
+        "is_overdue": bool(is_overdue),
+    }
+
+
+def _tool_runtime_fields(accumulated_seconds, interval_hours):
+    accumulated_hours = round(accumulated_seconds / 3600.0, 2)
+    if interval_hours <= 0:
+        percent_to_interval = 0.0
+        is_overdue = False
+    else:
+        percent_to_interval = round(min(100.0, (accumulated_hours / interval_hours) * 100.0), 1)
+        is_overdue = accumulated_hours >= interval_hours
+    return {
+        "accumulated_seconds": accumulated_seconds,
+        "accumulated_hours": accumulated_hours,
+        "percent_to_interval": percent_to_interval,
+        "is_overdue": bool(is_overdue),
+    }
+
+
+STATUS_FIELDS = ("profiles", "tools", "nozzles", "tool_map", "active_nozzle")
+
+
+def normalize_status_fields(fields):
+    """Parse a fields= projection into a sorted tuple, or None for everything."""
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    requested = set()
+    for field in fields:
+        name = str(field or "").strip()
+        if not name:
+            continue
+        if name not in STATUS_FIELDS:
+            raise ValueError("Unknown status field: {}".format(name))
+        requested.add(name)
+    if not requested or requested == set(STATUS_FIELDS):
+        return None
+    return tuple(sorted(requested))
+
+
+def project_status_payload(payload, fields):
+    if fields is None:
+        return payload
+    return {
+        key: value
+        for key, value in payload.items()
+        if key == "meta" or key == "version" or key in fields
+    }
+
+
+def build_status_nozzle_entry(nozzle_id, nozzle, profiles):
+    profile = profiles.get(str(nozzle.get("profile_id") or "")) or {}
+    effective_life_seconds = resolve_effective_life_seconds(nozzle, profiles)
+    runtime_fields = _nozzle_runtime_fields(
+        _coerce_nonnegative_int(nozzle.get("accumulated_seconds", 0)),
+        effective_life_seconds,
+    )
+
+    nozzle_entry = {
+        "id": str(nozzle.get("id") or nozzle_id),
+        "name": str(nozzle.get("name") or nozzle_id),
+        "profile_id": str(nozzle.get("profile_id") or ""),
+        "profile_name": str(profile.get("name") or "Unknown"),
+        "material": str(nozzle.get("material") or "brass"),
+        "size_mm": float(nozzle.get("size_mm") or 0.4),
+        "accumulated_seconds": runtime_fields["accumulated_seconds"],
+        "accumulated_hours": runtime_fields["accumulated_hours"],
+        "effective_life_seconds": effective_life_seconds,
+        "percent_to_interval": runtime_fields["percent_to_interval"],
+        "is_overdue": runtime_fields["is_overdue"],
+        "retired": bool(nozzle.get("retired", False)),
+        "notes": str(nozzle.get("notes") or ""),
+        "created_at": nozzle.get("created_at"),
+        "metadata": dict(nozzle.get("metadata") or {}),
+    }
+    if "life_seconds" in nozzle:
+        nozzle_entry["life_seconds"] = _coerce_nonnegative_int(nozzle.get("life_seconds"))
+    return nozzle_entry
+
+
+def build_nozzle_detail(nozzle_id, nozzles, nozzle_profiles, tool_map=None):
+    nozzle_id = str(nozzle_id or "").strip()
+    nozzle = (nozzles or {}).get(nozzle_id)
+    if not nozzle_id or not isinstance(nozzle, Mapping):
+        return None
+    assigned_tools = sorted(
+        (
+            str(tool_id)
+            for tool_id, mapping in (tool_map or {}).items()
+            if isinstance(mapping, dict) and str(mapping.get("active_nozzle_id") or "").strip() == nozzle_id
+        ),
+        key=_tool_sort_key,
+    )
+    return {
+        "nozzle": build_status_nozzle_entry(nozzle_id, nozzle, nozzle_profiles or {}),
+        "assigned_tools": assigned_tools,
+    }
+
+
 def build_status_payload(
     nozzle_profiles,
     tool_state,
@@ -509,22 +624,37 @@ def build_status_payload(
     active_tool_id=None,
     tool_source=None,
     now_ts=None,
+    fields=None,
+    validated=False,
 ):
-    (
-        profiles_fixed,
-        tool_state_fixed,
-        _,
-        nozzles_fixed,
-        tool_map_fixed,
-        normalize_errors,
-    ) = ensure_phase2_settings(
-        nozzle_profiles,
-        tool_state,
-        [],
-        nozzles,
-        tool_map,
-        active_tool_id=active_tool_id,
-    )
+    if validated:
+        # The caller guarantees normalized state, so skip the O(inventory)
+        # normalization; only tool_map is copied since the payload exposes it.
+        profiles_fixed = nozzle_profiles if isinstance(nozzle_profiles, dict) else {}
+        tool_state_fixed = tool_state if isinstance(tool_state, dict) else {}
+        nozzles_fixed = nozzles if isinstance(nozzles, Mapping) else {}
+        tool_map_fixed = {
+            str(tool_id): dict(mapping)
+            for tool_id, mapping in (tool_map if isinstance(tool_map, dict) else {}).items()
+            if isinstance(mapping, dict)
+        }
+        normalize_errors = None
+    else:
+        (
+            profiles_fixed,
+            tool_state_fixed,
+            _,
+            nozzles_fixed,
+            tool_map_fixed,
+            normalize_errors,
+        ) = ensure_phase2_settings(
+            nozzle_profiles,
+            tool_state,
+            [],
+            nozzles,
+            tool_map,
+            active_tool_id=active_tool_id,
+        )
 
     error_flags = {}
     if isinstance(normalize_errors, dict):
@@ -532,9 +662,12 @@ def build_status_payload(
     if isinstance(errors, dict):
         error_flags.update(errors)
 
+    def wants(section):
+        return fields is None or section in fields
+
     profiles_out = []
-    for profile in sorted(profiles_fixed.values(), key=lambda p: (str(p.get("name") or ""), str(p.get("id") or ""))):
-        notes_value = profile.get("notes") if isinstance(profile, dict) else None
+    for profile in sorted(profiles_fixed.values() if wants("profiles") else (), key=lambda p: (str(p.get("name") or ""), str(p.get("id") or ""))):
+        notes_value = profile.get("notes") if isinstance(profile, Mapping) else None
         profiles_out.append(
             {
                 "id": str(profile.get("id") or ""),
@@ -546,39 +679,8 @@ def build_status_payload(
         )
 
     nozzles_out = []
-    for nozzle_id in sorted(nozzles_fixed.keys()):
-        nozzle = nozzles_fixed.get(nozzle_id) or {}
-        profile = profiles_fixed.get(str(nozzle.get("profile_id") or "")) or {}
-        effective_life_seconds = resolve_effective_life_seconds(nozzle, profiles_fixed)
-        accumulated_seconds = _coerce_nonnegative_int(nozzle.get("accumulated_seconds", 0))
-        accumulated_hours = round(accumulated_seconds / 3600.0, 2)
-        if effective_life_seconds <= 0:
-            percent_to_interval = 0.0
-            is_overdue = False
-        else:
-            percent_to_interval = round(min(100.0, (float(accumulated_seconds) / float(effective_life_seconds)) * 100.0), 1)
-            is_overdue = accumulated_seconds >= effective_life_seconds
-
-        nozzle_entry = {
-            "id": str(nozzle.get("id") or nozzle_id),
-            "name": str(nozzle.get("name") or nozzle_id),
-            "profile_id": str(nozzle.get("profile_id") or ""),
-            "profile_name": str(profile.get("name") or "Unknown"),
-            "material": str(nozzle.get("material") or "brass"),
-            "size_mm": float(nozzle.get("size_mm") or 0.4),
-            "accumulated_seconds": accumulated_seconds,
-            "accumulated_hours": accumulated_hours,
-            "effective_life_seconds": effective_life_seconds,
-            "percent_to_interval": percent_to_interval,
-            "is_overdue": bool(is_overdue),
-            "retired": bool(nozzle.get("retired", False)),
-            "notes": str(nozzle.get("notes") or ""),
-            "created_at": nozzle.get("created_at"),
-            "metadata": dict(nozzle.get("metadata") or {}),
-        }
-        if "life_seconds" in nozzle:
-            nozzle_entry["life_seconds"] = _coerce_nonnegative_int(nozzle.get("life_seconds"))
-        nozzles_out.append(nozzle_entry)
+    for nozzle_id in sorted(nozzles_fixed.keys()) if wants("nozzles") else ():
+        nozzles_out.append(build_status_nozzle_entry(nozzle_id, nozzles_fixed.get(nozzle_id) or {}, profiles_fixed))
 
     tools_out = []
     for tool_id in sorted(tool_state_fixed.keys(), key=_tool_sort_key):
@@ -602,13 +704,7 @@ def build_status_payload(
 
         profile = profiles_fixed.get(profile_id) or {}
         interval_hours = float(profile.get("interval_hours", 0.0) or 0.0)
-        accumulated_hours = round(accumulated_seconds / 3600.0, 2)
-        if interval_hours <= 0:
-            percent_to_interval = 0.0
-            is_overdue = False
-        else:
-            percent_to_interval = round(min(100.0, (accumulated_hours / interval_hours) * 100.0), 1)
-            is_overdue = accumulated_hours >= interval_hours
+        runtime_fields = _tool_runtime_fields(accumulated_seconds, interval_hours)
 
         tools_out.append(
             {
@@ -616,10 +712,10 @@ def build_status_payload(
                 "profile_id": profile_id,
                 "profile_name": str(profile.get("name") or "Unknown"),
                 "interval_hours": interval_hours,
-                "accumulated_seconds": accumulated_seconds,
-                "accumulated_hours": accumulated_hours,
-                "percent_to_interval": percent_to_interval,
-                "is_overdue": bool(is_overdue),
+                "accumulated_seconds": runtime_fields["accumulated_seconds"],
+                "accumulated_hours": runtime_fields["accumulated_hours"],
+                "percent_to_interval": runtime_fields["percent_to_interval"],
+                "is_overdue": runtime_fields["is_overdue"],
                 "active_nozzle_id": nozzle_id or None,
                 "runtime_source": runtime_source,
             }
@@ -659,13 +755,10 @@ def build_status_payload(
             profile_id = str(active_nozzle.get("profile_id") or "")
             profile = profiles_fixed.get(profile_id) or {}
             effective_life_seconds = resolve_effective_life_seconds(active_nozzle, profiles_fixed)
-            accumulated_seconds = _coerce_nonnegative_int(active_nozzle.get("accumulated_seconds", 0))
-            if effective_life_seconds <= 0:
-                percent_to_interval = 0.0
-                is_overdue = False
-            else:
-                percent_to_interval = round(min(100.0, (float(accumulated_seconds) / float(effective_life_seconds)) * 100.0), 1)
-                is_overdue = accumulated_seconds >= effective_life_seconds
+            runtime_fields = _nozzle_runtime_fields(
+                _coerce_nonnegative_int(active_nozzle.get("accumulated_seconds", 0)),
+                effective_life_seconds,
+            )
 
             active_nozzle_out = {
                 "tool_id": active_tool,
@@ -675,14 +768,16 @@ def build_status_payload(
                 "size_mm": float(active_nozzle.get("size_mm") or 0.4),
                 "profile_id": profile_id,
                 "profile_name": str(profile.get("name") or "Unknown"),
-                "accumulated_seconds": accumulated_seconds,
-                "accumulated_hours": round(accumulated_seconds / 3600.0, 2),
+                "accumulated_seconds": runtime_fields["accumulated_seconds"],
+                "accumulated_hours": runtime_fields["accumulated_hours"],
                 "effective_life_seconds": effective_life_seconds,
-                "percent_to_interval": percent_to_interval,
-                "is_overdue": bool(is_overdue),
+                "percent_to_interval": runtime_fields["percent_to_interval"],
+                "is_overdue": runtime_fields["is_overdue"],
             }
 
-    return {
+    # Tool rows are always built because they feed error_flags; the per-tool
+    # cost is bounded by the printer's tool count, not the inventory size.
+    return project_status_payload({
         "profiles": profiles_out,
         "tools": tools_out,
         "nozzles": nozzles_out,
@@ -695,7 +790,162 @@ def build_status_payload(
             "known_tools": known_tools,
             "active_nozzle": active_nozzle_out,
         },
+    }, fields)
+
+
+def build_status_payload_index(payload):
+    payload_in = payload if isinstance(payload, dict) else {}
+    return {
+        "nozzles": {
+            str(entry.get("id")): index
+            for index, entry in enumerate(payload_in.get("nozzles") or [])
+        },
+        "tools": {
+            str(entry.get("tool_id")): index
+            for index, entry in enumerate(payload_in.get("tools") or [])
+        },
+        "profiles": {
+            str(entry.get("id")): index
+            for index, entry in enumerate(payload_in.get("profiles") or [])
+        },
+    }
+
+
+def build_status_etag(instance_token, generation, version, fields=None, *, live_seconds=None):
+    tag = "{}-{}-{}".format(instance_token, int(generation), int(version))
+    if live_seconds is not None:
+        tag = "{}-{}".format(tag, int(live_seconds))
+    if fields:
+        tag = "{}-{}".format(tag, ".".join(fields))
+    return '"{}"'.format(tag)
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match or not etag:
+        return False
+    for candidate in str(if_none_match).split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def patch_status_payload_runtime(payload, index, nozzles, tool_state, *, now_ts=None):
+    """Return a copy of a cached status payload with live active-nozzle runtime."""
+    patched = dict(payload)
+    meta = dict(payload.get("meta") or {})
+    meta["generated_at"] = now_ts
+    patched["meta"] = meta
+
+    active_nozzle = meta.get("active_nozzle")
+    if not isinstance(active_nozzle, dict):
+        return patched
+
+    nozzle_id = str(active_nozzle.get("id") or "")
+    live_nozzle = (nozzles or {}).get(nozzle_id)
+    if not isinstance(live_nozzle, Mapping):
+        return patched
+    accumulated_seconds = _coerce_nonnegative_int(live_nozzle.get("accumulated_seconds", 0))
+    if accumulated_seconds == active_nozzle.get("accumulated_seconds"):
+        return patched
+
+    nozzle_fields = _nozzle_runtime_fields(accumulated_seconds, int(active_nozzle.get("effective_life_seconds") or 0))
+    meta["active_nozzle"] = dict(active_nozzle, **nozzle_fields)
+
+    nozzle_index = (index or {}).get("nozzles", {}).get(nozzle_id)
+    if nozzle_index is not None and "nozzles" in payload:
+        nozzles_out = list(payload.get("nozzles") or [])
+        nozzles_out[nozzle_index] = dict(nozzles_out[nozzle_index], **nozzle_fields)
+        patched["nozzles"] = nozzles_out
+
+    tool_id = str(active_nozzle.get("tool_id") or "")
+    tool_index = (index or {}).get("tools", {}).get(tool_id)
+    if tool_index is not None and "tools" in payload:
+        tools_out = list(payload.get("tools") or [])
+        tool_entry = tools_out[tool_index]
+        if tool_entry.get("runtime_source") == "derived_from_assigned_nozzle":
+            tool_seconds = accumulated_seconds
+        else:
+            tool_seconds = _coerce_nonnegative_int(((tool_state or {}).get(tool_id) or {}).get("accumulated_seconds", 0))
+        tools_out[tool_index] = dict(
+            tool_entry,
+            **_tool_runtime_fields(tool_seconds, float(tool_entry.get("interval_hours") or 0.0))
+        )
+        patched["tools"] = tools_out
+
+    return patched
+
+
+def _status_section_delta(payload, index, section, changed_ids):
+    entries = payload.get(section) or []
+    positions = (index or {}).get(section) or {}
+    upsert = []
+    remove = []
+    for entry_id in sorted(changed_ids):
+        position = positions.get(entry_id)
+        if position is None:
+            remove.append(entry_id)
+        else:
+            upsert.append(entries[position])
+    return {"upsert": upsert, "remove": remove}
+
+
+def build_status_delta(payload, index, changes, since_version, current_version):
+    """Build a status delta covering every change after since_version, or the full payload."""
+    current_version = int(current_version)
+    full_payload = dict(payload, version=current_version, full=True)
+    try:
+        since_version = int(since_version)
+    except (TypeError, ValueError):
+        return full_payload
+    if since_version < 0 or since_version > current_version:
+        return full_payload
+
+    relevant = [change for change in (changes or []) if change[0] > since_version]
+    if since_version < current_version:
+        if not relevant or relevant[0][0] != since_version + 1:
+            return full_payload
+        if any(change[4] for change in relevant):
+            return full_payload
+
+    nozzle_ids = set()
+    tool_ids = set()
+    profile_ids = set()
+    structural = False
+    for change in relevant:
+        nozzle_ids.update(change[1])
+        tool_ids.update(change[2])
+        profile_ids.update(change[3])
+        structural = structural or change[5]
+
+    # Tool rows mirror their assigned nozzle, so nozzle changes carry over.
+    if nozzle_ids:
+        for tool in payload.get("tools") or []:
+            if tool.get("active_nozzle_id") in nozzle_ids:
+                tool_ids.add(str(tool.get("tool_id")))
+
+    delta = {
+        "version": current_version,
+        "since": since_version,
+        "full": False,
     }
+    # Sections left out by a fields= projection stay out of the delta too.
+    for section, changed_ids in (("profiles", profile_ids), ("tools", tool_ids), ("nozzles", nozzle_ids)):
+        if section in payload:
+            delta[section] = _status_section_delta(payload, index, section, changed_ids)
+    if structural and "tool_map" in payload:
+        delta["tool_map"] = payload.get("tool_map")
+    active_nozzle = (payload.get("meta") or {}).get("active_nozzle") or {}
+    if structural or (active_nozzle.get("id") in nozzle_ids and "nozzles" not in payload):
+        # Without a nozzles section the active nozzle's counters only travel in meta.
+        delta["meta"] = payload.get("meta")
+    return delta
+
+
 import re
 
 
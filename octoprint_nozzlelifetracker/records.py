@@ -0,0 +1,121 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+
+
+_UNSET = object()
+# Shared by every record without metadata.
+_EMPTY_MAPPING = MappingProxyType({})
+
+
+class _Record(Mapping):
+    """Read-only, slotted mapping; unknown keys are kept in _extra so to_dict is lossless."""
+
+    __slots__ = ("_extra",)
+    _fields = ()
+    _field_set = frozenset()
+
+    def __init__(self, values=None):
+        extra = None
+        for key, value in (values or {}).items():
+            if key in self._field_set:
+                if isinstance(value, Mapping):
+                    value = MappingProxyType(dict(value)) if value else _EMPTY_MAPPING
+                elif isinstance(value, list):
+                    value = tuple(value)
+                object.__setattr__(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        for field in self._fields:
+            if not hasattr(self, field):
+                object.__setattr__(self, field, _UNSET)
+        object.__setattr__(self, "_extra", extra)
+
+    @classmethod
+    def from_dict(cls, entry):
+        if isinstance(entry, cls):
+            return entry
+        return cls(entry if isinstance(entry, Mapping) else None)
+
+    def to_dict(self):
+        result = {}
+        for key, value in self.items():
+            if isinstance(value, Mapping):
+                value = dict(value)
+            elif isinstance(value, tuple):
+                value = list(value)
+            result[key] = value
+        return result
+
+    def __setattr__(self, name, value):
+        raise AttributeError("{} is read-only".format(type(self).__name__))
+
+    def get(self, key, default=None):
+        if key in self._field_set:
+            value = getattr(self, key)
+            return default if value is _UNSET else value
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key, _UNSET)
+        if value is _UNSET:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _UNSET) is not _UNSET
+
+    def __iter__(self):
+        for field in self._fields:
+            if getattr(self, field) is not _UNSET:
+                yield field
+        if self._extra is not None:
+            for key in self._extra:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, self.to_dict())
+
+
+def _record_type(name, fields, doc):
+    return type(name, (_Record,), {"__slots__": fields, "__doc__": doc, "_fields": fields, "_field_set": frozenset(fields)})
+
+
+NozzleRecord = _record_type(
+    "NozzleRecord",
+    (
+        "id",
+        "name",
+        "profile_id",
+        "material",
+        "size_mm",
+        "accumulated_seconds",
+        "retired",
+        "life_seconds",
+        "notes",
+        "created_at",
+        "metadata",
+    ),
+    "Published nozzle inventory entry.",
+)
+ProfileRecord = _record_type(
+    "ProfileRecord",
+    ("id", "name", "interval_hours", "notes", "default_material"),
+    "Published nozzle profile.",
+)
+ToolStateRecord = _record_type(
+    "ToolStateRecord",
+    ("tool_id", "profile_id", "accumulated_seconds"),
+    "Published per-tool runtime state.",
+)
+ReplacementEvent = _record_type(
+    "ReplacementEvent",
+    ("timestamp", "tool_id", "profile_id", "accumulated_seconds_at_reset", "nozzle_id"),
+    "One replacement archive entry.",
+)
@@ -0,0 +1,195 @@
+import gzip
+import json
+import os
+import re
+import threading
+from collections.abc import Mapping
+
+from .job_ledger import parse_job_timestamp
+from .records import ReplacementEvent
+from .runtime_state import _fsync_directory
+
+
+REPLACEMENT_ARCHIVE_DIRNAME = "replacement_log"
+REPLACEMENT_SEGMENT_MAX_BYTES = 256 * 1024
+
+_ACTIVE_SEGMENT_RE = re.compile(r"^segment-(\d{8})\.jsonl$")
+_CLOSED_SEGMENT_RE = re.compile(r"^segment-(\d{8})-(\d+)-(\d+)-(\d+)\.jsonl\.gz$")
+
+
+def replacement_entry_ts(entry):
+    return int(parse_job_timestamp((entry or {}).get("timestamp")))
+
+
+def _segment_overlaps(segment, since, until):
+    if segment["count"] == 0:
+        return False
+    if since is not None and segment["last_ts"] < since:
+        return False
+    if until is not None and segment["first_ts"] >= until:
+        return False
+    return True
+
+
+def _parse_lines(data):
+    for line in data.decode("utf-8", errors="replace").splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, dict):
+            yield ReplacementEvent(entry)
+
+
+class ReplacementLogArchive(object):
+    """Append-only replacement history split into size-rotated segment files."""
+
+    def __init__(self, directory, max_segment_bytes=REPLACEMENT_SEGMENT_MAX_BYTES):
+        self._directory = directory
+        self._max_segment_bytes = max(1, int(max_segment_bytes))
+        self._lock = threading.Lock()
+        self._segments = []
+        self._active = None
+
+    def open(self):
+        with self._lock:
+            os.makedirs(self._directory, exist_ok=True)
+            closed = {}
+            active = {}
+            for name in os.listdir(self._directory):
+                match = _CLOSED_SEGMENT_RE.match(name)
+                if match:
+                    seq, first_ts, last_ts, count = (int(value) for value in match.groups())
+                    closed[seq] = {
+                        "seq": seq,
+                        "path": os.path.join(self._directory, name),
+                        "first_ts": first_ts,
+                        "last_ts": last_ts,
+                        "count": count,
+                    }
+                    continue
+                match = _ACTIVE_SEGMENT_RE.match(name)
+                if match:
+                    active[int(match.group(1))] = os.path.join(self._directory, name)
+
+            for seq, path in list(active.items()):
+                if seq in closed:
+                    # Rotation finished compressing but crashed before the unlink.
+                    os.remove(path)
+                    del active[seq]
+
+            self._segments = [closed[seq] for seq in sorted(closed)]
+            next_seq = (self._segments[-1]["seq"] + 1) if self._segments else 1
+            if active:
+                seq = max(active)
+                self._active = self._scan_active_segment(seq, active[seq])
+            else:
+                self._active = self._empty_active_segment(next_seq)
+
+    def is_empty(self):
+        with self._lock:
+            return not self._segments and self._active["count"] == 0
+
+    def segments(self):
+        """Return the segment index (closed segments, then the active one)."""
+        with self._lock:
+            index = [dict(segment) for segment in self._segments]
+            index.append({key: self._active[key] for key in ("seq", "path", "first_ts", "last_ts", "count")})
+            return index
+
+    def append(self, entries):
+        entries = [ReplacementEvent.from_dict(entry) for entry in entries or () if isinstance(entry, Mapping)]
+        if not entries:
+            return 0
+        lines = "".join(
+            json.dumps(entry.to_dict(), sort_keys=True, separators=(",", ":")) + "\n" for entry in entries
+        )
+        data = lines.encode("utf-8")
+        with self._lock:
+            active = self._active
+            with open(active["path"], "ab") as handle:
+                handle.write(data)
+                handle.flush()
+                os.fsync(handle.fileno())
+            active["bytes"] += len(data)
+            for entry in entries:
+                self._index_entry_locked(active, replacement_entry_ts(entry))
+            if active["bytes"] >= self._max_segment_bytes:
+                self._rotate_locked()
+        return len(entries)
+
+    def iter_entries(self, since=None, until=None):
+        """Yield archived ReplacementEvents oldest first from segments overlapping the range."""
+        with self._lock:
+            closed = [segment for segment in self._segments if _segment_overlaps(segment, since, until)]
+            active_data = b""
+            if _segment_overlaps(self._active, since, until):
+                # The active segment is bounded by the rotation size, and reading it
+                # here keeps a concurrent rotation from pulling it out from under us.
+                with open(self._active["path"], "rb") as handle:
+                    active_data = handle.read()
+        for segment in closed:
+            with gzip.open(segment["path"], "rb") as handle:
+                for line in handle:
+                    for entry in _parse_lines(line):
+                        yield entry
+        for entry in _parse_lines(active_data):
+            yield entry
+
+    def _empty_active_segment(self, seq):
+        path = os.path.join(self._directory, "segment-{:08d}.jsonl".format(seq))
+        return {"seq": seq, "path": path, "first_ts": 0, "last_ts": 0, "count": 0, "bytes": 0}
+
+    def _scan_active_segment(self, seq, path):
+        active = self._empty_active_segment(seq)
+        with open(path, "rb") as handle:
+            data = handle.read()
+        if data and not data.endswith(b"\n"):
+            # Drop a torn final append so the next write starts on a fresh line.
+            data = data[: data.rfind(b"\n") + 1]
+            with open(path, "r+b") as handle:
+                handle.truncate(len(data))
+                handle.flush()
+                os.fsync(handle.fileno())
+        active["bytes"] = len(data)
+        for entry in _parse_lines(data):
+            self._index_entry_locked(active, replacement_entry_ts(entry))
+        return active
+
+    def _index_entry_locked(self, segment, ts):
+        if segment["count"] == 0:
+            segment["first_ts"] = ts
+            segment["last_ts"] = ts
+        else:
+            segment["first_ts"] = min(segment["first_ts"], ts)
+            segment["last_ts"] = max(segment["last_ts"], ts)
+        segment["count"] += 1
+
+    def _rotate_locked(self):
+        active = self._active
+        closed_path = os.path.join(
+            self._directory,
+            "segment-{:08d}-{}-{}-{}.jsonl.gz".format(
+                active["seq"], active["first_ts"], active["last_ts"], active["count"]
+            ),
+        )
+        temp_path = closed_path + ".tmp"
+        with open(active["path"], "rb") as source, open(temp_path, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as compressed:
+                compressed.write(source.read())
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temp_path, closed_path)
+        os.remove(active["path"])
+        _fsync_directory(self._directory)
+
+        self._segments.append(
+            {
+                "seq": active["seq"],
+                "path": closed_path,
+                "first_ts": active["first_ts"],
+                "last_ts": active["last_ts"],
+                "count": active["count"],
+            }
+        )
+        self._active = self._empty_active_segment(active["seq"] + 1)
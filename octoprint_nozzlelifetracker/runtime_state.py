@@ -2,15 +2,26 @@ import copy
 import json
 import os
 import tempfile
+import uuid
+import zlib
+from collections.abc import Mapping
+from json.encoder import encode_basestring_ascii
 
 
 RUNTIME_STATE_FILENAME = "runtime_state.json"
+RUNTIME_JOURNAL_FILENAME = "runtime_state.journal"
+# Snapshots rotate through this many files, so a corrupt newest one still
+# leaves older generations to recover from.
+RUNTIME_SNAPSHOT_GENERATIONS = 3
+# Fixed-width header line: generation, body length in bytes, CRC-32 of the body.
+_SNAPSHOT_MAGIC = b"NLT-RUNTIME-1"
+_SNAPSHOT_HEADER_FORMAT = "{} {:020d} {:020d} {:08x}\n"
+_SNAPSHOT_HEADER_MAX_BYTES = 128
 
 
 def default_runtime_state():
     return {
         "tool_state": {},
-        "replacement_log": [],
         "nozzle_runtime": {},
     }
 
@@ -58,11 +69,6 @@ def normalize_runtime_state(runtime_state):
             continue
         normalized_tool_state[str(tool_id)] = copy.deepcopy(entry)
 
-    normalized_replacement_log = []
-    for entry in replacement_log_in:
-        if isinstance(entry, dict):
-            normalized_replacement_log.append(copy.deepcopy(entry))
-
     normalized_nozzle_runtime = {}
     for nozzle_id, entry in nozzle_runtime_in.items():
         if not isinstance(entry, dict):
@@ -77,14 +83,19 @@ def normalize_runtime_state(runtime_state):
             "accumulated_seconds": accumulated_seconds,
         }
 
-    return {
+    normalized = {
         "tool_state": normalized_tool_state,
-        "replacement_log": normalized_replacement_log,
         "nozzle_runtime": normalized_nozzle_runtime,
     }
+    # Older snapshots carried the replacement log; it is kept only until the
+    # plugin has moved it into the replacement archive.
+    legacy_replacement_log = [entry for entry in replacement_log_in if isinstance(entry, dict)]
+    if legacy_replacement_log:
+        normalized["replacement_log"] = legacy_replacement_log
+    return normalized
 
 
-def build_runtime_state(tool_state, replacement_log, nozzles):
+def build_runtime_state(tool_state, nozzles):
     nozzle_runtime = {}
     nozzles_in = nozzles if isinstance(nozzles, dict) else {}
     for nozzle_id, nozzle in nozzles_in.items():
@@ -100,15 +111,23 @@ def build_runtime_state(tool_state, replacement_log, nozzles):
             "accumulated_seconds": accumulated_seconds,
         }
 
+    # normalize_runtime_state copies each tool entry; no need to copy them first.
     return normalize_runtime_state(
         {
-            "tool_state": copy.deepcopy(tool_state if isinstance(tool_state, dict) else {}),
-            "replacement_log": copy.deepcopy(replacement_log if isinstance(replacement_log, list) else []),
+            "tool_state": tool_state if isinstance(tool_state, dict) else {},
             "nozzle_runtime": nozzle_runtime,
         }
     )
 
 
+def runtime_state_view(tool_state, nozzles):
+    """Like build_runtime_state without copying; only pass published, immutable state."""
+    return {
+        "tool_state": tool_state if isinstance(tool_state, Mapping) else {},
+        "nozzle_runtime": nozzles if isinstance(nozzles, Mapping) else {},
+    }
+
+
 def has_legacy_runtime_state(tool_state, replacement_log, nozzles):
     if isinstance(replacement_log, list) and len(replacement_log) > 0:
         return True
@@ -175,17 +194,225 @@ def apply_runtime_state_to_nozzles(nozzles, runtime_state):
     return nozzles_in
 
 
-def load_runtime_state_file(path):
-    if not path or not os.path.exists(path):
-        return default_runtime_state(), "missing"
+def runtime_snapshot_paths(path, generations=RUNTIME_SNAPSHOT_GENERATIONS):
+    """Return the rotation slots for path; generation g is written to slot g % generations."""
+    root, ext = os.path.splitext(path)
+    return [path] + ["{}.{}{}".format(root, slot, ext) for slot in range(1, max(1, int(generations)))]
+
+
+def _read_snapshot_header(path):
+    """Return (generation, body_offset, body_length, checksum), or None if unreadable."""
+    try:
+        with open(path, "rb") as handle:
+            line = handle.readline(_SNAPSHOT_HEADER_MAX_BYTES)
+    except OSError:
+        return None
+    if not line:
+        return None
+    if not line.startswith(_SNAPSHOT_MAGIC):
+        return (0, 0, None, None) if line.lstrip().startswith(b"{") else None
+    parts = line.split()
+    if len(parts) != 4 or not line.endswith(b"\n"):
+        return None
+    try:
+        return int(parts[1]), len(line), int(parts[2]), int(parts[3], 16)
+    except ValueError:
+        return None
+
+
+def _read_snapshot_body(path, header):
+    _, offset, length, checksum = header
+    try:
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            body = handle.read() if length is None else handle.read(length + 1)
+    except OSError:
+        return None
+    if length is not None and (len(body) != length or zlib.crc32(body) != checksum):
+        return None
+    return body
+
+
+def _parse_snapshot_body(body):
+    try:
+        raw = json.loads(body.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    return raw if isinstance(raw, dict) else None
+
+
+def _newest_snapshot_generation(path, generations):
+    newest = None
+    for slot_path in runtime_snapshot_paths(path, generations):
+        header = _read_snapshot_header(slot_path)
+        if header is not None and (newest is None or header[0] > newest):
+            newest = header[0]
+    return newest
+
+
+def load_runtime_state_generations(path, journal_path=None, generations=RUNTIME_SNAPSHOT_GENERATIONS):
+    """Load the newest snapshot whose checksum matches; returns (runtime_state, status, recovery)."""
+    if not path:
+        return default_runtime_state(), "missing", {"generation": None, "skipped": []}
+
+    candidates = []
+    skipped = []
+    for slot_path in runtime_snapshot_paths(path, generations):
+        if not os.path.exists(slot_path):
+            continue
+        header = _read_snapshot_header(slot_path)
+        if header is None:
+            skipped.append(os.path.basename(slot_path))
+        else:
+            candidates.append((header[0], slot_path, header))
+    if not candidates and not skipped:
+        return default_runtime_state(), "missing", {"generation": None, "skipped": skipped}
+
+    candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+    raw = None
+    generation = None
+    for candidate_generation, slot_path, header in candidates:
+        body = _read_snapshot_body(slot_path, header)
+        raw = _parse_snapshot_body(body) if body is not None else None
+        if raw is not None:
+            generation = candidate_generation
+            break
+        skipped.append(os.path.basename(slot_path))
+
+    recovery = {"generation": generation, "skipped": skipped}
+    if raw is None:
+        return default_runtime_state(), "malformed", recovery
+
+    normalized = normalize_runtime_state(raw)
+    snapshot_epoch = raw.get("journal_epoch")
+    if journal_path and snapshot_epoch:
+        journal_epoch, records = read_runtime_journal(journal_path)
+        if journal_epoch == snapshot_epoch:
+            normalized = apply_runtime_journal(normalized, records)
+
+    return normalized, "loaded", recovery
+
+
+def load_runtime_state_file(path, journal_path=None):
+    runtime_state, status, _ = load_runtime_state_generations(path, journal_path=journal_path)
+    return runtime_state, status
+
+
+def build_runtime_journal_record(nozzle_id, tool_id, delta_seconds, ts):
+    return {
+        "n": str(nozzle_id),
+        "t": str(tool_id or ""),
+        "d": int(delta_seconds),
+        "ts": int(ts or 0),
+    }
+
+
+def read_runtime_journal(journal_path):
+    if not journal_path or not os.path.exists(journal_path):
+        return None, []
+
+    epoch = None
+    records = []
+    try:
+        with open(journal_path, "r", encoding="utf-8") as handle:
+            for index, line in enumerate(handle):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn final append is expected after power loss; skip it.
+                    continue
+                if not isinstance(entry, dict):
+                    continue
+                if index == 0:
+                    epoch = entry.get("epoch")
+                    continue
+                records.append(entry)
+    except OSError:
+        return None, []
+
+    return epoch, records
+
+
+def apply_runtime_journal(runtime_state, records):
+    normalized = normalize_runtime_state(runtime_state)
+    nozzle_runtime = normalized["nozzle_runtime"]
+    tool_state = normalized["tool_state"]
+    for record in records or []:
+        if not isinstance(record, dict):
+            continue
+        nozzle_id = str(record.get("n") or "").strip()
+        tool_id = str(record.get("t") or "").strip()
+        try:
+            delta_seconds = int(record.get("d", 0))
+        except (TypeError, ValueError):
+            continue
+        if delta_seconds <= 0:
+            continue
+        if nozzle_id:
+            entry = nozzle_runtime.setdefault(nozzle_id, {"accumulated_seconds": 0})
+            entry["accumulated_seconds"] = int(entry.get("accumulated_seconds", 0)) + delta_seconds
+        if tool_id:
+            entry = tool_state.setdefault(tool_id, {"tool_id": tool_id, "accumulated_seconds": 0})
+            try:
+                current_seconds = int(float(entry.get("accumulated_seconds", 0)))
+            except (TypeError, ValueError):
+                current_seconds = 0
+            entry["accumulated_seconds"] = max(0, current_seconds) + delta_seconds
+    return normalized
+
+
+def append_runtime_journal(journal_path, records):
+    lines = "".join(
+        json.dumps(record, separators=(",", ":"), sort_keys=True) + "\n"
+        for record in records or []
+    )
+    if not lines:
+        return 0
+
+    with open(journal_path, "a", encoding="utf-8") as handle:
+        handle.write(lines)
+        handle.flush()
+        os.fsync(handle.fileno())
+    return len(lines.encode("utf-8"))
+
+
+def reset_runtime_journal(journal_path, epoch):
+    directory = os.path.dirname(journal_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    header = json.dumps({"epoch": str(epoch)}, separators=(",", ":")) + "\n"
 
+    temp_path = None
     try:
-        with open(path, "r", encoding="utf-8") as handle:
-            raw = json.load(handle)
-    except (OSError, ValueError, TypeError):
-        return default_runtime_state(), "malformed"
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            encoding="utf-8",
+            dir=directory,
+            prefix=os.path.basename(journal_path) + ".",
+            suffix=".tmp",
+            delete=False,
+        ) as handle:
+            temp_path = handle.name
+            handle.write(header)
+            handle.flush()
+            os.fsync(handle.fileno())
+
+        os.replace(temp_path, journal_path)
+        _fsync_directory(directory)
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+    return len(header.encode("utf-8"))
 
-    return normalize_runtime_state(raw), "loaded"
+
+def compact_runtime_state_file(path, journal_path, runtime_state, pretty=False):
+    # The snapshot is written first so a crash before the journal reset leaves a
+    # journal whose epoch no longer matches, which load then ignores.
+    epoch = uuid.uuid4().hex
+    save_runtime_state_file(path, runtime_state, journal_epoch=epoch, pretty=pretty)
+    return reset_runtime_journal(journal_path, epoch)
 
 
 def _fsync_directory(directory_path):
@@ -201,23 +428,22 @@ def _fsync_directory(directory_path):
         os.close(directory_fd)
 
 
-def save_runtime_state_file(path, runtime_state):
-    normalized = normalize_runtime_state(runtime_state)
+def _write_file_atomic(path, write, mode="w"):
     directory = os.path.dirname(path) or "."
     os.makedirs(directory, exist_ok=True)
 
     temp_path = None
     try:
         with tempfile.NamedTemporaryFile(
-            mode="w",
-            encoding="utf-8",
+            mode=mode,
+            encoding="utf-8" if "b" not in mode else None,
             dir=directory,
             prefix=os.path.basename(path) + ".",
             suffix=".tmp",
             delete=False,
         ) as handle:
             temp_path = handle.name
-            json.dump(normalized, handle, indent=2, sort_keys=True)
+            write(handle)
             handle.flush()
             os.fsync(handle.fileno())
 
@@ -229,3 +455,140 @@ def save_runtime_state_file(path, runtime_state):
                 os.remove(temp_path)
             except OSError:
                 pass
+
+
+def write_json_file_atomic(path, payload):
+    chunks = json.JSONEncoder(indent=2, sort_keys=True).iterencode(payload)
+    _write_file_atomic(path, lambda handle: handle.writelines(chunks))
+
+
+def _snapshot_header(generation, length, checksum):
+    return _SNAPSHOT_HEADER_FORMAT.format(_SNAPSHOT_MAGIC.decode("ascii"), generation, length, checksum).encode("ascii")
+
+
+def _write_snapshot_body(handle, generation, chunks):
+    # Fixed-width header: placeholder first, real length and checksum after the body.
+    handle.write(_snapshot_header(generation, 0, 0))
+    length = 0
+    checksum = 0
+    for chunk in chunks:
+        data = chunk.encode("utf-8")
+        length += len(data)
+        checksum = zlib.crc32(data, checksum)
+        handle.write(data)
+    handle.seek(0)
+    handle.write(_snapshot_header(generation, length, checksum))
+
+
+def _json_default(value):
+    # Published records are read-only Mappings rather than dicts.
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError("Object of type {} is not JSON serializable".format(type(value).__name__))
+
+
+_COMPACT_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), default=_json_default)
+_PRETTY_ENCODER = json.JSONEncoder(sort_keys=True, indent=2, default=_json_default)
+# Object members joined per yielded chunk.
+_MEMBERS_PER_CHUNK = 512
+
+
+def _encode_json_value(value, pretty, level):
+    if not pretty:
+        return _COMPACT_ENCODER.encode(value)
+    return _PRETTY_ENCODER.encode(value).replace("\n", "\n" + "  " * level)
+
+
+def _json_member(key, value, pretty):
+    return encode_basestring_ascii(key) + (": " if pretty else ":") + value
+
+
+def _iter_json_object(members, pretty, level):
+    # members are rendered '"key": value' strings, already in key order.
+    indent = "\n" + "  " * (level + 1) if pretty else ""
+    separator = "," + indent
+    prefix = "{" + indent
+    opened = False
+    batch = []
+    for member in members:
+        batch.append(member)
+        if len(batch) == _MEMBERS_PER_CHUNK:
+            yield prefix + separator.join(batch)
+            prefix, opened, batch = separator, True, []
+    if batch:
+        yield prefix + separator.join(batch)
+        opened = True
+    if not opened:
+        yield "{}"
+    else:
+        yield ("\n" + "  " * level if pretty else "") + "}"
+
+
+def _sorted_entries(section):
+    entries = {}
+    for entry_id, entry in (section.items() if isinstance(section, Mapping) else ()):
+        if isinstance(entry, Mapping):
+            entries[str(entry_id)] = entry
+    return sorted(entries.items())
+
+
+def _iter_nozzle_runtime_members(nozzle_runtime, pretty, level):
+    if pretty:
+        template = '{{key}}: {{{{\n{0}  "accumulated_seconds": {{seconds}}\n{0}}}}}'.format("  " * level)
+    else:
+        template = '{key}:{{"accumulated_seconds":{seconds}}}'
+    for nozzle_id, entry in _sorted_entries(nozzle_runtime):
+        try:
+            accumulated_seconds = int(float(entry.get("accumulated_seconds", 0)))
+        except (TypeError, ValueError):
+            accumulated_seconds = 0
+        if accumulated_seconds < 0:
+            accumulated_seconds = 0
+        yield template.format(key=encode_basestring_ascii(nozzle_id), seconds=accumulated_seconds)
+
+
+def iter_runtime_state_json(runtime_state, journal_epoch=None, pretty=False):
+    """Yield runtime_state as sorted-key JSON chunks, normalizing entries as they are read."""
+    state_in = runtime_state if isinstance(runtime_state, Mapping) else {}
+    sections = []
+    if journal_epoch:
+        sections.append(("journal_epoch", (encode_basestring_ascii(str(journal_epoch)),)))
+    nozzle_members = _iter_nozzle_runtime_members(state_in.get("nozzle_runtime"), pretty, 2)
+    sections.append(("nozzle_runtime", _iter_json_object(nozzle_members, pretty, 1)))
+    replacement_log = state_in.get("replacement_log")
+    if not isinstance(replacement_log, (list, tuple)):
+        replacement_log = ()
+    legacy_replacement_log = [entry for entry in replacement_log if isinstance(entry, Mapping)]
+    if legacy_replacement_log:
+        sections.append(("replacement_log", (_encode_json_value(legacy_replacement_log, pretty, 1),)))
+    tool_members = (
+        _json_member(tool_id, _encode_json_value(entry, pretty, 2), pretty)
+        for tool_id, entry in _sorted_entries(state_in.get("tool_state"))
+    )
+    sections.append(("tool_state", _iter_json_object(tool_members, pretty, 1)))
+
+    indent = "\n  " if pretty else ""
+    for position, (key, chunks) in enumerate(sections):
+        yield ("," if position else "{") + indent + _json_member(key, "", pretty)
+        for chunk in chunks:
+            yield chunk
+    yield ("\n" if pretty else "") + "}"
+
+
+def save_runtime_state_file(
+    path,
+    runtime_state,
+    journal_epoch=None,
+    pretty=False,
+    generations=RUNTIME_SNAPSHOT_GENERATIONS,
+):
+    """Write runtime_state over the oldest snapshot slot and return its path."""
+    newest = _newest_snapshot_generation(path, generations)
+    generation = 0 if newest is None else newest + 1
+    paths = runtime_snapshot_paths(path, generations)
+    slot_path = paths[generation % len(paths)]
+    chunks = iter_runtime_state_json(runtime_state, journal_epoch=journal_epoch, pretty=pretty)
+    _write_file_atomic(slot_path, lambda handle: _write_snapshot_body(handle, generation, chunks), mode="wb")
+    return slot_path
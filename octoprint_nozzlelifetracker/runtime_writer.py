@@ -0,0 +1,176 @@
+import threading
+import time
+
+
+class RuntimeStateWriter(object):
+    """Writes submitted snapshots and journal records on a background thread."""
+
+    def __init__(
+        self,
+        write_snapshot,
+        append_journal,
+        on_error=None,
+        on_commit=None,
+        name="NozzleLifeRuntimeWriter",
+        commit_delay=0.0,
+    ):
+        self._write_snapshot = write_snapshot
+        self._append_journal = append_journal
+        self._on_error = on_error
+        self._on_commit = on_commit
+        self._name = name
+        self._condition = threading.Condition()
+        self._pending_snapshot = None
+        self._pending_records = []
+        self._pending_submissions = 0
+        self._submitted_seq = 0
+        self._completed_seq = 0
+        self._last_error = None
+        self._flush_requested = False
+        self._stopping = False
+        self._thread = None
+        self._commit_delay = max(0.0, float(commit_delay or 0.0))
+        self._stats = {
+            "submissions": 0,
+            "commits": 0,
+            "snapshots": 0,
+            "journal_records": 0,
+            "errors": 0,
+            "total_ms": 0.0,
+            "last_ms": 0.0,
+            "max_ms": 0.0,
+        }
+
+    def start(self):
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def last_error(self):
+        with self._condition:
+            return self._last_error
+
+    def set_commit_delay(self, commit_delay):
+        with self._condition:
+            self._commit_delay = max(0.0, float(commit_delay or 0.0))
+            self._condition.notify_all()
+
+    def stats(self):
+        """Return persist counters and write latencies (milliseconds)."""
+        with self._condition:
+            stats = dict(self._stats)
+            stats["pending"] = self._pending_submissions
+            stats["commit_delay_ms"] = round(self._commit_delay * 1000.0, 3)
+        commits = stats["commits"]
+        stats["total_ms"] = round(stats["total_ms"], 3)
+        stats["avg_ms"] = round(stats["total_ms"] / commits, 3) if commits else 0.0
+        stats["submissions_per_commit"] = round(stats["submissions"] / commits, 3) if commits else 0.0
+        return stats
+
+    def submit_snapshot(self, snapshot):
+        with self._condition:
+            self._pending_snapshot = snapshot
+            self._pending_records = []
+            self._pending_submissions += 1
+            self._submitted_seq += 1
+            self._condition.notify_all()
+            return self._submitted_seq
+
+    def submit_journal(self, records):
+        records = list(records or [])
+        with self._condition:
+            if not records:
+                return self._submitted_seq
+            self._pending_records.extend(records)
+            self._pending_submissions += 1
+            self._submitted_seq += 1
+            self._condition.notify_all()
+            return self._submitted_seq
+
+    def flush(self, timeout=None):
+        with self._condition:
+            target_seq = self._submitted_seq
+            if self._has_pending_locked():
+                self._flush_requested = True
+                self._condition.notify_all()
+            completed = self._condition.wait_for(lambda: self._completed_seq >= target_seq, timeout=timeout)
+            return completed and self._last_error is None
+
+    def stop(self, timeout=None):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+    def _has_pending_locked(self):
+        return self._pending_snapshot is not None or bool(self._pending_records)
+
+    def _commit_due_locked(self, deadline):
+        return self._stopping or self._flush_requested or time.monotonic() >= deadline
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._stopping or self._has_pending_locked())
+                if not self._has_pending_locked():
+                    return
+                # Group commit: let more submissions join this batch before writing.
+                deadline = time.monotonic() + self._commit_delay
+                while not self._commit_due_locked(deadline):
+                    self._condition.wait(max(0.0, deadline - time.monotonic()))
+                    deadline = min(deadline, time.monotonic() + self._commit_delay)
+                snapshot = self._pending_snapshot
+                records = self._pending_records
+                submissions = self._pending_submissions
+                target_seq = self._submitted_seq
+                self._pending_snapshot = None
+                self._pending_records = []
+                self._pending_submissions = 0
+                self._flush_requested = False
+
+            failed = None
+            started = time.monotonic()
+            try:
+                if snapshot is not None:
+                    self._write_snapshot(snapshot)
+                if records:
+                    self._append_journal(records)
+            except Exception as exc:
+                failed = exc
+                if self._on_error is not None:
+                    try:
+                        self._on_error(exc)
+                    except Exception:
+                        pass
+            elapsed_ms = (time.monotonic() - started) * 1000.0
+
+            # Only a snapshot clears an earlier failure.
+            last_error = failed if failed is not None or snapshot is not None else self._last_error
+            if last_error is None and self._on_commit is not None:
+                # Before waking flush() callers, so they observe the commit's effects.
+                try:
+                    self._on_commit(target_seq)
+                except Exception:
+                    pass
+
+            with self._condition:
+                stats = self._stats
+                stats["submissions"] += submissions
+                stats["commits"] += 1
+                stats["snapshots"] += 1 if snapshot is not None else 0
+                stats["journal_records"] += len(records)
+                stats["errors"] += 1 if failed is not None else 0
+                stats["total_ms"] += elapsed_ms
+                stats["last_ms"] = round(elapsed_ms, 3)
+                stats["max_ms"] = round(max(stats["max_ms"], elapsed_ms), 3)
+                self._last_error = last_error
+                self._completed_seq = max(self._completed_seq, target_seq)
+                self._condition.notify_all()
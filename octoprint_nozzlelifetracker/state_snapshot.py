@@ -0,0 +1,342 @@
+import threading
+from collections.abc import Mapping
+
+from .phase1_pure import carry_elapsed_units, compute_elapsed_units
+from .records import NozzleRecord
+
+
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+_LEVEL_BITS = 5
+_LEVEL_MASK = (1 << _LEVEL_BITS) - 1
+_EMPTY_NODE = (None,) * (1 << _LEVEL_BITS)
+_MISSING = object()
+
+
+class _Leaf(object):
+    __slots__ = ("hash", "key", "value")
+
+    def __init__(self, key_hash, key, value):
+        self.hash = key_hash
+        self.key = key
+        self.value = value
+
+
+class _Collision(object):
+    # Keys whose full hashes are equal; only found below the last trie level.
+    __slots__ = ("hash", "items")
+
+    def __init__(self, key_hash, items):
+        self.hash = key_hash
+        self.items = items
+
+
+def _hash(key):
+    return hash(key) & _HASH_MASK
+
+
+def _make_child(leaves, shift):
+    if len(leaves) == 1:
+        key_hash, key, value = leaves[0]
+        return _Leaf(key_hash, key, value)
+    if shift >= _HASH_BITS:
+        return _Collision(leaves[0][0], tuple((key, value) for _, key, value in leaves))
+    return _make_node(leaves, shift)
+
+
+def _make_node(leaves, shift):
+    buckets = {}
+    for leaf in leaves:
+        buckets.setdefault((leaf[0] >> shift) & _LEVEL_MASK, []).append(leaf)
+    slots = list(_EMPTY_NODE)
+    for index, bucket in buckets.items():
+        slots[index] = _make_child(bucket, shift + _LEVEL_BITS)
+    return tuple(slots)
+
+
+def _assoc(node, shift, key_hash, key, value):
+    index = (key_hash >> shift) & _LEVEL_MASK
+    child = node[index]
+    added = 0
+    if child is None:
+        new_child = _Leaf(key_hash, key, value)
+        added = 1
+    elif type(child) is _Leaf:
+        if child.key == key:
+            if child.value is value:
+                return node, 0
+            new_child = _Leaf(key_hash, key, value)
+        else:
+            new_child = _make_child(
+                [(child.hash, child.key, child.value), (key_hash, key, value)],
+                shift + _LEVEL_BITS,
+            )
+            added = 1
+    elif type(child) is _Collision:
+        items = tuple(item for item in child.items if item[0] != key)
+        added = 1 if len(items) == len(child.items) else 0
+        new_child = _Collision(child.hash, items + ((key, value),))
+    else:
+        new_child, added = _assoc(child, shift + _LEVEL_BITS, key_hash, key, value)
+        if new_child is child:
+            return node, 0
+    return node[:index] + (new_child,) + node[index + 1 :], added
+
+
+def _dissoc(node, shift, key_hash, key):
+    index = (key_hash >> shift) & _LEVEL_MASK
+    child = node[index]
+    if child is None:
+        return node, 0
+    if type(child) is _Leaf:
+        if child.key != key:
+            return node, 0
+        new_child = None
+    elif type(child) is _Collision:
+        items = tuple(item for item in child.items if item[0] != key)
+        if len(items) == len(child.items):
+            return node, 0
+        new_child = _Collision(child.hash, items) if items else None
+    else:
+        new_child, removed = _dissoc(child, shift + _LEVEL_BITS, key_hash, key)
+        if not removed:
+            return node, 0
+        if new_child == _EMPTY_NODE:
+            new_child = None
+    return node[:index] + (new_child,) + node[index + 1 :], 1
+
+
+def _iter_leaves(node):
+    for child in node:
+        if child is None:
+            continue
+        if type(child) is _Leaf:
+            yield child.key, child.value
+        elif type(child) is _Collision:
+            for item in child.items:
+                yield item
+        else:
+            for item in _iter_leaves(child):
+                yield item
+
+
+class PersistentMap(Mapping):
+    """Immutable 32-way hash trie; set/discard return a new map sharing unchanged nodes."""
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, items=()):
+        if isinstance(items, Mapping):
+            items = items.items()
+        leaves = {}
+        for key, value in items:
+            leaves[key] = (_hash(key), key, value)
+        self._size = len(leaves)
+        self._root = _make_node(list(leaves.values()), 0)
+
+    @classmethod
+    def _from_root(cls, root, size):
+        instance = cls.__new__(cls)
+        instance._root = root
+        instance._size = size
+        return instance
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        key_hash = _hash(key)
+        node = self._root
+        shift = 0
+        while True:
+            child = node[(key_hash >> shift) & _LEVEL_MASK]
+            if child is None:
+                return default
+            if type(child) is _Leaf:
+                return child.value if child.key == key else default
+            if type(child) is _Collision:
+                for item_key, item_value in child.items:
+                    if item_key == key:
+                        return item_value
+                return default
+            node = child
+            shift += _LEVEL_BITS
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self):
+        for key, _ in _iter_leaves(self._root):
+            yield key
+
+    def __len__(self):
+        return self._size
+
+    def items(self):
+        return _iter_leaves(self._root)
+
+    def values(self):
+        for _, value in _iter_leaves(self._root):
+            yield value
+
+    def set(self, key, value):
+        root, added = _assoc(self._root, 0, _hash(key), key, value)
+        if root is self._root:
+            return self
+        return PersistentMap._from_root(root, self._size + added)
+
+    def discard(self, key):
+        root, removed = _dissoc(self._root, 0, _hash(key), key)
+        if not removed:
+            return self
+        return PersistentMap._from_root(root, self._size - 1)
+
+    def __repr__(self):
+        return "PersistentMap({!r})".format(dict(self.items()))
+
+
+def copy_state_entry(entry):
+    """Copy an entry for publication; nested dicts and lists are copied one level."""
+    if not isinstance(entry, dict):
+        return entry
+    return {
+        key: dict(value) if isinstance(value, dict) else list(value) if isinstance(value, list) else value
+        for key, value in entry.items()
+    }
+
+
+def refresh_inventory_section(previous, live, changed_ids, rebuild=False, freeze=NozzleRecord.from_dict):
+    """Return previous with changed_ids re-frozen from live, or all of live with rebuild."""
+    live = live if isinstance(live, dict) else {}
+    if rebuild or previous is None:
+        return PersistentMap((entry_id, freeze(entry)) for entry_id, entry in live.items())
+    updated = previous
+    for entry_id in changed_ids:
+        entry = live.get(entry_id)
+        if entry is None:
+            updated = updated.discard(entry_id)
+        else:
+            updated = updated.set(entry_id, freeze(entry))
+    return updated
+
+
+def refresh_small_section(previous, live, changed_ids, rebuild=False, freeze=copy_state_entry):
+    """Like refresh_inventory_section, but returns a plain dict for the per-tool sections."""
+    live = live if isinstance(live, dict) else {}
+    if rebuild or previous is None:
+        return {entry_id: freeze(entry) for entry_id, entry in live.items()}
+    # Tool ids are recorded for tool_state and tool_map changes alike.
+    changed_ids = [entry_id for entry_id in changed_ids if live.get(entry_id) != previous.get(entry_id)]
+    if not changed_ids:
+        return previous
+    updated = dict(previous)
+    for entry_id in changed_ids:
+        if entry_id in live:
+            updated[entry_id] = freeze(live[entry_id])
+        else:
+            updated.pop(entry_id, None)
+    return updated
+
+
+class StateSnapshot(object):
+    """One published, immutable view of the tracker state."""
+
+    __slots__ = (
+        "version",
+        "generation",
+        "nozzle_profiles",
+        "nozzles",
+        "tool_state",
+        "tool_map",
+        "error_flags",
+        "active_tool_id",
+        "tool_source",
+        "open_interval",
+        "status_changes",
+        "status_base",
+        "status_responses",
+    )
+
+    def __init__(
+        self,
+        version,
+        generation,
+        nozzle_profiles,
+        nozzles,
+        tool_state,
+        tool_map,
+        error_flags,
+        active_tool_id,
+        tool_source,
+        open_interval=None,
+        status_changes=(),
+        status_base=None,
+    ):
+        self.version = version
+        self.generation = generation
+        self.nozzle_profiles = nozzle_profiles
+        self.nozzles = nozzles
+        self.tool_state = tool_state
+        self.tool_map = tool_map
+        self.error_flags = error_flags
+        self.active_tool_id = active_tool_id
+        self.tool_source = tool_source
+        # (opened_ts, nozzle_id, nozzle_carry, tool_id, tool_carry) or None
+        self.open_interval = open_interval
+        self.status_changes = status_changes
+        # fields -> (payload, index), shared by snapshots of one generation
+        self.status_base = status_base if status_base is not None else {}
+        # (fields, live_seconds) -> (etag, payload, index)
+        self.status_responses = {}
+
+
+def live_counters(snapshot, now_ts):
+    """Return (nozzles, tool_state, live_seconds) with the open interval folded in."""
+    if snapshot.open_interval is None:
+        return snapshot.nozzles, snapshot.tool_state, None
+    opened_ts, nozzle_id, nozzle_carry, tool_id, tool_carry = snapshot.open_interval
+    delta_units = compute_elapsed_units(opened_ts, now_ts)
+    nozzle_seconds = carry_elapsed_units(nozzle_carry, delta_units)[0]
+    tool_seconds = carry_elapsed_units(tool_carry, delta_units)[0]
+    nozzles = snapshot.nozzles
+    nozzle = nozzles.get(nozzle_id)
+    if nozzle_seconds and nozzle is not None:
+        nozzles = nozzles.set(
+            nozzle_id, dict(nozzle, accumulated_seconds=int(nozzle.get("accumulated_seconds") or 0) + nozzle_seconds)
+        )
+    tool_state = snapshot.tool_state
+    tool = tool_state.get(tool_id)
+    if tool_seconds and tool is not None:
+        tool_state = dict(tool_state)
+        tool_state[tool_id] = dict(tool, accumulated_seconds=int(tool.get("accumulated_seconds") or 0) + tool_seconds)
+    return nozzles, tool_state, nozzle_seconds
+
+
+class PublishingLock(object):
+    """threading.Lock that runs a callback before every release."""
+
+    __slots__ = ("_lock", "_before_release")
+
+    def __init__(self, before_release):
+        self._lock = threading.Lock()
+        self._before_release = before_release
+
+    def acquire(self, blocking=True, timeout=-1):
+        return self._lock.acquire(blocking, timeout)
+
+    def release(self):
+        try:
+            self._before_release()
+        finally:
+            self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -23,6 +23,8 @@ $(function () {
 
         self.lastGeneratedAt = ko.observable("");
         self.errorText = ko.observable("");
+        self.statusEtag = null;
+        self.statusVersion = null;
 
         self.hasTools = ko.pureComputed(function () {
             return self.tools().length > 0;
@@ -94,63 +96,180 @@ $(function () {
             return nozzle.retired ? (nozzle.name + " (retired)") : nozzle.name;
         };
 
+        self.buildToolRows = function (tools) {
+            var previousToolsById = {};
+            self.tools().forEach(function (row) {
+                if (row && row.tool_id && row.selected_profile_id) {
+                    previousToolsById[row.tool_id] = {
+                        profile_id: row.selected_profile_id(),
+                        nozzle_id: row.selected_nozzle_id ? row.selected_nozzle_id() : row.active_nozzle_id,
+                    };
+                }
+            });
+
+            return tools.map(function (tool) {
+                var previous = previousToolsById[tool.tool_id] || {};
+                var selectedProfileId = previous.profile_id || tool.profile_id;
+                var selectedNozzleId = previous.nozzle_id || tool.active_nozzle_id;
+                return {
+                    tool_id: tool.tool_id,
+                    profile_id: tool.profile_id,
+                    profile_name: tool.profile_name,
+                    interval_hours: tool.interval_hours,
+                    accumulated_seconds: tool.accumulated_seconds,
+                    accumulated_hours: tool.accumulated_hours,
+                    percent_to_interval: tool.percent_to_interval,
+                    is_overdue: tool.is_overdue,
+                    active_nozzle_id: tool.active_nozzle_id,
+                    runtime_source: tool.runtime_source,
+                    selected_profile_id: ko.observable(selectedProfileId),
+                    selected_nozzle_id: ko.observable(selectedNozzleId),
+                };
+            });
+        };
+
+        self.mergeById = function (rows, changes, idKey, compare) {
+            var upsert = (changes && changes.upsert) || [];
+            var remove = (changes && changes.remove) || [];
+            if (upsert.length === 0 && remove.length === 0) {
+                return rows;
+            }
+            var byId = {};
+            rows.forEach(function (row) {
+                byId[row[idKey]] = row;
+            });
+            remove.forEach(function (id) {
+                delete byId[id];
+            });
+            upsert.forEach(function (row) {
+                byId[row[idKey]] = row;
+            });
+            return Object.keys(byId).map(function (id) {
+                return byId[id];
+            }).sort(compare);
+        };
+
+        self.compareIds = function (left, right) {
+            return left.id < right.id ? -1 : (left.id > right.id ? 1 : 0);
+        };
+
+        self.compareTools = function (left, right) {
+            return parseInt(left.tool_id.substring(1), 10) - parseInt(right.tool_id.substring(1), 10);
+        };
+
+        self.compareProfiles = function (left, right) {
+            var leftKey = (left.name || "") + "\u0000" + (left.id || "");
+            var rightKey = (right.name || "") + "\u0000" + (right.id || "");
+            return leftKey < rightKey ? -1 : (leftKey > rightKey ? 1 : 0);
+        };
+
+        self.applyStatusMeta = function (toolMap, meta) {
+            var errors = meta.error_flags || {};
+            self.toolMap(toolMap || {});
+            self.activeToolId(meta.active_tool_id || "");
+            self.activeNozzle(meta.active_nozzle || null);
+            self.lastGeneratedAt(meta.generated_at || "");
+            if (Object.keys(errors).length > 0) {
+                self.errorText("Status warnings: " + Object.keys(errors).join(", "));
+            } else {
+                self.errorText("");
+            }
+        };
+
+        self.applyStatus = function (response) {
+            var profiles = (response && response.profiles) || [];
+            var tools = (response && response.tools) || [];
+            var nozzles = (response && response.nozzles) || [];
+            var toolMap = (response && response.tool_map) || {};
+            var meta = (response && response.meta) || {};
+
+            self.profiles(profiles);
+            self.nozzles(nozzles);
+            if (!self.createNozzleProfileId() && profiles.length > 0) {
+                self.createNozzleProfileId(profiles[0].id);
+            }
+            self.tools(self.buildToolRows(tools));
+            self.applyStatusMeta(toolMap, meta);
+        };
+
+        self.applyStatusDelta = function (delta) {
+            var currentTools = self.tools().map(function (row) {
+                return row;
+            });
+            var toolChanges = delta.tools || {};
+            var changedToolIds = {};
+            (toolChanges.upsert || []).forEach(function (tool) {
+                changedToolIds[tool.tool_id] = true;
+            });
+
+            self.profiles(self.mergeById(self.profiles(), delta.profiles, "id", self.compareProfiles));
+            self.nozzles(self.mergeById(self.nozzles(), delta.nozzles, "id", self.compareIds));
+
+            if ((toolChanges.upsert || []).length > 0 || (toolChanges.remove || []).length > 0) {
+                var rebuilt = self.buildToolRows(toolChanges.upsert || []);
+                var merged = self.mergeById(
+                    currentTools.filter(function (row) {
+                        return !changedToolIds[row.tool_id];
+                    }),
+                    { upsert: rebuilt, remove: toolChanges.remove || [] },
+                    "tool_id",
+                    self.compareTools
+                );
+                self.tools(merged);
+            }
+            if (delta.tool_map !== undefined) {
+                self.toolMap(delta.tool_map || {});
+            }
+            if (delta.meta !== undefined) {
+                self.applyStatusMeta(self.toolMap(), delta.meta || {});
+            } else {
+                // Counter-only deltas leave meta out; refresh the active nozzle from its row.
+                var active = self.activeNozzle();
+                var row = active && ((delta.nozzles && delta.nozzles.upsert) || []).find(function (nozzle) {
+                    return nozzle.id === active.id;
+                });
+                if (row) {
+                    self.activeNozzle($.extend({}, active, {
+                        accumulated_seconds: row.accumulated_seconds,
+                        accumulated_hours: row.accumulated_hours,
+                        percent_to_interval: row.percent_to_interval,
+                        is_overdue: row.is_overdue,
+                    }));
+                }
+            }
+        };
+
         self.fetchStatus = function () {
-            return OctoPrint.simpleApiCommand("nozzlelifetracker", "status", {})
-                .done(function (response) {
-                    var profiles = (response && response.profiles) || [];
-                    var tools = (response && response.tools) || [];
-                    var nozzles = (response && response.nozzles) || [];
-                    var toolMap = (response && response.tool_map) || {};
-                    var meta = (response && response.meta) || {};
-                    var previousToolsById = {};
-                    var errors = meta.error_flags || {};
-
-                    self.tools().forEach(function (row) {
-                        if (row && row.tool_id && row.selected_profile_id) {
-                            previousToolsById[row.tool_id] = {
-                                profile_id: row.selected_profile_id(),
-                                nozzle_id: row.selected_nozzle_id ? row.selected_nozzle_id() : row.active_nozzle_id,
-                            };
-                        }
-                    });
-
-                    self.profiles(profiles);
-                    self.nozzles(nozzles);
-                    self.toolMap(toolMap);
-                    self.activeToolId(meta.active_tool_id || "");
-                    self.activeNozzle(meta.active_nozzle || null);
-                    if (!self.createNozzleProfileId() && profiles.length > 0) {
-                        self.createNozzleProfileId(profiles[0].id);
+            var headers = {};
+            var data = { command: "status" };
+            if (self.statusEtag) {
+                headers["If-None-Match"] = self.statusEtag;
+            }
+            if (self.statusVersion !== null) {
+                data.since = self.statusVersion;
+            }
+            return OctoPrint.simpleApiGet("nozzlelifetracker", {
+                data: data,
+                headers: headers,
+            })
+                .done(function (response, textStatus, xhr) {
+                    if (xhr && xhr.status === 304) {
+                        return;
                     }
-
-                    self.tools(
-                        tools.map(function (tool) {
-                            var previous = previousToolsById[tool.tool_id] || {};
-                            var selectedProfileId = previous.profile_id || tool.profile_id;
-                            var selectedNozzleId = previous.nozzle_id || tool.active_nozzle_id;
-                            return {
-                                tool_id: tool.tool_id,
-                                profile_id: tool.profile_id,
-                                profile_name: tool.profile_name,
-                                interval_hours: tool.interval_hours,
-                                accumulated_seconds: tool.accumulated_seconds,
-                                accumulated_hours: tool.accumulated_hours,
-                                percent_to_interval: tool.percent_to_interval,
-                                is_overdue: tool.is_overdue,
-                                active_nozzle_id: tool.active_nozzle_id,
-                                runtime_source: tool.runtime_source,
-                                selected_profile_id: ko.observable(selectedProfileId),
-                                selected_nozzle_id: ko.observable(selectedNozzleId),
-                            };
-                        })
-                    );
-
-                    self.lastGeneratedAt(meta.generated_at || "");
-                    if (Object.keys(errors).length > 0) {
-                        self.errorText("Status warnings: " + Object.keys(errors).join(", "));
+                    if (self.statusVersion !== null && response && response.version < self.statusVersion) {
+                        // A pushed update already moved past this response.
+                        return;
+                    }
+                    if (response && response.full === false) {
+                        if (response.since !== self.statusVersion) {
+                            return;
+                        }
+                        self.applyStatusDelta(response);
                     } else {
-                        self.errorText("");
+                        self.applyStatus(response);
                     }
+                    self.statusEtag = (xhr && xhr.getResponseHeader("ETag")) || null;
+                    self.statusVersion = (response && response.version !== undefined) ? response.version : null;
                 })
                 .fail(function (xhr) {
                     console.log("[NozzleLifeTracker] status fetch failed", xhr);
@@ -296,9 +415,30 @@ $(function () {
                 self.resetCreateNozzleForm();
             });
             self.fetchStatus();
-            window.setInterval(function () {
+        };
+
+        self.onDataUpdaterPluginMessage = function (plugin, data) {
+            if (plugin !== "nozzlelifetracker" || !data || data.type !== "status") {
+                return;
+            }
+            if (data.full !== false) {
+                self.applyStatus(data);
+            } else if (self.statusVersion !== null && data.since === self.statusVersion) {
+                self.applyStatusDelta(data);
+            } else {
+                // Missed an update; resync over HTTP.
                 self.fetchStatus();
-            }, 10000);
+                return;
+            }
+            self.statusVersion = data.version;
+            self.statusEtag = null;
+        };
+
+        self.onDataUpdaterReconnect = function () {
+            // The server may have restarted, so its versions no longer line up.
+            self.statusVersion = null;
+            self.statusEtag = null;
+            self.fetchStatus();
         };
     }
 
@@ -307,4 +447,4 @@ $(function () {
         dependencies: ["loginStateViewModel", "settingsViewModel"],
         elements: ["#sidebar_plugin_nozzlelifetracker", "#settings_plugin_nozzlelifetracker"],
     });
-});
+});
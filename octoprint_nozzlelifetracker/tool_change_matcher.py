@@ -0,0 +1,109 @@
+import re
+
+from .phase1_pure import TOOL_CHANGE_FIRST_CHARS, TOOL_CHANGE_GCODE
+from .phase1_settings import normalize_tool_id
+
+
+# Bare "Tn" is always recognized; configured patterns are added alongside it.
+_BUILTIN_ALTERNATIVE = r"(?P<k0>T)(\d+)\s*(?:;.*)?$"
+
+
+class ToolChangeMatcher(object):
+    """All tool-change patterns compiled into one regex, behind a prefilter."""
+
+    def __init__(self, entries=()):
+        self.gcodes = {TOOL_CHANGE_GCODE}
+        self.first_chars = set(TOOL_CHANGE_FIRST_CHARS)
+        alternatives = [_BUILTIN_ALTERNATIVE]
+        # (group name, index of the value group or None, fixed tool, value -> tool)
+        self._resolvers = [("k0", 2, None, {})]
+        group_count = 2
+        for index, entry in enumerate(entries, start=1):
+            command = entry["command"]
+            alternative = r"(?P<k{}>{})(?![\w])\s*".format(index, re.escape(command))
+            value_group = None
+            if entry.get("pattern"):
+                alternative += "(?:{})".format(entry["pattern"])
+                if entry["groups"]:
+                    value_group = group_count + 2
+                group_count += entry["groups"]
+            group_count += 1
+            alternatives.append(alternative)
+            self._resolvers.append(("k{}".format(index), value_group, entry.get("tool"), entry.get("tools") or {}))
+            self.gcodes.add(command.upper())
+            self.first_chars.update((command[0].upper(), command[0].lower()))
+        self.gcodes = frozenset(self.gcodes)
+        self.first_chars = frozenset(self.first_chars)
+        self._regex = re.compile(r"^\s*(?:{})".format("|".join(alternatives)), re.IGNORECASE)
+
+    def match(self, cmd):
+        """Return the tool id a command line selects, or None."""
+        match = self._regex.match(cmd)
+        if match is None:
+            return None
+        for group_name, value_group, fixed_tool, tools in self._resolvers:
+            if match.group(group_name) is None:
+                continue
+            if fixed_tool:
+                return fixed_tool
+            value = match.group(value_group) if value_group else None
+            if value is None:
+                return None
+            mapped = tools.get(value.lower())
+            if mapped:
+                return mapped
+            return "T{}".format(int(value)) if value.isascii() and value.isdigit() else None
+        return None
+
+
+def normalize_tool_change_patterns(patterns):
+    """Validate configured tool-change patterns; returns (entries, errors)."""
+    entries = []
+    errors = []
+    for position, raw in enumerate(patterns if isinstance(patterns, list) else []):
+        label = "tool_change_patterns[{}]".format(position)
+        if not isinstance(raw, dict):
+            errors.append("{}: must be a mapping".format(label))
+            continue
+        command = str(raw.get("command") or "").strip()
+        if not re.match(r"^[A-Za-z_][\w.]*$", command):
+            errors.append("{}: command must be a single command word".format(label))
+            continue
+        entry = {"command": command, "pattern": "", "groups": 0}
+        pattern = str(raw.get("pattern") or "")
+        if pattern:
+            try:
+                compiled = re.compile(pattern, re.IGNORECASE)
+            except re.error as exc:
+                errors.append("{}: invalid pattern: {}".format(label, exc))
+                continue
+            if compiled.groupindex or compiled.groups > 1:
+                errors.append("{}: pattern may use at most one unnamed capture group".format(label))
+                continue
+            entry["pattern"] = pattern
+            entry["groups"] = compiled.groups
+        if raw.get("tool"):
+            tool = normalize_tool_id(raw.get("tool"))
+            if tool is None:
+                errors.append("{}: invalid tool {!r}".format(label, raw.get("tool")))
+                continue
+            entry["tool"] = tool
+        elif not entry["groups"]:
+            errors.append("{}: needs either a fixed tool or a pattern with a capture group".format(label))
+            continue
+        tools = {}
+        raw_tools = raw.get("tools") if isinstance(raw.get("tools"), dict) else {}
+        for value, tool in raw_tools.items():
+            tool_id = normalize_tool_id(tool)
+            if tool_id is None:
+                errors.append("{}: invalid tool {!r} for {!r}".format(label, tool, value))
+                continue
+            tools[str(value).lower()] = tool_id
+        entry["tools"] = tools
+        entries.append(entry)
+    return entries, errors
+
+
+def build_tool_change_matcher(patterns):
+    entries, errors = normalize_tool_change_patterns(patterns)
+    return ToolChangeMatcher(entries), errors
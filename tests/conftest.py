@@ -0,0 +1,93 @@
+import logging
+
+import pytest
+
+from octoprint_nozzlelifetracker import NozzleLifeTrackerPlugin
+
+
+class FakeSettings(object):
+    """In-memory stand-in for the plugin's OctoPrint settings; counts saves."""
+
+    def __init__(self, values=None):
+        self.values = dict(values or {})
+        self.saves = 0
+
+    def get(self, path):
+        return self.values.get(path[0])
+
+    def set(self, path, value):
+        self.values[path[0]] = value
+
+    def save(self):
+        self.saves += 1
+
+
+def build_plugin(data_folder=None, settings=None, load=True):
+    """Return a plugin wired to settings (a dict or FakeSettings) and data_folder.
+
+    With load, the startup path runs: the inventory and runtime state are read
+    from data_folder and normalized, as in on_after_startup.
+    """
+    plugin = NozzleLifeTrackerPlugin()
+    plugin._logger = logging.getLogger("tests")
+    plugin._settings = settings if isinstance(settings, FakeSettings) else FakeSettings(settings)
+    if data_folder is not None:
+        plugin.get_plugin_data_folder = lambda: str(data_folder)
+    if load:
+        plugin._load_nozzles()
+        plugin._ensure_phase1_settings(save=True)
+    return plugin
+
+
+def build_printing_plugin(tools=1, nozzles=None, settings=None, last_tick_ts=None):
+    """Return a plugin mid-print on T0, with tools T0.. assigned to nozzles n0...
+
+    nozzles pads the inventory with unassigned nozzles up to that count.
+    """
+    plugin = build_plugin(settings=settings, load=False)
+    with plugin._lock:
+        plugin._nozzle_profiles = {
+            "default_0_4_brass": {"id": "default_0_4_brass", "name": "0.4 Brass", "interval_hours": 100.0},
+        }
+        plugin._nozzles = {}
+        for index in range(max(tools, nozzles or 0)):
+            nozzle_id = "n{}".format(index)
+            plugin._nozzles[nozzle_id] = {
+                "id": nozzle_id,
+                "name": nozzle_id,
+                "profile_id": "default_0_4_brass",
+                "material": "brass",
+                "size_mm": 0.4,
+                "accumulated_seconds": 0,
+                "retired": False,
+                "metadata": {},
+            }
+        plugin._tool_state = {}
+        plugin._tool_map = {}
+        for index in range(tools):
+            tool_id = "T{}".format(index)
+            plugin._tool_state[tool_id] = {"tool_id": tool_id, "profile_id": "default_0_4_brass", "accumulated_seconds": 0}
+            plugin._tool_map[tool_id] = {"active_nozzle_id": "n{}".format(index)}
+        plugin._active_tool_id = "T0"
+        plugin._is_printing = True
+        plugin._last_tick_ts = last_tick_ts
+    plugin._load_accounting_settings()
+    return plugin
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="run the wall-clock timing tests marked benchmark",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="timing benchmark; pass --run-benchmarks to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
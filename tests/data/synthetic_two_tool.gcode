@@ -0,0 +1,636 @@
+; SYNTHETIC: hand-written two-tool print laid out like PrusaSlicer output, not a real slicer export.
+; Used only to replay a realistic mix of tool-change and motion lines through the queuing hook.
+;
+; external perimeters extrusion width = 0.45mm
+; perimeters extrusion width = 0.45mm
+; infill extrusion width = 0.45mm
+; first layer extrusion width = 0.42mm
+
+M73 P0 R47
+M201 X1000 Y1000 Z200 E5000 ; sets maximum accelerations, mm/sec^2
+M203 X200 Y200 Z12 E120 ; sets maximum feedrates, mm / sec
+M204 P1250 R1250 T1250 ; sets acceleration (P, T) and retract acceleration (R), mm/sec^2
+M205 X8.00 Y8.00 Z0.40 E4.50 ; sets the jerk limits, mm/sec
+M107
+;TYPE:Custom
+M104 T0 S215 ; set extruder temp
+M104 T1 S215
+M140 S60 ; set bed temp
+M190 S60 ; wait for bed temp
+M109 T0 S215 ; wait for extruder temp
+G28 ; home all
+G29 ; mesh bed leveling
+T0
+G92 E0
+G1 Z0.2 F720
+G1 Y-3 F1000 ; go outside print area
+G1 X60 E9 F1000 ; intro line
+G1 X100 E12.5 F1000 ; intro line
+G92 E0
+M221 S95
+G21 ; set units to millimeters
+G90 ; use absolute coordinates
+M83 ; use relative distances for extrusion
+;LAYER_CHANGE
+;Z:0.2
+;HEIGHT:0.2
+G1 E-.8 F2100
+G1 Z0.600 F720
+; CP TOOLCHANGE START
+M220 B
+M220 S100
+G1 E-.8 F2100
+M104 S190 ; cool the idle nozzle
+T0
+M109 S215
+M220 R
+; CP TOOLCHANGE END
+;TYPE:External perimeter
+;WIDTH:0.449999
+G1 F1800
+G1 X98.591 Y97.207 E0.13368
+G1 X95.170 Y97.494 E0.07948
+G1 X91.634 Y97.553 E0.01712
+G1 X91.103 Y94.112 E0.02724
+G1 X90.499 Y96.727 E0.03352
+G1 X88.285 Y97.746 E0.19006
+G1 X88.902 Y96.920 E0.19549
+G1 X85.275 Y99.788 E0.06503
+G1 X82.429 Y96.730 E0.06861
+G1 X84.958 Y94.176 E0.12050
+G1 X86.069 Y93.155 E0.11407
+G1 X82.572 Y89.632 E0.04913
+G1 X84.015 Y89.053 E0.06969
+G1 X84.699 Y88.678 E0.06696
+G1 X87.054 Y90.270 E0.05638
+G1 X87.650 Y90.472 E0.17628
+G1 X89.485 Y88.775 E0.19623
+G1 X86.430 Y88.120 E0.15386
+G1 X83.646 Y88.032 E0.01745
+G1 X84.991 Y90.148 E0.11887
+G1 X87.995 Y88.658 E0.14211
+G1 X88.750 Y89.297 E0.09668
+G1 X91.470 Y92.855 E0.10008
+G1 X92.783 Y89.340 E0.14328
+G1 X93.960 Y93.285 E0.16617
+G1 X92.237 Y92.371 E0.13704
+G1 X88.417 Y92.065 E0.04193
+G1 X85.354 Y88.537 E0.15596
+G1 X82.389 Y86.517 E0.08428
+G1 X85.360 Y83.162 E0.09535
+G1 X85.756 Y86.229 E0.16566
+G1 X88.668 Y84.457 E0.08891
+G1 X87.538 Y87.530 E0.19197
+G1 X84.745 Y84.940 E0.05407
+G1 X82.612 Y84.820 E0.12193
+G1 X80.714 Y80.852 E0.08960
+G1 X79.668 Y81.383 E0.19109
+G1 X81.192 Y81.507 E0.12734
+G1 X82.601 Y77.939 E0.18091
+G1 X84.841 Y80.935 E0.16160
+;TYPE:Solid infill
+G1 F3600
+G1 X83.550 Y79.723 E0.08624
+G1 X85.161 Y74.470 E0.07357
+G1 X81.666 Y70.417 E0.16902
+G1 X76.297 Y64.420 E0.10294
+G1 X71.515 Y62.783 E0.05893
+G1 X76.007 Y64.152 E0.10199
+G1 X73.034 Y62.321 E0.17746
+G1 X68.508 Y66.508 E0.39759
+G1 X68.100 Y66.314 E0.08006
+G1 X63.326 Y64.426 E0.14266
+G1 X67.272 Y60.363 E0.05808
+G1 X72.684 Y60.702 E0.10131
+G1 X73.202 Y55.027 E0.23484
+G1 X78.944 Y59.387 E0.29367
+G1 X76.078 Y57.787 E0.10846
+G1 X79.341 Y58.178 E0.32267
+G1 X77.297 Y54.855 E0.33403
+G1 X83.116 Y59.086 E0.33213
+G1 X86.936 Y61.965 E0.12936
+G1 X87.148 Y60.231 E0.06014
+G1 X81.483 Y57.584 E0.14071
+G1 X83.793 Y63.063 E0.20653
+G1 X89.037 Y68.919 E0.38425
+G1 X87.413 Y65.565 E0.12940
+G1 X83.774 Y62.017 E0.26842
+G1 X88.577 Y66.102 E0.21782
+G1 X90.413 Y69.698 E0.07967
+G1 X92.340 Y74.615 E0.32381
+G1 X95.342 Y74.352 E0.11248
+G1 X98.811 Y72.342 E0.33029
+G1 X104.471 Y71.092 E0.19049
+G1 X109.833 Y73.790 E0.10950
+G1 X105.357 Y69.603 E0.36670
+G1 X109.035 Y65.358 E0.33928
+G1 X114.799 Y67.245 E0.17264
+G1 X115.383 Y62.817 E0.05499
+G1 X121.034 Y64.613 E0.23430
+G1 X126.237 Y63.818 E0.35511
+G1 X130.151 Y60.351 E0.13814
+G1 X127.667 Y57.237 E0.25525
+G1 E-.8 F2100
+G0 X137.667 Y67.237 F9000
+; CP TOOLCHANGE START
+M220 B
+M220 S100
+G1 E-.8 F2100
+M104 S190 ; cool the idle nozzle
+T1
+M109 S215
+M220 R
+; CP TOOLCHANGE END
+;TYPE:External perimeter
+;WIDTH:0.449999
+G1 F1800
+G1 X125.741 Y56.589 E0.03490
+G1 X129.022 Y55.420 E0.09705
+G1 X129.688 Y58.654 E0.08992
+G1 X133.030 Y58.667 E0.11105
+G1 X133.218 Y54.817 E0.09362
+G1 X130.683 Y50.848 E0.16184
+G1 X128.062 Y50.636 E0.14779
+G1 X128.514 Y49.244 E0.10849
+G1 X128.957 Y51.518 E0.03016
+G1 X129.440 Y49.506 E0.06261
+G1 X131.618 Y49.568 E0.11673
+G1 X133.698 Y52.868 E0.09422
+G1 X134.598 Y52.912 E0.10731
+G1 X136.140 Y52.531 E0.11132
+G1 X135.964 Y56.063 E0.14285
+G1 X138.976 Y59.601 E0.05932
+G1 X139.452 Y63.147 E0.16960
+G1 X136.549 Y60.120 E0.09400
+G1 X133.130 Y58.045 E0.02389
+G1 X134.486 Y60.316 E0.18044
+G1 X131.721 Y62.045 E0.13545
+G1 X128.865 Y65.108 E0.19383
+G1 X126.622 Y68.728 E0.08567
+G1 X126.520 Y72.647 E0.16816
+G1 X123.811 Y72.099 E0.10796
+G1 X122.524 Y69.665 E0.07052
+G1 X124.302 Y65.821 E0.11527
+G1 X123.825 Y61.966 E0.07298
+G1 X124.817 Y62.064 E0.02222
+G1 X128.697 Y64.371 E0.19462
+G1 X125.536 Y62.495 E0.01752
+G1 X127.768 Y60.659 E0.03462
+G1 X127.146 Y63.950 E0.16561
+G1 X125.214 Y61.145 E0.18464
+G1 X125.779 Y62.748 E0.02700
+G1 X122.239 Y64.254 E0.09081
+G1 X118.819 Y67.761 E0.13054
+G1 X121.232 Y64.431 E0.17268
+G1 X117.765 Y67.333 E0.09622
+G1 X116.478 Y67.757 E0.18607
+;TYPE:Solid infill
+G1 F3600
+G1 X113.692 Y63.308 E0.23442
+G1 X110.554 Y58.621 E0.10651
+G1 X105.158 Y55.043 E0.15920
+G1 X102.818 Y58.157 E0.15149
+G1 X102.819 Y54.291 E0.17145
+G1 X97.037 Y51.297 E0.05537
+G1 X99.834 Y51.909 E0.11631
+G1 X99.531 Y57.125 E0.08720
+G1 X103.358 Y56.311 E0.22325
+G1 X107.374 Y55.028 E0.22734
+G1 X109.627 Y60.818 E0.16995
+G1 X113.614 Y63.298 E0.27259
+G1 X112.470 Y61.469 E0.06904
+G1 X108.028 Y56.318 E0.30931
+G1 X105.095 Y52.277 E0.07957
+G1 X109.191 Y56.723 E0.28469
+G1 X106.574 Y53.630 E0.15257
+G1 X106.087 Y49.520 E0.20604
+G1 X103.246 Y55.061 E0.39042
+G1 X103.811 Y51.995 E0.38798
+G1 X101.526 Y50.274 E0.05037
+G1 X100.105 Y49.969 E0.22597
+G1 X96.517 Y50.026 E0.05173
+G1 X93.687 Y45.103 E0.18983
+G1 X88.187 Y39.373 E0.15649
+G1 X84.981 Y40.400 E0.23522
+G1 X87.987 Y42.291 E0.30060
+G1 X92.536 Y40.965 E0.16415
+G1 X98.353 Y36.759 E0.30345
+G1 X100.072 Y31.284 E0.34235
+G1 X104.775 Y32.812 E0.30685
+G1 X108.521 Y28.484 E0.23332
+G1 X108.574 Y32.503 E0.33164
+G1 X112.491 Y33.512 E0.36249
+G1 X114.686 Y35.832 E0.13048
+G1 X109.060 Y31.429 E0.17625
+G1 X104.319 Y35.459 E0.24548
+G1 X105.852 Y36.973 E0.28823
+G1 X105.723 Y31.013 E0.32919
+G1 X108.702 Y31.049 E0.23732
+G1 E-.8 F2100
+G0 X118.702 Y41.049 F9000
+M73 P30 R33
+;LAYER_CHANGE
+;Z:0.4
+;HEIGHT:0.2
+G1 E-.8 F2100
+G1 Z0.800 F720
+; CP TOOLCHANGE START
+M220 B
+M220 S100
+G1 E-.8 F2100
+M104 S190 ; cool the idle nozzle
+T0
+M109 S215
+M220 R
+; CP TOOLCHANGE END
+;TYPE:External perimeter
+;WIDTH:0.449999
+G1 F1800
+G1 X109.977 Y27.577 E0.14999
+G1 X107.994 Y24.173 E0.06046
+G1 X109.829 Y21.814 E0.15057
+G1 X113.635 Y21.766 E0.08269
+G1 X113.467 Y23.236 E0.15572
+G1 X114.403 Y24.378 E0.02472
+G1 X111.582 Y22.409 E0.15121
+G1 X110.018 Y22.951 E0.01237
+G1 X106.503 Y21.101 E0.13768
+G1 X108.040 Y22.507 E0.06526
+G1 X108.173 Y22.224 E0.09860
+G1 X105.121 Y25.374 E0.04786
+G1 X108.946 Y28.864 E0.01333
+G1 X108.617 Y31.423 E0.19394
+G1 X108.213 Y29.572 E0.04987
+G1 X111.778 Y27.258 E0.12048
+G1 X108.912 Y27.450 E0.19102
+G1 X105.972 Y30.012 E0.10666
+G1 X109.067 Y31.639 E0.05396
+G1 X112.249 Y31.528 E0.01472
+G1 X108.278 Y31.462 E0.09564
+G1 X106.693 Y28.587 E0.07535
+G1 X105.222 Y31.309 E0.01033
+G1 X107.228 Y34.022 E0.03281
+G1 X110.639 Y35.726 E0.18130
+G1 X108.958 Y34.704 E0.08465
+G1 X112.948 Y35.417 E0.07853
+G1 X112.372 Y33.619 E0.01917
+G1 X109.186 Y36.296 E0.06427
+G1 X112.671 Y34.291 E0.06049
+G1 X112.759 Y31.809 E0.08094
+G1 X116.408 Y34.884 E0.16427
+G1 X117.455 Y38.191 E0.18873
+G1 X117.849 Y39.947 E0.01940
+G1 X119.708 Y39.554 E0.15301
+G1 X120.864 Y37.844 E0.01931
+G1 X124.278 Y34.863 E0.09971
+G1 X123.027 Y33.245 E0.15042
+G1 X126.838 Y31.326 E0.13464
+G1 X125.244 Y31.785 E0.08493
+;TYPE:Solid infill
+G1 F3600
+G1 X121.252 Y27.725 E0.12276
+G1 X126.124 Y27.689 E0.12701
+G1 X130.999 Y33.647 E0.20749
+G1 X126.674 Y29.956 E0.08175
+G1 X124.777 Y25.049 E0.13369
+G1 X121.878 Y25.885 E0.36054
+G1 X124.874 Y24.838 E0.19486
+G1 X125.164 Y23.360 E0.16837
+G1 X119.908 Y20.691 E0.38869
+G1 X115.419 Y20.731 E0.27037
+G1 X119.773 Y17.323 E0.14486
+G1 X116.755 Y16.120 E0.20605
+G1 X122.202 Y20.304 E0.35551
+G1 X116.464 Y14.691 E0.29833
+G1 X121.212 Y14.370 E0.25551
+G1 X115.214 Y13.068 E0.37439
+G1 X119.121 Y17.334 E0.39028
+G1 X116.103 Y12.643 E0.10403
+G1 X116.371 Y14.828 E0.37952
+G1 X119.032 Y16.596 E0.31768
+G1 X118.520 Y17.214 E0.06384
+G1 X121.908 Y14.005 E0.37197
+G1 X123.654 Y11.650 E0.09479
+G1 X120.675 Y13.285 E0.29450
+G1 X116.021 Y8.130 E0.23355
+G1 X117.015 Y6.787 E0.12825
+G1 X118.228 Y0.912 E0.15553
+G1 X117.756 Y6.420 E0.27560
+G1 X122.362 Y6.123 E0.13217
+G1 X119.326 Y11.651 E0.29663
+G1 X117.015 Y5.912 E0.22441
+G1 X119.109 Y4.952 E0.14004
+G1 X121.117 Y10.054 E0.12938
+G1 X115.526 Y8.111 E0.19719
+G1 X117.717 Y4.488 E0.32897
+G1 X120.587 Y4.546 E0.12183
+G1 X126.225 Y2.287 E0.33700
+G1 X122.995 Y-1.056 E0.31616
+G1 X120.534 Y4.367 E0.22352
+G1 X116.781 Y1.047 E0.19596
+G1 E-.8 F2100
+G0 X126.781 Y11.047 F9000
+; CP TOOLCHANGE START
+M220 B
+M220 S100
+G1 E-.8 F2100
+M104 S190 ; cool the idle nozzle
+T1
+M109 S215
+M220 R
+; CP TOOLCHANGE END
+;TYPE:External perimeter
+;WIDTH:0.449999
+G1 F1800
+G1 X118.104 Y4.637 E0.03781
+G1 X117.252 Y2.341 E0.19508
+G1 X114.387 Y-1.244 E0.02143
+G1 X113.533 Y1.941 E0.17788
+G1 X115.395 Y5.921 E0.18700
+G1 X114.029 Y3.405 E0.18782
+G1 X116.000 Y-0.340 E0.13624
+G1 X115.029 Y-1.349 E0.07302
+G1 X112.383 Y-5.326 E0.06316
+G1 X111.194 Y-1.681 E0.03350
+G1 X114.909 Y-4.022 E0.07776
+G1 X117.481 Y-1.446 E0.09217
+G1 X113.875 Y-1.658 E0.08082
+G1 X117.231 Y-4.114 E0.07921
+G1 X120.407 Y-7.872 E0.08805
+G1 X122.902 Y-5.739 E0.01772
+G1 X119.181 Y-9.238 E0.18481
+G1 X117.237 Y-7.260 E0.18072
+G1 X115.949 Y-9.081 E0.19196
+G1 X116.885 Y-10.984 E0.14616
+G1 X115.417 Y-12.779 E0.01072
+G1 X117.462 Y-9.447 E0.13046
+G1 X121.008 Y-13.253 E0.05443
+G1 X120.810 Y-9.599 E0.19124
+G1 X119.902 Y-11.590 E0.09169
+G1 X119.850 Y-8.166 E0.04476
+G1 X122.270 Y-6.258 E0.16632
+G1 X124.453 Y-5.400 E0.07228
+G1 X123.009 Y-6.505 E0.15863
+G1 X119.641 Y-8.926 E0.15305
+G1 X117.620 Y-12.409 E0.01643
+G1 X118.040 Y-13.802 E0.19625
+G1 X121.108 Y-9.900 E0.06033
+G1 X117.781 Y-13.128 E0.10471
+G1 X119.459 Y-13.553 E0.05450
+G1 X118.794 Y-12.590 E0.13808
+G1 X120.778 Y-9.814 E0.13624
+G1 X117.747 Y-7.087 E0.06582
+G1 X118.282 Y-8.104 E0.15023
+G1 X115.875 Y-10.124 E0.05661
+;TYPE:Solid infill
+G1 F3600
+G1 X111.715 Y-5.514 E0.25240
+G1 X109.631 Y-6.761 E0.39736
+G1 X109.719 Y-9.985 E0.33296
+G1 X111.559 Y-4.093 E0.08582
+G1 X111.256 Y-0.264 E0.34419
+G1 X116.229 Y-5.780 E0.15279
+G1 X111.659 Y-9.505 E0.39054
+G1 X112.658 Y-4.343 E0.18028
+G1 X117.051 Y-4.953 E0.14098
+G1 X120.385 Y0.395 E0.08702
+G1 X121.538 Y1.834 E0.12618
+G1 X119.963 Y-2.469 E0.12139
+G1 X117.022 Y-1.276 E0.27807
+G1 X113.463 Y-7.140 E0.16454
+G1 X115.603 Y-10.918 E0.15927
+G1 X112.044 Y-7.374 E0.24182
+G1 X106.803 Y-12.158 E0.18835
+G1 X107.405 Y-10.488 E0.08190
+G1 X103.369 Y-8.143 E0.19343
+G1 X100.769 Y-10.452 E0.38362
+G1 X98.517 Y-9.653 E0.17501
+G1 X97.514 Y-5.282 E0.39882
+G1 X95.880 Y-8.916 E0.30481
+G1 X92.324 Y-14.845 E0.36557
+G1 X91.409 Y-11.001 E0.19218
+G1 X96.003 Y-11.470 E0.10689
+G1 X90.181 Y-10.852 E0.27423
+G1 X95.098 Y-15.783 E0.26777
+G1 X93.549 Y-15.730 E0.10106
+G1 X90.948 Y-15.476 E0.37392
+G1 X86.254 Y-15.590 E0.33168
+G1 X91.856 Y-19.222 E0.09433
+G1 X97.173 Y-13.515 E0.21896
+G1 X91.813 Y-8.401 E0.18576
+G1 X96.664 Y-6.957 E0.33859
+G1 X92.587 Y-3.527 E0.12773
+G1 X91.441 Y0.629 E0.34022
+G1 X87.637 Y-2.753 E0.18991
+G1 X87.852 Y-4.150 E0.09307
+G1 X84.816 Y-1.452 E0.36405
+G1 E-.8 F2100
+G0 X94.816 Y8.548 F9000
+M73 P60 R19
+;LAYER_CHANGE
+;Z:0.6
+;HEIGHT:0.2
+G1 E-.8 F2100
+G1 Z1.000 F720
+; CP TOOLCHANGE START
+M220 B
+M220 S100
+G1 E-.8 F2100
+M104 S190 ; cool the idle nozzle
+T0
+M109 S215
+M220 R
+; CP TOOLCHANGE END
+;TYPE:External perimeter
+;WIDTH:0.449999
+G1 F1800
+G1 X81.145 Y-0.953 E0.15392
+G1 X77.450 Y1.753 E0.03237
+G1 X78.246 Y2.153 E0.12914
+G1 X76.696 Y1.514 E0.12070
+G1 X76.102 Y2.785 E0.09489
+G1 X75.609 Y-1.028 E0.12759
+G1 X75.525 Y-3.146 E0.15508
+G1 X77.765 Y-3.480 E0.04412
+G1 X77.550 Y-6.624 E0.03441
+G1 X76.995 Y-9.890 E0.09397
+G1 X77.076 Y-13.564 E0.13092
+G1 X73.734 Y-11.696 E0.15775
+G1 X73.826 Y-15.262 E0.10575
+G1 X72.849 Y-11.655 E0.03588
+G1 X75.706 Y-7.686 E0.14910
+G1 X78.226 Y-10.136 E0.19653
+G1 X78.160 Y-6.483 E0.18405
+G1 X75.481 Y-4.176 E0.18681
+G1 X72.006 Y-5.369 E0.15367
+G1 X69.276 Y-2.196 E0.06225
+G1 X71.801 Y-5.048 E0.10542
+G1 X75.160 Y-7.381 E0.05994
+G1 X75.208 Y-8.829 E0.01700
+G1 X72.665 Y-11.539 E0.18792
+G1 X74.102 Y-8.376 E0.04206
+G1 X76.381 Y-11.455 E0.11084
+G1 X77.472 Y-12.577 E0.17586
+G1 X77.913 Y-11.936 E0.17768
+G1 X74.750 Y-7.993 E0.12966
+G1 X73.904 Y-5.611 E0.06030
+G1 X77.828 Y-4.992 E0.07845
+G1 X79.945 Y-5.454 E0.04358
+G1 X81.894 Y-9.068 E0.16577
+G1 X79.923 Y-7.954 E0.19697
+G1 X80.610 Y-6.644 E0.06940
+G1 X76.624 Y-10.374 E0.03838
+G1 X77.553 Y-10.916 E0.10741
+G1 X80.717 Y-13.860 E0.05318
+G1 X81.942 Y-17.682 E0.01050
+G1 X80.782 Y-20.831 E0.07786
+;TYPE:Solid infill
+G1 F3600
+G1 X77.473 Y-19.828 E0.25618
+G1 X73.923 Y-18.341 E0.21622
+G1 X69.540 Y-13.101 E0.13526
+G1 X65.332 Y-17.952 E0.27337
+G1 X69.787 Y-14.566 E0.19068
+G1 X66.958 Y-20.428 E0.27573
+G1 X67.706 Y-22.224 E0.27596
+G1 X67.031 Y-16.978 E0.30673
+G1 X64.013 Y-12.136 E0.06540
+G1 X64.391 Y-13.264 E0.13318
+G1 X59.092 Y-9.918 E0.05432
+G1 X59.703 Y-4.627 E0.09979
+G1 X56.097 Y-3.330 E0.22743
+G1 X57.796 Y0.431 E0.11112
+G1 X55.509 Y-1.966 E0.06697
+G1 X60.181 Y1.430 E0.30039
+G1 X54.257 Y5.563 E0.31082
+G1 X53.840 Y8.464 E0.20837
+G1 X50.552 Y3.727 E0.13130
+G1 X45.017 Y1.754 E0.31238
+G1 X47.359 Y5.898 E0.29909
+G1 X44.551 Y6.543 E0.20262
+G1 X48.012 Y6.822 E0.14285
+G1 X49.716 Y12.404 E0.12595
+G1 X54.277 Y6.586 E0.14113
+G1 X51.110 Y9.513 E0.38064
+G1 X54.064 Y7.435 E0.35806
+G1 X52.006 Y4.305 E0.36765
+G1 X53.575 Y6.620 E0.28283
+G1 X59.323 Y6.253 E0.34390
+G1 X61.694 Y10.544 E0.20302
+G1 X64.390 Y11.388 E0.15771
+G1 X60.933 Y12.859 E0.07723
+G1 X65.863 Y8.594 E0.05942
+G1 X61.143 Y13.742 E0.17070
+G1 X56.845 Y8.087 E0.06458
+G1 X59.157 Y9.693 E0.29395
+G1 X61.998 Y4.482 E0.25667
+G1 X60.359 Y8.293 E0.33685
+G1 X65.054 Y3.084 E0.35373
+G1 E-.8 F2100
+G0 X75.054 Y13.084 F9000
+; CP TOOLCHANGE START
+M220 B
+M220 S100
+G1 E-.8 F2100
+M104 S190 ; cool the idle nozzle
+T1
+M109 S215
+M220 R
+; CP TOOLCHANGE END
+;TYPE:External perimeter
+;WIDTH:0.449999
+G1 F1800
+G1 X68.370 Y6.639 E0.03035
+G1 X66.015 Y3.535 E0.01654
+G1 X68.797 Y6.031 E0.13049
+G1 X71.398 Y7.083 E0.06460
+G1 X68.197 Y3.866 E0.15390
+G1 X65.837 Y2.419 E0.09052
+G1 X62.004 Y0.473 E0.06369
+G1 X63.730 Y-0.583 E0.07096
+G1 X67.442 Y-0.553 E0.17176
+G1 X68.388 Y-4.305 E0.08845
+G1 X67.880 Y-2.121 E0.07589
+G1 X69.517 Y-1.818 E0.05115
+G1 X72.415 Y-5.091 E0.16576
+G1 X69.778 Y-9.080 E0.04839
+G1 X71.875 Y-5.257 E0.01083
+G1 X71.802 Y-5.326 E0.16139
+G1 X69.278 Y-5.369 E0.07597
+G1 X71.933 Y-7.284 E0.18934
+G1 X70.203 Y-9.567 E0.14290
+G1 X70.189 Y-12.687 E0.13094
+G1 X66.836 Y-10.384 E0.14246
+G1 X69.132 Y-9.360 E0.07757
+G1 X68.342 Y-10.204 E0.17918
+G1 X65.031 Y-7.096 E0.01478
+G1 X62.680 Y-8.991 E0.18123
+G1 X62.690 Y-9.956 E0.17796
+G1 X60.558 Y-10.269 E0.11099
+G1 X62.594 Y-8.245 E0.13280
+G1 X61.382 Y-9.632 E0.03951
+G1 X64.127 Y-8.335 E0.15098
+G1 X61.483 Y-8.824 E0.15695
+G1 X62.117 Y-11.816 E0.09778
+G1 X65.198 Y-13.912 E0.04640
+G1 X63.610 Y-12.287 E0.17030
+G1 X60.846 Y-15.039 E0.05704
+G1 X59.459 Y-14.862 E0.04058
+G1 X58.084 Y-17.348 E0.19528
+G1 X59.913 Y-20.533 E0.19285
+G1 X56.726 Y-21.459 E0.19693
+G1 X59.086 Y-19.593 E0.09264
+;TYPE:Solid infill
+G1 F3600
+G1 X55.440 Y-17.937 E0.08740
+G1 X51.917 Y-19.277 E0.06188
+G1 X50.705 Y-15.785 E0.29270
+G1 X50.711 Y-14.197 E0.21215
+G1 X46.413 Y-12.952 E0.19165
+G1 X49.304 Y-8.056 E0.20051
+G1 X50.192 Y-5.067 E0.19740
+G1 X46.935 Y-2.400 E0.35803
+G1 X50.224 Y0.001 E0.34836
+G1 X52.379 Y1.699 E0.20887
+G1 X50.135 Y3.239 E0.08425
+G1 X49.170 Y6.627 E0.29960
+G1 X50.725 Y3.628 E0.19825
+G1 X50.188 Y5.087 E0.19327
+G1 X52.290 Y10.249 E0.11407
+G1 X54.144 Y13.587 E0.18605
+G1 X54.022 Y19.283 E0.06335
+G1 X54.543 Y15.213 E0.32363
+G1 X59.830 Y15.443 E0.08538
+G1 X60.725 Y15.936 E0.30105
+G1 X60.871 Y17.607 E0.34014
+G1 X61.131 Y16.531 E0.38179
+G1 X57.652 Y18.743 E0.18737
+G1 X60.805 Y14.212 E0.39456
+G1 X59.070 Y8.892 E0.14603
+G1 X57.866 Y3.051 E0.19650
+G1 X56.913 Y5.430 E0.17324
+G1 X54.095 Y2.123 E0.30951
+G1 X59.374 Y2.448 E0.12662
+G1 X62.992 Y1.152 E0.12420
+G1 X58.544 Y4.471 E0.33335
+G1 X60.155 Y4.101 E0.24672
+G1 X56.867 Y9.667 E0.17360
+G1 X58.532 Y13.492 E0.33566
+G1 X58.150 Y11.024 E0.24189
+G1 X53.652 Y15.029 E0.17416
+G1 X57.860 Y12.238 E0.18165
+G1 X54.902 Y11.352 E0.11506
+G1 X48.935 Y14.013 E0.14842
+G1 X45.874 Y11.635 E0.21784
+G1 E-.8 F2100
+G0 X55.874 Y21.635 F9000
+M73 P90 R5
+;TYPE:Custom
+G1 Z5 F720 ; lift nozzle
+M104 T0 S0 ; turn off hotend
+M104 T1 S0
+M140 S0 ; turn off heatbed
+M107 ; turn off fan
+G1 X0 Y200 F3000 ; home X axis
+M84 ; disable motors
+M73 P100 R0
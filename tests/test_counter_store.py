@@ -0,0 +1,109 @@
+from octoprint_nozzlelifetracker.counter_store import (
+    CounterFile,
+    apply_counters_to_runtime_state,
+    runtime_state_counters,
+)
+from tests.conftest import build_plugin
+
+
+def test_counter_file_round_trips_and_updates_in_place(tmp_path):
+    path = str(tmp_path / "runtime_counters.bin")
+    counters = CounterFile(path)
+    counters.write({"n:a": 10, "t:T0": 10})
+    size_after_create = (tmp_path / "runtime_counters.bin").stat().st_size
+
+    assert counters.write({"n:a": 15, "t:T0": 15}) == 2
+    assert counters.write({"n:a": 20}) == 2  # t:T0 too: the other bank missed its last update
+    assert counters.write({"n:a": 20}) == 0
+    counters.close()
+
+    reopened = CounterFile(path)
+    values, status = reopened.load()
+    reopened.close()
+
+    assert status == "loaded"
+    assert values == {"n:a": 20, "t:T0": 15}
+    assert (tmp_path / "runtime_counters.bin").stat().st_size == size_after_create
+
+
+def test_counter_file_falls_back_to_previous_generation_on_torn_bank(tmp_path):
+    path = str(tmp_path / "runtime_counters.bin")
+    counters = CounterFile(path)
+    counters.write({"n:a": 10})
+    counters.write({"n:a": 11})
+    counters.write({"n:a": 12})
+    counters.close()
+
+    # The last persist went to bank 0; clobber its slot as a torn write would.
+    with open(path, "r+b") as handle:
+        handle.seek(128)
+        handle.write(b"\xff" * 8)
+
+    reopened = CounterFile(path)
+    values, status = reopened.load()
+
+    assert status == "loaded"
+    assert values == {"n:a": 11}
+    reopened.write({"n:a": 13})
+    reopened.close()
+    again = CounterFile(path)
+    assert again.load() == ({"n:a": 13}, "loaded")
+    again.close()
+
+
+def test_counter_file_adds_new_keys_and_rejects_garbage(tmp_path):
+    path = str(tmp_path / "runtime_counters.bin")
+    counters = CounterFile(path)
+    counters.write({"n:a": 1})
+    counters.write({"n:b": 2})
+    counters.close()
+    reopened = CounterFile(path)
+
+    assert reopened.load() == ({"n:a": 1, "n:b": 2}, "loaded")
+    reopened.close()
+
+    (tmp_path / "garbage.bin").write_bytes(b"\0" * 256)
+    assert CounterFile(str(tmp_path / "garbage.bin")).load() == ({}, "malformed")
+    assert CounterFile(str(tmp_path / "missing.bin")).load() == ({}, "missing")
+
+
+def test_runtime_state_counter_helpers_round_trip():
+    runtime_state = {
+        "tool_state": {"T0": {"tool_id": "T0", "profile_id": "p", "accumulated_seconds": 7}},
+        "nozzle_runtime": {"n1": {"accumulated_seconds": 9}},
+    }
+
+    counters = runtime_state_counters(runtime_state)
+    restored = apply_counters_to_runtime_state(
+        {"tool_state": {"T0": {"tool_id": "T0", "profile_id": "p", "accumulated_seconds": 0}}, "nozzle_runtime": {}},
+        counters,
+    )
+
+    assert counters == {"t:T0": 7, "n:n1": 9}
+    assert restored == runtime_state
+
+
+def test_plugin_mmap_backend_persists_counters_without_journal_records(tmp_path):
+    plugin = build_plugin(tmp_path, {"runtime_storage": "mmap"})
+    plugin._start_runtime_writer()
+    with plugin._lock:
+        plugin._phase1_handle_print_start_or_resume_locked()
+        plugin._phase1_tick_locked(now_ts=plugin._last_tick_ts + 30, persist_if_due=False)
+        plugin._queue_runtime_journal_locked()
+    plugin._flush_runtime_writer(timeout=5)
+    plugin._runtime_writer.stop(timeout=5)
+    plugin._counter_file.close()
+
+    journal_lines = (tmp_path / "runtime_state.journal").read_text(encoding="utf-8").splitlines()
+    reloaded = build_plugin(tmp_path, {"runtime_storage": "mmap"})
+
+    assert len(journal_lines) == 1
+    assert reloaded._nozzles["nozzle_T0_legacy"]["accumulated_seconds"] == 30
+    assert reloaded._tool_state["T0"]["accumulated_seconds"] == 30
+    reloaded._counter_file.close()
+
+    # Switching back to json folds the counters into the snapshot and drops the file.
+    switched_back = build_plugin(tmp_path, {"runtime_storage": "json"})
+
+    assert switched_back._nozzles["nozzle_T0_legacy"]["accumulated_seconds"] == 30
+    assert not (tmp_path / "runtime_counters.bin").exists()
@@ -0,0 +1,105 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from octoprint_nozzlelifetracker.export_stream import (
+    gzip_stream,
+    iter_replacement_records,
+    parse_export_bound,
+    stream_csv,
+)
+from tests.conftest import build_plugin
+
+
+@pytest.fixture
+def plugin(tmp_path):
+    plugin = build_plugin(tmp_path)
+    plugin._open_job_ledger()
+    for index in range(5):
+        job_id = plugin._job_ledger.start_job(
+            started_at=1000.0 + index * 100,
+            file="part{}.gcode".format(index),
+            tool_id="T{}".format(index % 2),
+            nozzle_id="nozzle_T{}_legacy".format(index % 2),
+            nozzle_name="Legacy",
+        )
+        plugin._job_ledger.finish_job(job_id, ended_at=1050.0 + index * 100, status="done", duration_seconds=50)
+    yield plugin
+    plugin._job_ledger.close()
+
+
+def test_stream_csv_flushes_in_bounded_chunks():
+    records = ({"a": index, "b": "x" * 10} for index in range(1000))
+
+    chunks = list(stream_csv(records, ("a", "b"), chunk_bytes=256))
+
+    assert len(chunks) > 10
+    assert max(len(chunk) for chunk in chunks) < 256 + 64
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert len(rows) == 1000
+    assert rows[-1] == {"a": "999", "b": "x" * 10}
+
+
+def test_parse_export_bound_accepts_epoch_and_dates():
+    assert parse_export_bound("1500") == 1500.0
+    assert parse_export_bound(None) is None
+    assert parse_export_bound("2026-01-02") == parse_export_bound("2026-01-02 00:00:00")
+    with pytest.raises(ValueError):
+        parse_export_bound("yesterday")
+
+
+def test_replacement_records_filter_by_tool_and_range():
+    log = [
+        {"timestamp": "2026-01-01 10:00:00", "tool_id": "T0", "profile_id": "p", "accumulated_seconds_at_reset": 1},
+        {"timestamp": "2026-01-03 10:00:00", "tool_id": "T0", "profile_id": "p", "accumulated_seconds_at_reset": 2},
+        {"timestamp": "2026-01-03 11:00:00", "tool_id": "T1", "profile_id": "p", "accumulated_seconds_at_reset": 3},
+    ]
+
+    records = list(
+        iter_replacement_records(log, since=parse_export_bound("2026-01-02"), tool_id="T0")
+    )
+
+    assert [record["accumulated_seconds_at_reset"] for record in records] == [2]
+
+
+def test_csv_export_keeps_legacy_columns_and_applies_filters(plugin):
+    chunks, mimetype, filename = plugin.build_export({"from": "1100", "to": "1400", "tool_id": "t1"})
+
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+
+    assert mimetype == "text/csv"
+    assert filename == "nozzle_log.csv"
+    assert [row["file"] for row in rows] == ["part3.gcode", "part1.gcode"]
+    assert list(rows[0].keys())[:5] == ["timestamp", "nozzle_id", "nozzle_name", "file", "duration"]
+
+
+def test_jsonl_gzip_export_covers_all_datasets(plugin):
+    plugin.reset_tool("T0")
+
+    chunks, mimetype, filename = plugin.build_export({"format": "jsonl", "gzip": "1", "nozzle_id": "nozzle_T0_legacy"})
+    lines = gzip.decompress(b"".join(chunks)).decode("utf-8").splitlines()
+    records = [json.loads(line) for line in lines]
+
+    assert mimetype == "application/gzip"
+    assert filename == "nozzle_export.jsonl.gz"
+    assert [record["record"] for record in records] == ["jobs", "jobs", "jobs", "replacements", "nozzles"]
+    assert records[3]["tool_id"] == "T0"
+    assert records[4]["assigned_tool_id"] == "T0"
+
+
+def test_export_rejects_bad_parameters_before_streaming(plugin):
+    with pytest.raises(ValueError):
+        plugin.build_export({"format": "xml"})
+    with pytest.raises(ValueError):
+        plugin.build_export({"format": "csv", "dataset": "jobs,nozzles"})
+    with pytest.raises(ValueError):
+        plugin.build_export({"dataset": "bogus"})
+
+
+def test_gzip_stream_round_trips():
+    payload = b"".join(gzip_stream(iter(["a,b\n", "1,2\n"])))
+
+    assert gzip.decompress(payload) == b"a,b\n1,2\n"
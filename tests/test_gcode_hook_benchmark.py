@@ -0,0 +1,141 @@
+import os
+import re
+import time
+
+import pytest
+
+from octoprint_nozzlelifetracker import NozzleLifeTrackerPlugin
+from octoprint_nozzlelifetracker.tool_change_matcher import build_tool_change_matcher
+
+
+# Synthetic two-tool job in PrusaSlicer's layout; not a genuine slicer export.
+SAMPLE_GCODE = os.path.join(os.path.dirname(__file__), "data", "synthetic_two_tool.gcode")
+REPLAYS = 30
+SAMPLES = 5
+# Streaming at 10k lines/s leaves 100us per line; hold the hook to 1% of that.
+MAX_NS_PER_LINE = 1000
+
+# Same shape as OctoPrint's gcode_command_for_cmd: the parsed code, or None.
+_OCTOPRINT_COMMAND_RE = re.compile(r"^\s*((?P<GM>[GM]\d+)(\.\d+)?|(?P<T>T)\d+|(?P<F>F)\d+)", re.IGNORECASE)
+
+
+def _octoprint_gcode(cmd):
+    match = _OCTOPRINT_COMMAND_RE.match(cmd)
+    if not match:
+        return None
+    return (match.group("GM") or match.group("T") or match.group("F")).upper()
+
+
+def _load_queued_lines():
+    # OctoPrint strips comments and blank lines before the queuing phase.
+    queued = []
+    with open(SAMPLE_GCODE, "r", encoding="utf-8") as handle:
+        for line in handle:
+            cmd = line.split(";", 1)[0].strip()
+            if cmd:
+                queued.append((cmd, _octoprint_gcode(cmd)))
+    return queued * REPLAYS
+
+
+def _best_ns_per_line(replay, lines):
+    best = None
+    for _ in range(SAMPLES):
+        started = time.perf_counter_ns()
+        replay(lines)
+        elapsed = (time.perf_counter_ns() - started) / len(lines)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class _CountingMatcher(object):
+    def __init__(self, matcher):
+        self._matcher = matcher
+        self.gcodes = matcher.gcodes
+        self.first_chars = matcher.first_chars
+        self.calls = 0
+
+    def match(self, cmd):
+        self.calls += 1
+        return self._matcher.match(cmd)
+
+
+def test_gcode_hook_only_runs_the_matcher_on_tool_change_candidates():
+    plugin = NozzleLifeTrackerPlugin()
+    counting = plugin._tool_change_matcher = _CountingMatcher(plugin._tool_change_matcher)
+    lines = _load_queued_lines()
+
+    for cmd, gcode in lines:
+        plugin.hook_gcode_queuing(None, "queuing", cmd, None, gcode)
+
+    tool_changes = [tool_id for tool_id, _ in plugin._pending_tool_changes]
+    assert tool_changes[:6] == ["T0", "T0", "T1", "T0", "T1", "T0"]
+    assert len(tool_changes) == 7 * REPLAYS
+    assert counting.calls == sum(1 for _, gcode in lines if gcode == "T")
+
+
+def test_configured_patterns_do_not_widen_the_matcher_fast_path():
+    plugin = NozzleLifeTrackerPlugin()
+    matcher, errors = build_tool_change_matcher(
+        [{"command": "TOOL_MACRO_{}".format(index), "pattern": r"T=(\d+)"} for index in range(50)]
+    )
+    counting = plugin._tool_change_matcher = _CountingMatcher(matcher)
+    lines = _load_queued_lines()
+
+    for cmd, gcode in lines:
+        plugin.hook_gcode_queuing(None, "queuing", cmd, None, gcode)
+
+    assert errors == []
+    assert counting.calls == sum(1 for _, gcode in lines if gcode == "T")
+
+
+@pytest.mark.benchmark
+def test_gcode_hook_costs_well_under_one_percent_of_a_10k_lines_per_second_stream():
+    plugin = NozzleLifeTrackerPlugin()
+    lines = _load_queued_lines()
+    hook = plugin.hook_gcode_queuing
+
+    def replay_hook(queued):
+        for cmd, gcode in queued:
+            hook(None, "queuing", cmd, None, gcode)
+
+    hook_ns = _best_ns_per_line(replay_hook, lines)
+    tool_changes = [tool_id for tool_id, _ in plugin._pending_tool_changes]
+
+    assert tool_changes[:6] == ["T0", "T0", "T1", "T0", "T1", "T0"]
+    assert len(tool_changes) == 7 * REPLAYS * SAMPLES
+    assert hook_ns < MAX_NS_PER_LINE
+
+
+def test_gcode_hook_falls_back_to_the_first_character_without_a_parsed_code():
+    plugin = NozzleLifeTrackerPlugin()
+
+    for cmd in ("G1 X1 Y1 E0.1", "M104 S200", "t2", "  T3", ""):
+        plugin.hook_gcode_queuing(None, "queuing", cmd, None, None)
+
+    assert [tool_id for tool_id, _ in plugin._pending_tool_changes] == ["T2", "T3"]
+
+
+@pytest.mark.benchmark
+def test_gcode_hook_cost_does_not_grow_with_configured_patterns():
+    lines = _load_queued_lines()
+
+    def hook_ns(plugin):
+        hook = plugin.hook_gcode_queuing
+
+        def replay(queued):
+            for cmd, gcode in queued:
+                hook(None, "queuing", cmd, None, gcode)
+
+        return _best_ns_per_line(replay, lines)
+
+    default_plugin = NozzleLifeTrackerPlugin()
+    configured_plugin = NozzleLifeTrackerPlugin()
+    configured_plugin._tool_change_matcher, errors = build_tool_change_matcher(
+        [{"command": "TOOL_MACRO_{}".format(index), "pattern": r"T=(\d+)"} for index in range(50)]
+    )
+
+    default_ns = hook_ns(default_plugin)
+    configured_ns = hook_ns(configured_plugin)
+
+    assert errors == []
+    assert configured_ns < default_ns * 2 + 100
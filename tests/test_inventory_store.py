@@ -0,0 +1,96 @@
+import json
+
+from octoprint_nozzlelifetracker.inventory_store import (
+    append_inventory_journal,
+    build_inventory,
+    build_inventory_journal_records,
+    compact_inventory_file,
+    load_inventory_file,
+)
+from tests.conftest import FakeSettings, build_plugin
+
+
+def _inventory():
+    return build_inventory(
+        {"p1": {"id": "p1", "name": "Brass", "interval_hours": 100.0}},
+        {
+            "n1": {"id": "n1", "name": "A", "profile_id": "p1", "accumulated_seconds": 900},
+            "n2": {"id": "n2", "name": "B", "profile_id": "p1", "accumulated_seconds": 5},
+        },
+        {"T0": {"active_nozzle_id": "n1"}},
+    )
+
+
+def test_build_inventory_strips_runtime_counters():
+    inventory = _inventory()
+
+    assert set(inventory.keys()) == {"nozzle_profiles", "nozzles", "tool_map"}
+    assert inventory["nozzles"]["n1"]["accumulated_seconds"] == 0
+
+
+def test_inventory_journal_replays_upserts_and_deletes(tmp_path):
+    path = str(tmp_path / "inventory.json")
+    journal_path = str(tmp_path / "inventory.journal")
+    compact_inventory_file(path, journal_path, _inventory())
+
+    live_nozzles = dict(_inventory()["nozzles"])
+    live_nozzles["n3"] = {"id": "n3", "name": "C", "profile_id": "p1", "accumulated_seconds": 77}
+    del live_nozzles["n2"]
+    records = build_inventory_journal_records({"nozzles": live_nozzles}, {"nozzles": {"n2", "n3", ""}})
+    append_inventory_journal(journal_path, records)
+
+    loaded, status = load_inventory_file(path, journal_path)
+
+    assert status == "loaded"
+    assert sorted(loaded["nozzles"].keys()) == ["n1", "n3"]
+    assert loaded["nozzles"]["n3"]["accumulated_seconds"] == 0
+    assert loaded["tool_map"] == {"T0": {"active_nozzle_id": "n1"}}
+
+
+def test_inventory_journal_with_stale_epoch_is_ignored(tmp_path):
+    path = str(tmp_path / "inventory.json")
+    journal_path = str(tmp_path / "inventory.journal")
+    compact_inventory_file(path, journal_path, _inventory())
+    append_inventory_journal(journal_path, [{"s": "nozzles", "id": "n1", "v": None}])
+    # Simulates a crash after the new snapshot but before the journal reset.
+    with open(path, "r", encoding="utf-8") as handle:
+        raw = json.load(handle)
+    raw["journal_epoch"] = "newer"
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(raw, handle)
+
+    loaded, _ = load_inventory_file(path, journal_path)
+
+    assert "n1" in loaded["nozzles"]
+
+
+def test_plugin_migrates_inventory_out_of_settings_and_journals_mutations(tmp_path):
+    inventory = _inventory()
+    settings = FakeSettings(
+        {
+            "nozzle_profiles": inventory["nozzle_profiles"],
+            "nozzles": inventory["nozzles"],
+            "tool_map": inventory["tool_map"],
+        }
+    )
+    plugin = build_plugin(tmp_path, settings, load=False)
+    plugin._load_nozzles()
+    plugin._ensure_phase1_settings(save=True)
+
+    assert (tmp_path / "inventory.json").exists()
+    assert settings.values["nozzles"] == {}
+    assert settings.values["tool_map"] == {}
+    saves_after_migration = settings.saves
+
+    plugin.create_nozzle("Spare", "p1")
+    plugin.retire_nozzle("n2")
+
+    assert settings.saves == saves_after_migration
+    journal_lines = (tmp_path / "inventory.journal").read_text(encoding="utf-8").splitlines()
+    assert len(journal_lines) == 3
+
+    reloaded = build_plugin(tmp_path, settings, load=False)
+    reloaded._load_nozzles()
+
+    assert reloaded._nozzles["n2"]["retired"] is True
+    assert any(n["name"] == "Spare" for n in reloaded._nozzles.values())
@@ -0,0 +1,125 @@
+import threading
+
+import pytest
+
+from octoprint_nozzlelifetracker.job_ledger import JobLedger
+from tests.conftest import build_plugin
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = JobLedger(str(tmp_path / "job_ledger.sqlite3"))
+    ledger.open()
+    yield ledger
+    ledger.close()
+
+
+def _seed(ledger):
+    for index in range(5):
+        job_id = ledger.start_job(
+            started_at=1000.0 + index * 100,
+            file="part{}.gcode".format(index),
+            tool_id="T{}".format(index % 2),
+            nozzle_id="n{}".format(index % 2),
+            nozzle_name="Nozzle {}".format(index % 2),
+        )
+        ledger.finish_job(job_id, ended_at=1050.0 + index * 100, status="done", duration_seconds=50)
+
+
+def test_ledger_uses_wal_journal_mode(ledger):
+    mode = ledger._connection.execute("PRAGMA journal_mode").fetchone()[0]
+
+    assert mode == "wal"
+
+
+def test_ledger_queries_do_not_wait_for_an_open_write(ledger):
+    _seed(ledger)
+    results = []
+    with ledger._lock:
+        ledger._connection.execute("BEGIN IMMEDIATE")
+        ledger._connection.execute("DELETE FROM jobs")
+        reader = threading.Thread(target=lambda: results.append(ledger.query()[0]))
+        reader.start()
+        reader.join(timeout=5)
+        finished_during_write = not reader.is_alive()
+        ledger._connection.execute("ROLLBACK")
+    reader.join(timeout=5)
+
+    assert finished_during_write
+    assert len(results[0]) == 5
+
+
+def test_ledger_query_paginates_newest_first_with_cursor(ledger):
+    _seed(ledger)
+
+    first, cursor = ledger.query(limit=2)
+    second, cursor_2 = ledger.query(limit=2, cursor=cursor)
+    third, cursor_3 = ledger.query(limit=2, cursor=cursor_2)
+
+    assert [job["file"] for job in first + second + third] == [
+        "part4.gcode",
+        "part3.gcode",
+        "part2.gcode",
+        "part1.gcode",
+        "part0.gcode",
+    ]
+    assert cursor_3 is None
+    assert first[0]["status"] == "done"
+    assert first[0]["duration_seconds"] == 50
+
+
+def test_ledger_query_filters_by_nozzle_tool_and_time_range(ledger):
+    _seed(ledger)
+
+    by_nozzle, _ = ledger.query(nozzle_id="n0")
+    by_tool_range, _ = ledger.query(tool_id="T1", since=1100.0, until=1300.0)
+
+    assert [job["file"] for job in by_nozzle] == ["part4.gcode", "part2.gcode", "part0.gcode"]
+    assert [job["file"] for job in by_tool_range] == ["part1.gcode"]
+    with pytest.raises(ValueError):
+        ledger.query(cursor="garbage")
+
+
+def test_ledger_migrates_print_log_only_once(ledger):
+    entries = [
+        {"timestamp": "2026-01-02 03:04:05", "nozzle_id": "n1", "nozzle_name": "A", "file": "a.gcode", "duration": 120},
+        {"timestamp": 1700000000, "nozzle_id": "n2", "nozzle_name": "B", "file": "b.gcode", "duration": "bad"},
+    ]
+
+    assert ledger.migrate_print_log(entries) == 2
+    assert ledger.migrate_print_log(entries) == 0
+
+    jobs, _ = ledger.query()
+    assert [job["file"] for job in jobs] == ["a.gcode", "b.gcode"]
+    assert jobs[0]["duration_seconds"] == 120
+    assert jobs[1]["duration_seconds"] == 0
+
+
+def test_plugin_records_print_lifecycle_in_the_ledger(tmp_path):
+    plugin = build_plugin(tmp_path, {"print_log": [{"timestamp": 5, "file": "old.gcode", "duration": 10}]})
+    plugin._open_job_ledger()
+
+    plugin.on_event("PrintStarted", {"name": "benchy.gcode", "path": "benchy.gcode"})
+    plugin.on_event("PrintDone", {"name": "benchy.gcode", "time": 42.7})
+    result = plugin.query_jobs({"nozzle_id": "nozzle_T0_legacy"})
+    plugin._job_ledger.close()
+
+    assert plugin._settings.values["print_log"] == []
+    assert [job["file"] for job in result["jobs"]] == ["benchy.gcode"]
+    assert result["jobs"][0]["status"] == "done"
+    assert result["jobs"][0]["duration_seconds"] == 42
+    assert result["jobs"][0]["tool_id"] == "T0"
+
+
+def test_get_log_keeps_the_legacy_print_log_shape_and_order(tmp_path):
+    plugin = build_plugin(tmp_path)
+    plugin._open_job_ledger()
+    for name, seconds in (("first.gcode", 10), ("second.gcode", 20)):
+        plugin.on_event("PrintStarted", {"name": name, "path": name})
+        plugin.on_event("PrintDone", {"name": name, "time": seconds})
+    log = plugin.on_api_command("get_log", {})["log"]
+    plugin._job_ledger.close()
+
+    assert [sorted(entry) for entry in log] == [["duration", "file", "nozzle_id", "nozzle_name", "timestamp"]] * 2
+    assert [(entry["file"], entry["duration"]) for entry in log] == [("first.gcode", 10), ("second.gcode", 20)]
+    assert log[0]["nozzle_id"] == "nozzle_T0_legacy"
@@ -0,0 +1,100 @@
+import pytest
+
+from octoprint_nozzlelifetracker.nozzle_index import NozzleInventoryIndex
+
+
+PROFILES = {
+    "brass": {"id": "brass", "name": "Brass", "interval_hours": 1.0},
+    "steel": {"id": "steel", "name": "Steel", "interval_hours": 2.0},
+}
+
+
+def _nozzle(nozzle_id, seconds, *, profile_id="brass", material="brass", size_mm=0.4, retired=False):
+    return {
+        "id": nozzle_id,
+        "name": nozzle_id,
+        "profile_id": profile_id,
+        "material": material,
+        "size_mm": size_mm,
+        "accumulated_seconds": seconds,
+        "retired": retired,
+        "metadata": {},
+    }
+
+
+def _inventory():
+    return {
+        "a": _nozzle("a", 600),
+        "b": _nozzle("b", 4000),
+        "c": _nozzle("c", 3600, profile_id="steel", material="Steel", size_mm=0.6),
+        "d": _nozzle("d", 8000, profile_id="steel", material="steel", retired=True),
+        "e": _nozzle("e", 100, size_mm=0.6),
+    }
+
+
+def _synced_index(nozzles):
+    index = NozzleInventoryIndex()
+    index.sync(nozzles, PROFILES)
+    return index
+
+
+def test_query_pages_in_id_order_by_default():
+    index = _synced_index(_inventory())
+
+    assert index.query(limit=2) == (["a", "b"], 5)
+    assert index.query(offset=4, limit=2) == (["e"], 5)
+    assert index.query(descending=True, limit=2) == (["e", "d"], 5)
+
+
+def test_query_filters_intersect_buckets():
+    index = _synced_index(_inventory())
+
+    assert index.query(filters={"material": "STEEL"}) == (["c", "d"], 2)
+    assert index.query(filters={"material": "steel", "retired": "false"}) == (["c"], 1)
+    assert index.query(filters={"size_mm": "0.60"}, sort="hours") == (["e", "c"], 2)
+    assert index.query(filters={"profile_id": "missing"}) == ([], 0)
+
+
+def test_query_sorts_by_hours_and_percent_with_overdue_split():
+    index = _synced_index(_inventory())
+
+    assert index.query(sort="hours", descending=True)[0] == ["d", "b", "c", "a", "e"]
+    assert index.query(sort="percent")[0] == ["e", "a", "c", "b", "d"]
+    assert index.query(overdue=True, sort="percent") == (["b", "d"], 2)
+    assert index.query(overdue=False) == (["a", "c", "e"], 3)
+    assert index.query(overdue=True, filters={"retired": False}) == (["b"], 1)
+
+
+def test_sync_reslots_only_marked_nozzles():
+    nozzles = _inventory()
+    index = _synced_index(nozzles)
+
+    nozzles["a"]["accumulated_seconds"] = 9000
+    nozzles["f"] = _nozzle("f", 50, material="hardened")
+    index.mark_changed(("a", "f"))
+    index.sync(nozzles, PROFILES)
+
+    assert index.query(sort="hours", descending=True, limit=1) == (["a"], 6)
+    assert index.query(filters={"material": "hardened"}) == (["f"], 1)
+    assert index.query(overdue=True)[0] == ["a", "b", "d"]
+
+
+def test_full_change_rebuilds_index():
+    nozzles = _inventory()
+    index = _synced_index(nozzles)
+
+    # Shrinking the profile interval changes every brass nozzle's percent.
+    profiles = dict(PROFILES, brass=dict(PROFILES["brass"], interval_hours=0.1))
+    index.mark_changed(full=True)
+    index.sync(nozzles, profiles)
+
+    assert index.query(overdue=True, filters={"profile_id": "brass"}) == (["a", "b"], 2)
+
+
+def test_query_rejects_unknown_sort_and_filter():
+    index = _synced_index(_inventory())
+
+    with pytest.raises(ValueError):
+        index.query(sort="name")
+    with pytest.raises(ValueError):
+        index.query(filters={"color": "red"})
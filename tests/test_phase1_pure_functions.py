@@ -1,10 +1,14 @@
 import pytest
 
-from octoprint_nozzlelifetracker import (
+from octoprint_nozzlelifetracker.phase1_pure import (
+    accumulate_nozzle_seconds,
+    accumulate_nozzle_seconds_inplace,
+    accumulate_tool_seconds,
+    accumulate_tool_seconds_inplace,
+    carry_elapsed_units,
     compute_elapsed_seconds,
+    compute_elapsed_units,
     extract_tool_id_from_command,
-    accumulate_tool_seconds,
-    accumulate_nozzle_seconds,
 )
 
 
@@ -20,6 +24,15 @@ def test_compute_elapsed_seconds_negative_clamped():
     assert compute_elapsed_seconds(105.0, 100.0) == 0
 
 
+def test_elapsed_units_carry_the_sub_second_remainder():
+    delta_units = compute_elapsed_units(100.0, 105.4)
+
+    assert delta_units == 5400000
+    assert carry_elapsed_units(0, delta_units) == (5, 400000)
+    assert carry_elapsed_units(400000, 600000) == (1, 0)
+    assert compute_elapsed_units(105.0, 100.0) == 0
+
+
 @pytest.mark.parametrize(
     "cmd, expected",
     [
@@ -84,3 +97,68 @@ def test_accumulate_nozzle_seconds_creates_missing_nozzle():
     assert updated["nozzle_T0_legacy"]["id"] == "nozzle_T0_legacy"
     assert updated["nozzle_T0_legacy"]["profile_id"] == "p1"
     assert updated["nozzle_T0_legacy"]["accumulated_seconds"] == 10
+
+
+def test_accumulate_tool_seconds_inplace_updates_only_target_entry():
+    other_entry = {"tool_id": "T1", "profile_id": "p1", "accumulated_seconds": 4}
+    tool_state = {
+        "T0": {"tool_id": "T0", "profile_id": "p1", "accumulated_seconds": 12},
+        "T1": other_entry,
+    }
+
+    changed = accumulate_tool_seconds_inplace(tool_state, "t0", 8)
+
+    assert changed is True
+    assert tool_state["T0"]["accumulated_seconds"] == 20
+    assert tool_state["T1"] is other_entry
+    assert other_entry["accumulated_seconds"] == 4
+
+
+def test_accumulate_tool_seconds_inplace_creates_missing_tool():
+    tool_state = {}
+
+    changed = accumulate_tool_seconds_inplace(tool_state, "T2", 5, default_profile_id="p2")
+
+    assert changed is True
+    assert tool_state["T2"] == {"tool_id": "T2", "profile_id": "p2", "accumulated_seconds": 5}
+
+
+@pytest.mark.parametrize("delta_seconds", [0, -1, "bad"])
+def test_accumulate_inplace_non_positive_delta_noop(delta_seconds):
+    tool_state = {"T0": {"tool_id": "T0", "profile_id": "p1", "accumulated_seconds": 3}}
+    nozzles = {"n1": {"id": "n1", "accumulated_seconds": 3}}
+
+    assert accumulate_tool_seconds_inplace(tool_state, "T0", delta_seconds) is False
+    assert accumulate_nozzle_seconds_inplace(nozzles, "n1", delta_seconds) is False
+    assert tool_state["T0"]["accumulated_seconds"] == 3
+    assert nozzles["n1"]["accumulated_seconds"] == 3
+
+
+def test_accumulate_nozzle_seconds_inplace_matches_pure_variant():
+    nozzles = {
+        "n1": {
+            "id": "n1",
+            "name": "Brass #1",
+            "profile_id": "p1",
+            "material": "brass",
+            "size_mm": 0.4,
+            "accumulated_seconds": "7",
+            "retired": False,
+        }
+    }
+    expected, _ = accumulate_nozzle_seconds(nozzles, "n1", 10)
+
+    changed = accumulate_nozzle_seconds_inplace(nozzles, "n1", 10)
+
+    assert changed is True
+    assert nozzles["n1"] == expected["n1"]
+
+
+def test_accumulate_nozzle_seconds_inplace_creates_missing_nozzle():
+    nozzles = {}
+
+    changed = accumulate_nozzle_seconds_inplace(nozzles, "nozzle_T0_legacy", 10, default_profile_id="p1")
+
+    assert changed is True
+    assert nozzles["nozzle_T0_legacy"]["profile_id"] == "p1"
+    assert nozzles["nozzle_T0_legacy"]["accumulated_seconds"] == 10
@@ -1,6 +1,17 @@
+import copy
+
+import pytest
+
 from octoprint_nozzlelifetracker.phase1_settings import (
+    build_nozzle_detail,
+    build_status_delta,
     build_status_payload,
+    build_status_payload_index,
+    build_status_etag,
     ensure_phase1_settings,
+    etag_matches,
+    normalize_status_fields,
+    patch_status_payload_runtime,
 )
 
 
@@ -156,3 +167,212 @@ def test_build_status_payload_reports_duplicate_nozzle_assignment_error_flag():
     )
 
     assert "duplicate_nozzle_assignment" in payload["meta"]["error_flags"]
+
+
+def _runtime_patch_fixture():
+    profiles = {
+        "default_0_4_brass": {
+            "id": "default_0_4_brass",
+            "name": "0.4 Brass",
+            "interval_hours": 1.0,
+        }
+    }
+    tool_state = {
+        "T0": {"tool_id": "T0", "profile_id": "default_0_4_brass", "accumulated_seconds": 0},
+        "T1": {"tool_id": "T1", "profile_id": "default_0_4_brass", "accumulated_seconds": 0},
+    }
+    nozzles = {
+        "n0": {"id": "n0", "name": "A", "profile_id": "default_0_4_brass", "accumulated_seconds": 1800},
+        "n1": {"id": "n1", "name": "B", "profile_id": "default_0_4_brass", "accumulated_seconds": 60},
+    }
+    tool_map = {"T0": {"active_nozzle_id": "n0"}, "T1": {"active_nozzle_id": "n1"}}
+    return profiles, tool_state, nozzles, tool_map
+
+
+def test_patch_status_payload_runtime_matches_fresh_build():
+    profiles, tool_state, nozzles, tool_map = _runtime_patch_fixture()
+    cached = build_status_payload(profiles, tool_state, nozzles=nozzles, tool_map=tool_map, active_tool_id="T0")
+    cached_copy = copy.deepcopy(cached)
+    index = build_status_payload_index(cached)
+
+    nozzles["n0"]["accumulated_seconds"] = 3700
+    patched = patch_status_payload_runtime(cached, index, nozzles, tool_state, now_ts="2026-03-10T00:00:00Z")
+    fresh = build_status_payload(
+        profiles,
+        tool_state,
+        nozzles=nozzles,
+        tool_map=tool_map,
+        active_tool_id="T0",
+        now_ts="2026-03-10T00:00:00Z",
+    )
+
+    assert patched == fresh
+    assert patched["meta"]["active_nozzle"]["is_overdue"] is True
+    assert cached == cached_copy
+
+
+def test_patch_status_payload_runtime_shares_unchanged_entries():
+    profiles, tool_state, nozzles, tool_map = _runtime_patch_fixture()
+    cached = build_status_payload(profiles, tool_state, nozzles=nozzles, tool_map=tool_map, active_tool_id="T0")
+    index = build_status_payload_index(cached)
+
+    unchanged = patch_status_payload_runtime(cached, index, nozzles, tool_state, now_ts="later")
+    nozzles["n0"]["accumulated_seconds"] += 5
+    patched = patch_status_payload_runtime(cached, index, nozzles, tool_state, now_ts="later")
+
+    assert unchanged["nozzles"] is cached["nozzles"]
+    assert unchanged["meta"]["generated_at"] == "later"
+    assert cached["meta"]["generated_at"] is None
+    assert patched["nozzles"][1] is cached["nozzles"][1]
+    assert patched["nozzles"][0]["accumulated_seconds"] == 1805
+
+
+def test_build_status_etag_changes_with_each_generation():
+    base = build_status_etag("boot1", 3, 7)
+
+    assert base.startswith('"') and base.endswith('"')
+    assert build_status_etag("boot1", 3, 7) == base
+    assert build_status_etag("boot1", 4, 7) != base
+    assert build_status_etag("boot1", 3, 8) != base
+    assert build_status_etag("boot2", 3, 7) != base
+
+
+def test_etag_matches_if_none_match_header_forms():
+    etag = build_status_etag("boot1", 3, 7)
+
+    assert etag_matches(etag, etag) is True
+    assert etag_matches('"other", ' + etag, etag) is True
+    assert etag_matches("W/" + etag, etag) is True
+    assert etag_matches("*", etag) is True
+    assert etag_matches('"boot1-3-6"', etag) is False
+    assert etag_matches(None, etag) is False
+    assert etag_matches("", etag) is False
+
+
+def test_build_status_delta_without_changes_is_empty():
+    profiles, tool_state, nozzles, tool_map = _runtime_patch_fixture()
+    payload = build_status_payload(profiles, tool_state, nozzles=nozzles, tool_map=tool_map)
+    index = build_status_payload_index(payload)
+
+    delta = build_status_delta(payload, index, [(5, ("n0",), (), (), False, False)], 5, 5)
+
+    assert delta["full"] is False
+    assert delta["version"] == 5
+    assert delta["since"] == 5
+    for section in ("profiles", "tools", "nozzles"):
+        assert delta[section] == {"upsert": [], "remove": []}
+
+
+def test_build_status_delta_carries_changed_nozzle_and_assigned_tool():
+    profiles, tool_state, nozzles, tool_map = _runtime_patch_fixture()
+    payload = build_status_payload(profiles, tool_state, nozzles=nozzles, tool_map=tool_map)
+    index = build_status_payload_index(payload)
+    changes = [
+        (3, ("n1",), (), (), False, False),
+        (4, ("n0",), (), (), False, True),
+        (5, ("gone",), (), (), False, False),
+    ]
+
+    delta = build_status_delta(payload, index, changes, 3, 5)
+
+    assert [n["id"] for n in delta["nozzles"]["upsert"]] == ["n0"]
+    assert delta["nozzles"]["remove"] == ["gone"]
+    assert [t["tool_id"] for t in delta["tools"]["upsert"]] == ["T0"]
+    assert delta["profiles"] == {"upsert": [], "remove": []}
+    assert delta["tool_map"] == payload["tool_map"]
+
+
+def test_build_status_delta_omits_meta_and_tool_map_after_counter_only_changes():
+    profiles, tool_state, nozzles, tool_map = _runtime_patch_fixture()
+    payload = build_status_payload(profiles, tool_state, nozzles=nozzles, tool_map=tool_map)
+    index = build_status_payload_index(payload)
+    projected = build_status_payload(profiles, tool_state, nozzles=nozzles, tool_map=tool_map, fields=("tools",))
+    active_nozzle_id = payload["meta"]["active_nozzle"]["id"]
+    changes = [(4, (active_nozzle_id,), ("T0",), (), False, False)]
+
+    delta = build_status_delta(payload, index, changes, 3, 4)
+    projected_delta = build_status_delta(projected, build_status_payload_index(projected), changes, 3, 4)
+
+    assert "meta" not in delta
+    assert "tool_map" not in delta
+    assert [n["id"] for n in delta["nozzles"]["upsert"]] == [active_nozzle_id]
+    # Without the nozzles section, meta is the only place the counters travel.
+    assert projected_delta["meta"] == projected["meta"]
+
+
+def test_build_status_delta_falls_back_to_full_payload():
+    profiles, tool_state, nozzles, tool_map = _runtime_patch_fixture()
+    payload = build_status_payload(profiles, tool_state, nozzles=nozzles, tool_map=tool_map)
+    index = build_status_payload_index(payload)
+
+    trimmed = build_status_delta(payload, index, [(5, ("n0",), (), (), False, False)], 3, 5)
+    coarse = build_status_delta(payload, index, [(4, (), (), (), True, True), (5, ("n0",), (), (), False, False)], 3, 5)
+    ahead = build_status_delta(payload, index, [], 9, 5)
+    garbage = build_status_delta(payload, index, [], "abc", 5)
+
+    for result in (trimmed, coarse, ahead, garbage):
+        assert result["full"] is True
+        assert result["version"] == 5
+        assert result["nozzles"] == payload["nozzles"]
+
+
+def test_normalize_status_fields_parses_projection():
+    assert normalize_status_fields(None) is None
+    assert normalize_status_fields("") is None
+    assert normalize_status_fields("tools, active_nozzle") == ("active_nozzle", "tools")
+    assert normalize_status_fields(["nozzles"]) == ("nozzles",)
+    assert normalize_status_fields("profiles,tools,nozzles,tool_map,active_nozzle") is None
+    with pytest.raises(ValueError):
+        normalize_status_fields("nozzles,bogus")
+
+
+def test_build_status_payload_active_nozzle_projection_skips_sections():
+    profiles, tool_state, nozzles, tool_map = _runtime_patch_fixture()
+    full = build_status_payload(profiles, tool_state, nozzles=nozzles, tool_map=tool_map, active_tool_id="T0")
+    projected = build_status_payload(
+        profiles,
+        tool_state,
+        nozzles=nozzles,
+        tool_map=tool_map,
+        active_tool_id="T0",
+        fields=("active_nozzle",),
+    )
+
+    assert list(projected.keys()) == ["meta"]
+    assert projected["meta"] == full["meta"]
+
+    index = build_status_payload_index(full)
+    nozzles["n0"]["accumulated_seconds"] = 3700
+    patched = patch_status_payload_runtime(projected, index, nozzles, tool_state, now_ts="later")
+    assert list(patched.keys()) == ["meta"]
+    assert patched["meta"]["active_nozzle"]["accumulated_seconds"] == 3700
+
+
+def test_build_status_delta_respects_projection():
+    profiles, tool_state, nozzles, tool_map = _runtime_patch_fixture()
+    projected = build_status_payload(profiles, tool_state, nozzles=nozzles, tool_map=tool_map, fields=("tools",))
+    index = build_status_payload_index(projected)
+
+    delta = build_status_delta(projected, index, [(1, ("n0",), ("T0",), (), False, False)], 0, 1)
+
+    assert set(delta.keys()) == {"version", "since", "full", "tools", "meta"}
+    assert [t["tool_id"] for t in delta["tools"]["upsert"]] == ["T0"]
+
+
+def test_build_status_etag_distinguishes_projections():
+    assert build_status_etag("boot1", 3, 7, ("active_nozzle",)) != build_status_etag("boot1", 3, 7)
+    assert build_status_etag("boot1", 3, 7, None) == build_status_etag("boot1", 3, 7)
+
+
+def test_build_nozzle_detail_returns_heavy_fields():
+    profiles, _, nozzles, tool_map = _runtime_patch_fixture()
+    nozzles["n1"]["notes"] = "swapped after clog"
+    nozzles["n1"]["metadata"] = {"vendor": "E3D"}
+
+    detail = build_nozzle_detail("n1", nozzles, profiles, tool_map)
+
+    assert detail["nozzle"]["notes"] == "swapped after clog"
+    assert detail["nozzle"]["metadata"] == {"vendor": "E3D"}
+    assert detail["nozzle"]["percent_to_interval"] == 1.7
+    assert detail["assigned_tools"] == ["T1"]
+    assert build_nozzle_detail("missing", nozzles, profiles, tool_map) is None
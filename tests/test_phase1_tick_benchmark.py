@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from octoprint_nozzlelifetracker.phase1_pure import accumulate_nozzle_seconds
+from tests.conftest import build_printing_plugin
+
+
+TICKS_PER_SAMPLE = 500
+SAMPLES = 5
+
+
+def _per_tick_seconds(plugin):
+    best = None
+    now_ts = plugin._last_tick_ts
+    for _ in range(SAMPLES):
+        started = time.perf_counter()
+        for _ in range(TICKS_PER_SAMPLE):
+            now_ts += 5.0
+            plugin._phase1_tick_locked(now_ts=now_ts, persist_if_due=False)
+        elapsed = (time.perf_counter() - started) / TICKS_PER_SAMPLE
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class _NoScanDict(dict):
+    # Lookups by key are fine; anything that walks the inventory fails the test.
+    def _scan(self, *args, **kwargs):
+        raise AssertionError("tick walked the whole inventory")
+
+    __iter__ = keys = values = items = copy = _scan
+
+
+def test_tick_only_touches_the_active_entries():
+    plugin = build_printing_plugin(nozzles=1000, last_tick_ts=0.0)
+    plugin._nozzles = _NoScanDict(plugin._nozzles)
+    plugin._tool_state = _NoScanDict(plugin._tool_state)
+
+    for tick in range(1, 11):
+        plugin._phase1_tick_locked(now_ts=tick * 5.0, persist_if_due=False)
+
+    assert dict.__getitem__(plugin._nozzles, "n0")["accumulated_seconds"] == 50
+    assert dict.__getitem__(plugin._nozzles, "n1")["accumulated_seconds"] == 0
+    assert dict.__getitem__(plugin._tool_state, "T0")["accumulated_seconds"] == 50
+
+
+@pytest.mark.benchmark
+def test_tick_cost_is_flat_from_10_to_100k_nozzles():
+    small = build_printing_plugin(nozzles=10, last_tick_ts=0.0)
+    large = build_printing_plugin(nozzles=100000, last_tick_ts=0.0)
+
+    small_cost = _per_tick_seconds(small)
+    large_cost = _per_tick_seconds(large)
+
+    assert large._nozzles["n0"]["accumulated_seconds"] == SAMPLES * TICKS_PER_SAMPLE * 5
+    assert large_cost < (small_cost * 4) + 5e-6
+
+
+@pytest.mark.benchmark
+def test_copying_accumulator_scales_with_inventory_for_comparison():
+    small = build_printing_plugin(nozzles=10)._nozzles
+    large = build_printing_plugin(nozzles=100000)._nozzles
+
+    def per_call(nozzles, calls):
+        started = time.perf_counter()
+        for _ in range(calls):
+            accumulate_nozzle_seconds(nozzles, "n0", 5)
+        return (time.perf_counter() - started) / calls
+
+    small_cost = min(per_call(small, 200) for _ in range(3))
+    large_cost = min(per_call(large, 10) for _ in range(3))
+
+    assert large_cost > small_cost * 10
@@ -0,0 +1,121 @@
+import pytest
+
+import octoprint_nozzlelifetracker as plugin_module
+from octoprint_nozzlelifetracker.phase1_settings import build_status_payload, ensure_phase2_settings
+from tests.conftest import build_plugin
+
+
+def _build_plugin(tmp_path):
+    plugin = build_plugin(tmp_path, load=False)
+    with plugin._lock:
+        plugin._ensure_phase1_settings(save=False)
+    return plugin
+
+
+def _forbid_full_normalization(monkeypatch):
+    def _fail(*args, **kwargs):
+        raise AssertionError("full normalization ran during a mutator")
+
+    monkeypatch.setattr(plugin_module, "ensure_phase2_settings", _fail)
+
+
+def test_mutators_do_not_renormalize_the_whole_state(tmp_path, monkeypatch):
+    plugin = _build_plugin(tmp_path)
+    _forbid_full_normalization(monkeypatch)
+
+    nozzle = plugin.create_nozzle("Spare", "default_0_4_brass", size_mm="0.6")
+    plugin.assign_nozzle("T1", nozzle["id"])
+    plugin.set_tool_profile("T1", "default_0_4_brass")
+    plugin.reset_tool("t1")
+    plugin.reset_nozzle(nozzle["id"])
+    status = plugin.get_api_status()
+
+    assert nozzle["size_mm"] == 0.6
+    assert plugin._tool_map["T1"] == {"active_nozzle_id": nozzle["id"]}
+    assert [t["tool_id"] for t in status["tools"]] == ["T0", "T1"]
+    assert status["meta"]["error_flags"] == {}
+
+
+def test_reset_tool_heals_a_missing_mapping_for_that_tool(tmp_path, monkeypatch):
+    plugin = _build_plugin(tmp_path)
+    _forbid_full_normalization(monkeypatch)
+
+    plugin.reset_tool("T3")
+
+    assert plugin._tool_map["T3"] == {"active_nozzle_id": "nozzle_T3_legacy"}
+    assert plugin._nozzles["nozzle_T3_legacy"]["accumulated_seconds"] == 0
+    with pytest.raises(ValueError):
+        plugin.reset_tool("X3")
+
+
+def test_repair_state_runs_the_full_normalization_pass(tmp_path):
+    plugin = _build_plugin(tmp_path)
+    plugin._nozzles["broken"] = {"id": "broken", "size_mm": "-1", "accumulated_seconds": "12"}
+    plugin._tool_map["T0"] = {"active_nozzle_id": "missing"}
+
+    assert plugin.repair_state() is True
+    assert plugin._nozzles["broken"]["size_mm"] == 0.4
+    assert plugin._nozzles["broken"]["accumulated_seconds"] == 12
+    assert plugin.repair_state() is False
+
+
+def test_validated_status_payload_matches_normalized_build():
+    profiles, tool_state, _, nozzles, tool_map, errors = ensure_phase2_settings(None, None, None, None, None)
+
+    normalized = build_status_payload(profiles, tool_state, nozzles=nozzles, tool_map=tool_map, now_ts="t")
+    validated = build_status_payload(
+        profiles,
+        tool_state,
+        nozzles=nozzles,
+        tool_map=tool_map,
+        errors=errors,
+        now_ts="t",
+        validated=True,
+    )
+
+    assert validated == normalized
+    assert validated["tool_map"] is not tool_map
+
+
+def test_repeated_tool_changes_and_whole_entries_keep_the_generation(tmp_path):
+    plugin = _build_plugin(tmp_path)
+    with plugin._lock:
+        plugin._phase1_handle_tool_change_locked("T1")
+        plugin._phase1_handle_print_start_or_resume_locked()
+        generation = plugin._state_generation
+
+        plugin._phase1_handle_tool_change_locked("T1")
+        plugin._ensure_tool_state_entry_locked("T1")
+        plugin._phase1_tick_locked(now_ts=plugin._last_tick_ts + 5, persist_if_due=False)
+
+        assert plugin._state_generation == generation
+
+        plugin._phase1_handle_tool_change_locked("T0")
+
+        assert plugin._state_generation > generation
+
+
+def test_missing_tool_assignment_is_flagged_once_while_printing(tmp_path, monkeypatch):
+    plugin = _build_plugin(tmp_path)
+    with plugin._lock:
+        plugin._phase1_handle_print_start_or_resume_locked()
+        plugin._tool_map = {}
+        monkeypatch.setattr(plugin, "_ensure_tool_state_entry_locked", lambda tool_id: plugin._tool_state[tool_id])
+
+        plugin._phase1_tick_locked(now_ts=plugin._last_tick_ts + 5, persist_if_due=False)
+        generation = plugin._state_generation
+        for _ in range(3):
+            plugin._phase1_tick_locked(now_ts=plugin._last_tick_ts + 5, persist_if_due=False)
+
+        assert plugin._phase2_error_flags == {"missing_tool_assignment": {"T0": True}}
+        assert plugin._state_generation == generation
+
+
+def test_assigning_a_tool_without_a_previous_nozzle_records_no_empty_id(tmp_path):
+    plugin = _build_plugin(tmp_path)
+    nozzle = plugin.create_nozzle("Spare", "default_0_4_brass")
+    plugin.get_api_status()
+
+    plugin.assign_nozzle("T5", nozzle["id"])
+
+    assert plugin._status_changes[-1][1] == (nozzle["id"],)
@@ -0,0 +1,78 @@
+import gc
+import json
+import tracemalloc
+
+from octoprint_nozzlelifetracker.records import NozzleRecord, ReplacementEvent
+from octoprint_nozzlelifetracker.state_snapshot import PersistentMap, copy_state_entry, refresh_inventory_section
+
+
+NOZZLE_COUNT = 10000
+# Entries alone: records must at least halve what dict copies hold.
+MAX_RECORD_TO_DICT_RATIO = 0.5
+# Whole snapshot, where the shared trie nodes dilute the saving.
+MAX_SNAPSHOT_RATIO = 0.75
+
+
+def _inventory():
+    return {
+        "nozzle_{:05d}".format(index): {
+            "id": "nozzle_{:05d}".format(index),
+            "name": "Nozzle {}".format(index),
+            "profile_id": "default_0_4_brass",
+            "material": "brass",
+            "size_mm": 0.4,
+            "accumulated_seconds": index * 7,
+            "retired": False,
+            "notes": "",
+            "created_at": "2026-01-01T00:00:00Z",
+            "metadata": {},
+        }
+        for index in range(NOZZLE_COUNT)
+    }
+
+
+def _traced(build):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current, peak
+
+
+def test_snapshot_records_use_a_fraction_of_the_memory_of_dict_copies():
+    live = _inventory()
+
+    _, entry_dict_current, _ = _traced(lambda: [copy_state_entry(entry) for entry in live.values()])
+    _, entry_record_current, _ = _traced(lambda: [NozzleRecord.from_dict(entry) for entry in live.values()])
+    _, dict_current, dict_peak = _traced(
+        lambda: PersistentMap((nozzle_id, copy_state_entry(entry)) for nozzle_id, entry in live.items())
+    )
+    _, record_current, record_peak = _traced(lambda: refresh_inventory_section(None, live, (), rebuild=True))
+
+    assert entry_record_current < entry_dict_current * MAX_RECORD_TO_DICT_RATIO
+    assert record_current < dict_current * MAX_SNAPSHOT_RATIO
+    assert record_peak < dict_peak
+
+
+def test_archive_events_use_a_fraction_of_the_memory_of_dicts():
+    lines = [
+        json.dumps(
+            {
+                "timestamp": "2026-01-01 00:00:{:02d}".format(index % 60),
+                "tool_id": "T{}".format(index % 4),
+                "profile_id": "default_0_4_brass",
+                "accumulated_seconds_at_reset": index,
+                "nozzle_id": "nozzle_{:05d}".format(index),
+            }
+        )
+        for index in range(NOZZLE_COUNT)
+    ]
+    decoded = [json.loads(line) for line in lines]
+
+    _, dict_current, _ = _traced(lambda: [dict(entry) for entry in decoded])
+    _, record_current, _ = _traced(lambda: [ReplacementEvent(entry) for entry in decoded])
+
+    assert record_current < dict_current * MAX_RECORD_TO_DICT_RATIO
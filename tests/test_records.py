@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from octoprint_nozzlelifetracker.phase1_settings import build_nozzle_detail
+from octoprint_nozzlelifetracker.records import NozzleRecord, ProfileRecord, ReplacementEvent
+
+
+def test_records_round_trip_dicts_losslessly():
+    nozzle = {
+        "id": "n1",
+        "name": "Hardened",
+        "profile_id": "p",
+        "material": "steel",
+        "size_mm": 0.6,
+        "accumulated_seconds": 42,
+        "retired": False,
+        "metadata": {"batch": "7"},
+        "custom": "kept",
+    }
+    record = NozzleRecord.from_dict(nozzle)
+
+    assert record == nozzle
+    assert record.to_dict() == nozzle
+    assert "life_seconds" not in record
+    assert record.get("life_seconds", 0) == 0
+    assert record["custom"] == "kept"
+    assert NozzleRecord.from_dict(record) is record
+    with pytest.raises(KeyError):
+        record["notes"]
+    with pytest.raises(AttributeError):
+        record.name = "changed"
+
+
+def test_record_metadata_is_read_only():
+    source = {"id": "n1", "metadata": {"batch": "7"}}
+    record = NozzleRecord.from_dict(source)
+
+    with pytest.raises(TypeError):
+        record["metadata"]["batch"] = "8"
+    source["metadata"]["batch"] = "8"
+    assert record["metadata"] == {"batch": "7"}
+    assert json.loads(json.dumps(record.to_dict()))["metadata"] == {"batch": "7"}
+
+
+def test_records_work_with_the_dict_based_read_helpers():
+    nozzles = {"n1": NozzleRecord.from_dict({"id": "n1", "name": "A", "profile_id": "p", "life_seconds": 900})}
+    profiles = {"p": ProfileRecord.from_dict({"id": "p", "name": "Brass", "interval_hours": 1.0})}
+
+    detail = build_nozzle_detail("n1", nozzles, profiles, {"T0": {"active_nozzle_id": "n1"}})
+
+    assert detail["nozzle"]["effective_life_seconds"] == 900
+    assert detail["nozzle"]["profile_name"] == "Brass"
+    assert detail["assigned_tools"] == ["T0"]
+    event = ReplacementEvent.from_dict({"timestamp": "2026-01-01 00:00:00", "tool_id": "T0"})
+    assert json.loads(json.dumps(event.to_dict())) == event
@@ -0,0 +1,81 @@
+import gzip
+import json
+
+from octoprint_nozzlelifetracker.replacement_archive import ReplacementLogArchive, replacement_entry_ts
+from octoprint_nozzlelifetracker.runtime_state import load_runtime_state_file
+from tests.conftest import build_plugin
+
+
+def _entry(day, tool_id="T0"):
+    return {
+        "timestamp": "2026-01-{:02d} 12:00:00".format(day),
+        "tool_id": tool_id,
+        "profile_id": "default_0_4_brass",
+        "accumulated_seconds_at_reset": day,
+    }
+
+
+def test_archive_rotates_and_compresses_full_segments(tmp_path):
+    archive = ReplacementLogArchive(str(tmp_path), max_segment_bytes=300)
+    archive.open()
+
+    for day in range(1, 11):
+        archive.append([_entry(day)])
+
+    segments = archive.segments()
+    closed = segments[:-1]
+    assert len(closed) >= 2
+    assert all(segment["path"].endswith(".jsonl.gz") for segment in closed)
+    with gzip.open(closed[0]["path"], "rt", encoding="utf-8") as handle:
+        assert json.loads(handle.readline())["accumulated_seconds_at_reset"] == 1
+    assert sum(segment["count"] for segment in segments) == 10
+    assert [entry["accumulated_seconds_at_reset"] for entry in archive.iter_entries()] == list(range(1, 11))
+
+
+def test_archive_index_survives_reopen_and_skips_segments_outside_range(tmp_path):
+    archive = ReplacementLogArchive(str(tmp_path), max_segment_bytes=300)
+    archive.open()
+    for day in range(1, 11):
+        archive.append([_entry(day)])
+
+    reopened = ReplacementLogArchive(str(tmp_path), max_segment_bytes=300)
+    reopened.open()
+    since = replacement_entry_ts(_entry(9))
+    entries = list(reopened.iter_entries(since=since))
+
+    assert reopened.segments() == archive.segments()
+    assert 9 in [entry["accumulated_seconds_at_reset"] for entry in entries]
+    assert 1 not in [entry["accumulated_seconds_at_reset"] for entry in entries]
+
+
+def test_archive_drops_a_torn_final_line_on_open(tmp_path):
+    archive = ReplacementLogArchive(str(tmp_path))
+    archive.open()
+    archive.append([_entry(1)])
+    with open(archive.segments()[-1]["path"], "a", encoding="utf-8") as handle:
+        handle.write('{"timestamp": "2026-01-0')
+
+    reopened = ReplacementLogArchive(str(tmp_path))
+    reopened.open()
+    reopened.append([_entry(2)])
+
+    assert [entry["accumulated_seconds_at_reset"] for entry in reopened.iter_entries()] == [1, 2]
+
+
+def test_plugin_moves_snapshot_replacement_log_into_the_archive(tmp_path):
+    runtime_state = {
+        "tool_state": {"T0": {"tool_id": "T0", "profile_id": "default_0_4_brass", "accumulated_seconds": 5}},
+        "replacement_log": [_entry(1), _entry(2)],
+        "nozzle_runtime": {},
+    }
+    (tmp_path / "runtime_state.json").write_text(json.dumps(runtime_state), encoding="utf-8")
+    plugin = build_plugin(tmp_path)
+
+    plugin.reset_tool("T0")
+
+    rewritten, _ = load_runtime_state_file(str(tmp_path / "runtime_state.json"))
+    assert "replacement_log" not in rewritten
+    assert "replacement_log" not in plugin._runtime_state_payload()
+    archived = list(plugin._replacement_archive.iter_entries())
+    assert [entry["accumulated_seconds_at_reset"] for entry in archived] == [1, 2, 5]
+    assert archived[-1]["nozzle_id"] == "nozzle_T0_legacy"
@@ -0,0 +1,64 @@
+import random
+
+from tests.conftest import build_printing_plugin
+
+
+TOOLS = ("T0", "T1", "T2")
+PRINT_MS = 30 * 60 * 1000
+
+
+def _simulate(seed, tick_ms, mean_tool_change_ms):
+    """Replay a print at millisecond resolution; returns (plugin, exact active ms per tool)."""
+    rng = random.Random(seed)
+    plugin = build_printing_plugin(tools=len(TOOLS), last_tick_ts=1000.0)
+    active_ms = dict.fromkeys(TOOLS, 0)
+    active_tool = "T0"
+    now_ms = 0
+    next_tick_ms = tick_ms
+    next_change_ms = rng.randint(1, 2 * mean_tool_change_ms)
+    while now_ms < PRINT_MS:
+        event_ms = min(next_tick_ms, next_change_ms, PRINT_MS)
+        active_ms[active_tool] += event_ms - now_ms
+        now_ms = event_ms
+        now_ts = 1000.0 + now_ms / 1000.0
+        if now_ms == next_change_ms:
+            active_tool = rng.choice(TOOLS)
+            plugin._phase1_handle_tool_change_locked(active_tool, now_ts=now_ts)
+            next_change_ms += rng.randint(1, 2 * mean_tool_change_ms)
+        else:
+            plugin._phase1_tick_locked(now_ts=now_ts, persist_if_due=False)
+            next_tick_ms += tick_ms
+    return plugin, active_ms
+
+
+def test_totals_are_exact_for_any_tick_cadence_and_tool_change_rate():
+    for seed, tick_ms, mean_tool_change_ms in (
+        (1, 5000, 60000),
+        (2, 1000, 700),
+        (3, 333, 2500),
+        (4, 60000, 1500),
+        (5, 97, 450),
+    ):
+        plugin, active_ms = _simulate(seed, tick_ms, mean_tool_change_ms)
+
+        for index, tool_id in enumerate(TOOLS):
+            expected_seconds = active_ms[tool_id] // 1000
+            assert plugin._tool_state[tool_id]["accumulated_seconds"] == expected_seconds, (seed, tool_id)
+            assert plugin._nozzles["n{}".format(index)]["accumulated_seconds"] == expected_seconds, (seed, tool_id)
+        assert sum(active_ms.values()) == PRINT_MS
+
+
+def test_journal_deltas_match_the_counters():
+    plugin, active_ms = _simulate(6, 1000, 900)
+
+    nozzle_totals = {}
+    tool_totals = {}
+    for (nozzle_id, tool_id), delta_seconds in plugin._runtime_journal_pending.items():
+        if nozzle_id:
+            nozzle_totals[nozzle_id] = nozzle_totals.get(nozzle_id, 0) + delta_seconds
+        if tool_id:
+            tool_totals[tool_id] = tool_totals.get(tool_id, 0) + delta_seconds
+
+    for index, tool_id in enumerate(TOOLS):
+        assert tool_totals.get(tool_id, 0) == active_ms[tool_id] // 1000
+        assert nozzle_totals.get("n{}".format(index), 0) == active_ms[tool_id] // 1000
@@ -0,0 +1,119 @@
+import copy
+import gc
+import os
+import time
+import tracemalloc
+
+import pytest
+
+from octoprint_nozzlelifetracker.records import NozzleRecord, ToolStateRecord
+from octoprint_nozzlelifetracker.runtime_state import (
+    load_runtime_state_file,
+    normalize_runtime_state,
+    runtime_state_view,
+    save_runtime_state_file,
+    write_json_file_atomic,
+)
+from octoprint_nozzlelifetracker.state_snapshot import PersistentMap
+
+
+NOZZLE_COUNT = 10000
+TOOL_COUNT = 8
+SAMPLES = 3
+
+
+def _live_state():
+    nozzles = {
+        "nozzle_{:05d}".format(index): {
+            "id": "nozzle_{:05d}".format(index),
+            "name": "Nozzle {}".format(index),
+            "profile_id": "default_0_4_brass",
+            "material": "brass",
+            "size_mm": 0.4,
+            "accumulated_seconds": index * 7,
+            "retired": False,
+            "metadata": {},
+        }
+        for index in range(NOZZLE_COUNT)
+    }
+    tool_state = {
+        "T{}".format(index): {"tool_id": "T{}".format(index), "profile_id": "default_0_4_brass", "accumulated_seconds": index}
+        for index in range(TOOL_COUNT)
+    }
+    return tool_state, nozzles
+
+
+def _deepcopy_pretty_save(path, tool_state, nozzles):
+    # The previous path: build_runtime_state deep-copied tool_state and built a
+    # nozzle_runtime dict, save normalized (deep-copying) again, then json.dump
+    # wrote the indented form through the same atomic, fsynced write.
+    nozzle_runtime = {
+        nozzle_id: {"accumulated_seconds": max(0, int(float(nozzle.get("accumulated_seconds", 0))))}
+        for nozzle_id, nozzle in nozzles.items()
+    }
+    built = normalize_runtime_state({"tool_state": copy.deepcopy(tool_state), "nozzle_runtime": nozzle_runtime})
+    normalized = normalize_runtime_state(built)
+    normalized["journal_epoch"] = "epoch"
+    write_json_file_atomic(path, normalized)
+
+
+def _best_seconds(save):
+    best = None
+    for _ in range(SAMPLES):
+        started = time.perf_counter()
+        save()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _peak_bytes(save):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        save()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _savers(tmp_path):
+    tool_state, nozzles = _live_state()
+    # What the plugin publishes and hands to the writer thread.
+    published_tools = {tool_id: ToolStateRecord.from_dict(entry) for tool_id, entry in tool_state.items()}
+    published_nozzles = PersistentMap((nozzle_id, NozzleRecord.from_dict(entry)) for nozzle_id, entry in nozzles.items())
+    before_path = str(tmp_path / "before.json")
+    after_path = str(tmp_path / "after.json")
+
+    def save_before():
+        _deepcopy_pretty_save(before_path, tool_state, nozzles)
+        return before_path
+
+    def save_after():
+        # Snapshots rotate through generation files; return the one just written.
+        return save_runtime_state_file(
+            after_path, runtime_state_view(published_tools, published_nozzles), journal_epoch="epoch"
+        )
+
+    return save_before, save_after
+
+
+def test_streamed_compact_snapshot_is_smaller_and_lighter_than_deepcopy_pretty(tmp_path):
+    save_before, save_after = _savers(tmp_path)
+
+    before_peak = _peak_bytes(save_before)
+    after_peak = _peak_bytes(save_after)
+    before_path = save_before()
+    after_path = save_after()
+
+    assert load_runtime_state_file(str(tmp_path / "after.json")) == load_runtime_state_file(before_path)
+    assert os.path.getsize(after_path) < os.path.getsize(before_path) * 0.75
+    assert after_peak < before_peak / 2
+
+
+@pytest.mark.benchmark
+def test_streamed_compact_snapshot_is_faster_than_deepcopy_pretty(tmp_path):
+    save_before, save_after = _savers(tmp_path)
+
+    assert _best_seconds(save_after) < _best_seconds(save_before)
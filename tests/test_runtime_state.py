@@ -1,12 +1,26 @@
+import json
+import os
+
+from octoprint_nozzlelifetracker.records import NozzleRecord, ToolStateRecord
 from octoprint_nozzlelifetracker.runtime_state import (
+    append_runtime_journal,
     apply_runtime_state_to_nozzles,
+    build_runtime_journal_record,
     build_runtime_state,
+    compact_runtime_state_file,
     has_legacy_runtime_state,
     load_runtime_state_file,
+    normalize_runtime_state,
+    load_runtime_state_generations,
+    read_runtime_journal,
+    runtime_snapshot_paths,
+    runtime_state_view,
     save_runtime_state_file,
     should_snapshot_runtime_state,
     strip_runtime_state_from_settings,
 )
+from octoprint_nozzlelifetracker.state_snapshot import PersistentMap
+from tests.conftest import build_plugin
 
 
 def test_load_runtime_state_file_missing_returns_defaults(tmp_path):
@@ -15,7 +29,6 @@ def test_load_runtime_state_file_missing_returns_defaults(tmp_path):
     assert status == "missing"
     assert runtime_state == {
         "tool_state": {},
-        "replacement_log": [],
         "nozzle_runtime": {},
     }
 
@@ -98,7 +111,7 @@ def test_legacy_settings_runtime_migration_helpers():
 
     assert has_legacy_runtime_state(tool_state, replacement_log, nozzles) is True
 
-    runtime_state = build_runtime_state(tool_state, replacement_log, nozzles)
+    runtime_state = build_runtime_state(tool_state, nozzles)
     merged_nozzles = apply_runtime_state_to_nozzles({"nozzle_T0_legacy": {"id": "nozzle_T0_legacy"}}, runtime_state)
     sanitized_tool_state, sanitized_replacement_log, sanitized_nozzles = strip_runtime_state_from_settings(
         tool_state,
@@ -107,6 +120,7 @@ def test_legacy_settings_runtime_migration_helpers():
     )
 
     assert runtime_state["tool_state"]["T0"]["accumulated_seconds"] == 15
+    assert "replacement_log" not in runtime_state
     assert runtime_state["nozzle_runtime"]["nozzle_T0_legacy"]["accumulated_seconds"] == 15
     assert merged_nozzles["nozzle_T0_legacy"]["accumulated_seconds"] == 15
     assert sanitized_tool_state["T0"]["accumulated_seconds"] == 0
@@ -176,3 +190,248 @@ def test_should_snapshot_runtime_state_does_not_double_trigger_without_new_inter
 
     assert first_snapshot is True
     assert second_snapshot is False
+
+
+def _journal_base_state():
+    return {
+        "tool_state": {
+            "T0": {
+                "tool_id": "T0",
+                "profile_id": "default_0_4_brass",
+                "accumulated_seconds": 100,
+            }
+        },
+        "replacement_log": [],
+        "nozzle_runtime": {
+            "nozzle_T0_legacy": {
+                "accumulated_seconds": 100,
+            }
+        },
+    }
+
+
+def test_runtime_journal_replays_on_top_of_snapshot(tmp_path):
+    runtime_path = tmp_path / "runtime_state.json"
+    journal_path = tmp_path / "runtime_state.journal"
+
+    compact_runtime_state_file(str(runtime_path), str(journal_path), _journal_base_state())
+    append_runtime_journal(
+        str(journal_path),
+        [build_runtime_journal_record("nozzle_T0_legacy", "T0", 60, 1000)],
+    )
+    append_runtime_journal(
+        str(journal_path),
+        [
+            build_runtime_journal_record("nozzle_T0_legacy", "T0", 30, 1060),
+            build_runtime_journal_record("nozzle_T1_legacy", "T1", 5, 1060),
+        ],
+    )
+
+    loaded_state, status = load_runtime_state_file(str(runtime_path), journal_path=str(journal_path))
+
+    assert status == "loaded"
+    assert loaded_state["nozzle_runtime"]["nozzle_T0_legacy"]["accumulated_seconds"] == 190
+    assert loaded_state["nozzle_runtime"]["nozzle_T1_legacy"]["accumulated_seconds"] == 5
+    assert loaded_state["tool_state"]["T0"]["accumulated_seconds"] == 190
+    assert loaded_state["tool_state"]["T1"]["accumulated_seconds"] == 5
+    assert "journal_epoch" not in loaded_state
+
+
+def test_runtime_journal_append_is_small(tmp_path):
+    journal_path = tmp_path / "runtime_state.journal"
+
+    written = append_runtime_journal(
+        str(journal_path),
+        [build_runtime_journal_record("nozzle_T0_legacy", "T0", 60, 1760000000)],
+    )
+
+    assert 0 < written < 100
+    assert journal_path.stat().st_size == written
+
+
+def test_runtime_journal_compaction_folds_records_and_resets_journal(tmp_path):
+    runtime_path = tmp_path / "runtime_state.json"
+    journal_path = tmp_path / "runtime_state.journal"
+
+    compact_runtime_state_file(str(runtime_path), str(journal_path), _journal_base_state())
+    append_runtime_journal(str(journal_path), [build_runtime_journal_record("nozzle_T0_legacy", "T0", 60, 1000)])
+    replayed_state, _ = load_runtime_state_file(str(runtime_path), journal_path=str(journal_path))
+
+    compact_runtime_state_file(str(runtime_path), str(journal_path), replayed_state)
+    epoch, records = read_runtime_journal(str(journal_path))
+    loaded_state, _ = load_runtime_state_file(str(runtime_path), journal_path=str(journal_path))
+
+    assert epoch
+    assert records == []
+    assert loaded_state["nozzle_runtime"]["nozzle_T0_legacy"]["accumulated_seconds"] == 160
+
+
+def test_runtime_journal_with_stale_epoch_is_ignored(tmp_path):
+    runtime_path = tmp_path / "runtime_state.json"
+    journal_path = tmp_path / "runtime_state.journal"
+
+    compact_runtime_state_file(str(runtime_path), str(journal_path), _journal_base_state())
+    append_runtime_journal(str(journal_path), [build_runtime_journal_record("nozzle_T0_legacy", "T0", 60, 1000)])
+    stale_journal = journal_path.read_text(encoding="utf-8")
+
+    # Simulate a crash after the snapshot was rewritten but before the journal was reset.
+    folded_state, _ = load_runtime_state_file(str(runtime_path), journal_path=str(journal_path))
+    compact_runtime_state_file(str(runtime_path), str(journal_path), folded_state)
+    journal_path.write_text(stale_journal, encoding="utf-8")
+
+    loaded_state, _ = load_runtime_state_file(str(runtime_path), journal_path=str(journal_path))
+
+    assert loaded_state["nozzle_runtime"]["nozzle_T0_legacy"]["accumulated_seconds"] == 160
+
+
+def test_runtime_journal_ignores_torn_trailing_record(tmp_path):
+    runtime_path = tmp_path / "runtime_state.json"
+    journal_path = tmp_path / "runtime_state.journal"
+
+    compact_runtime_state_file(str(runtime_path), str(journal_path), _journal_base_state())
+    append_runtime_journal(str(journal_path), [build_runtime_journal_record("nozzle_T0_legacy", "T0", 60, 1000)])
+    with open(journal_path, "a", encoding="utf-8") as handle:
+        handle.write('{"d":60,"n":"nozzle_T0_le')
+
+    loaded_state, status = load_runtime_state_file(str(runtime_path), journal_path=str(journal_path))
+
+    assert status == "loaded"
+    assert loaded_state["nozzle_runtime"]["nozzle_T0_legacy"]["accumulated_seconds"] == 160
+
+
+def test_runtime_state_file_is_compact_and_canonical_unless_pretty(tmp_path):
+    runtime_state = {
+        "tool_state": {
+            "T1": {"tool_id": "T1", "profile_id": "default_0_4_brass", "accumulated_seconds": 3},
+            "T0": {"tool_id": "T0", "accumulated_seconds": 12},
+        },
+        "nozzle_runtime": {"b": {"accumulated_seconds": "7.5"}, "a": {"accumulated_seconds": -4}, "c": None},
+    }
+    compact_path = tmp_path / "compact.json"
+    pretty_path = tmp_path / "pretty.json"
+
+    save_runtime_state_file(str(compact_path), runtime_state, journal_epoch="e1")
+    save_runtime_state_file(str(pretty_path), runtime_state, journal_epoch="e1", pretty=True)
+    _, compact_body = compact_path.read_text(encoding="utf-8").split("\n", 1)
+    _, pretty_body = pretty_path.read_text(encoding="utf-8").split("\n", 1)
+
+    expected = normalize_runtime_state(runtime_state)
+    expected["journal_epoch"] = "e1"
+    assert compact_body == json.dumps(expected, sort_keys=True, separators=(",", ":"))
+    assert pretty_body == json.dumps(expected, sort_keys=True, indent=2)
+    assert load_runtime_state_file(str(compact_path))[0] == load_runtime_state_file(str(pretty_path))[0]
+
+
+def test_runtime_state_view_encodes_published_records_without_copies(tmp_path):
+    runtime_path = tmp_path / "runtime_state.json"
+    tool_state = {"T0": ToolStateRecord({"tool_id": "T0", "profile_id": "p", "accumulated_seconds": 40})}
+    nozzles = PersistentMap(
+        {"n1": NozzleRecord({"id": "n1", "accumulated_seconds": 40, "metadata": {}, "retired": False})}
+    )
+
+    view = runtime_state_view(tool_state, nozzles)
+    save_runtime_state_file(str(runtime_path), view)
+    loaded, status = load_runtime_state_file(str(runtime_path))
+
+    assert view["nozzle_runtime"] is nozzles
+    assert status == "loaded"
+    assert loaded == {
+        "tool_state": {"T0": {"tool_id": "T0", "profile_id": "p", "accumulated_seconds": 40}},
+        "nozzle_runtime": {"n1": {"accumulated_seconds": 40}},
+    }
+
+
+def _generation_state(seconds):
+    return {"tool_state": {}, "nozzle_runtime": {"n1": {"accumulated_seconds": seconds}}}
+
+
+def _corrupt(path):
+    data = bytearray(path.read_bytes())
+    data[-5] ^= 0x01
+    path.write_bytes(bytes(data))
+
+
+def test_runtime_snapshots_rotate_through_generations(tmp_path):
+    runtime_path = tmp_path / "runtime_state.json"
+    assert load_runtime_state_generations(str(runtime_path))[1:] == ("missing", {"generation": None, "skipped": []})
+
+    written = [save_runtime_state_file(str(runtime_path), _generation_state(seconds)) for seconds in (1, 2, 3, 4)]
+    loaded, status, recovery = load_runtime_state_generations(str(runtime_path))
+
+    slots = runtime_snapshot_paths(str(runtime_path))
+    assert written == [slots[0], slots[1], slots[2], slots[0]]
+    assert status == "loaded"
+    assert recovery == {"generation": 3, "skipped": []}
+    assert loaded["nozzle_runtime"]["n1"]["accumulated_seconds"] == 4
+
+
+def test_runtime_snapshot_load_skips_corrupt_generations_to_the_newest_valid(tmp_path):
+    runtime_path = tmp_path / "runtime_state.json"
+    journal_path = tmp_path / "runtime_state.journal"
+    for seconds in (10, 20):
+        compact_runtime_state_file(str(runtime_path), str(journal_path), _generation_state(seconds))
+    newest = save_runtime_state_file(str(runtime_path), _generation_state(30))
+    _corrupt(tmp_path / os.path.basename(newest))
+
+    loaded, status, recovery = load_runtime_state_generations(str(runtime_path), journal_path=str(journal_path))
+
+    assert status == "loaded"
+    assert recovery == {"generation": 1, "skipped": ["runtime_state.2.json"]}
+    assert loaded["nozzle_runtime"]["n1"]["accumulated_seconds"] == 20
+    # The next write goes past the corrupt generation instead of over the one recovered.
+    assert save_runtime_state_file(str(runtime_path), loaded) == str(runtime_path)
+
+
+def test_runtime_snapshot_load_reports_malformed_when_no_generation_is_valid(tmp_path):
+    runtime_path = tmp_path / "runtime_state.json"
+    save_runtime_state_file(str(runtime_path), _generation_state(5))
+    save_runtime_state_file(str(runtime_path), _generation_state(6))
+    _corrupt(runtime_path)
+    (tmp_path / "runtime_state.1.json").write_bytes(b"\x00\x00garbage")
+
+    loaded, status, recovery = load_runtime_state_generations(str(runtime_path))
+
+    assert status == "malformed"
+    assert loaded == {"tool_state": {}, "nozzle_runtime": {}}
+    assert recovery == {"generation": None, "skipped": ["runtime_state.1.json", "runtime_state.json"]}
+
+
+def test_runtime_snapshot_without_header_loads_as_generation_zero(tmp_path):
+    runtime_path = tmp_path / "runtime_state.json"
+    runtime_path.write_text(json.dumps(_generation_state(7)), encoding="utf-8")
+
+    newer = save_runtime_state_file(str(runtime_path), _generation_state(8))
+    _corrupt(tmp_path / os.path.basename(newer))
+    loaded, status, recovery = load_runtime_state_generations(str(runtime_path))
+
+    assert newer.endswith("runtime_state.1.json")
+    assert status == "loaded"
+    assert recovery == {"generation": 0, "skipped": ["runtime_state.1.json"]}
+    assert loaded["nozzle_runtime"]["n1"]["accumulated_seconds"] == 7
+
+
+def test_plugin_surfaces_recovered_snapshot_generation_in_error_flags(tmp_path):
+    plugin = build_plugin(tmp_path)
+    with plugin._lock:
+        plugin._phase1_handle_print_start_or_resume_locked()
+        for _ in range(2):
+            plugin._phase1_tick_locked(now_ts=plugin._last_tick_ts + 30, persist_if_due=False)
+            plugin._save_runtime_state()
+    slots = runtime_snapshot_paths(str(tmp_path / "runtime_state.json"))
+    generations = {}
+    for slot_path in slots:
+        with open(slot_path, "rb") as handle:
+            generations[int(handle.readline().split()[1])] = slot_path
+    newest = max(generations)
+    assert build_plugin(tmp_path)._runtime_recovery_flags == {}
+    _corrupt(tmp_path / os.path.basename(generations[newest]))
+
+    reloaded = build_plugin(tmp_path)
+    with reloaded._lock:
+        _, payload = reloaded._get_api_status_locked()
+
+    assert reloaded._nozzles["nozzle_T0_legacy"]["accumulated_seconds"] == 30
+    assert payload["meta"]["error_flags"]["runtime_snapshot_recovered"] == {
+        "generation": newest - 1,
+        "skipped": [os.path.basename(generations[newest])],
+    }
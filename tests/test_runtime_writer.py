@@ -0,0 +1,244 @@
+import threading
+
+from octoprint_nozzlelifetracker.runtime_writer import RuntimeStateWriter
+from tests.conftest import FakeSettings, build_plugin
+
+
+class _BlockingSink(object):
+    def __init__(self):
+        self.events = []
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def write_snapshot(self, snapshot):
+        self.started.set()
+        self.release.wait(5)
+        self.events.append(("snapshot", snapshot))
+
+    def append_journal(self, records):
+        self.events.append(("journal", list(records)))
+
+
+def test_writer_keeps_only_newest_pending_snapshot():
+    sink = _BlockingSink()
+    writer = RuntimeStateWriter(sink.write_snapshot, sink.append_journal)
+    writer.start()
+    try:
+        writer.submit_snapshot({"v": 1})
+        assert sink.started.wait(5)
+        writer.submit_snapshot({"v": 2})
+        writer.submit_snapshot({"v": 3})
+        sink.release.set()
+
+        assert writer.flush(timeout=5) is True
+    finally:
+        writer.stop(timeout=5)
+
+    assert sink.events == [("snapshot", {"v": 1}), ("snapshot", {"v": 3})]
+
+
+def test_writer_snapshot_supersedes_queued_journal_records():
+    sink = _BlockingSink()
+    writer = RuntimeStateWriter(sink.write_snapshot, sink.append_journal)
+    writer.start()
+    try:
+        writer.submit_snapshot({"v": 1})
+        assert sink.started.wait(5)
+        writer.submit_journal([{"n": "a", "d": 5}])
+        writer.submit_snapshot({"v": 2})
+        writer.submit_journal([{"n": "a", "d": 7}])
+        sink.release.set()
+
+        assert writer.flush(timeout=5) is True
+    finally:
+        writer.stop(timeout=5)
+
+    assert sink.events == [
+        ("snapshot", {"v": 1}),
+        ("snapshot", {"v": 2}),
+        ("journal", [{"n": "a", "d": 7}]),
+    ]
+
+
+def test_writer_flush_times_out_while_write_is_blocked():
+    sink = _BlockingSink()
+    writer = RuntimeStateWriter(sink.write_snapshot, sink.append_journal)
+    writer.start()
+    try:
+        writer.submit_snapshot({"v": 1})
+        assert sink.started.wait(5)
+
+        assert writer.flush(timeout=0.05) is False
+
+        sink.release.set()
+        assert writer.flush(timeout=5) is True
+    finally:
+        writer.stop(timeout=5)
+
+
+def test_writer_reports_errors_and_keeps_running():
+    errors = []
+    written = []
+
+    def write_snapshot(snapshot):
+        if snapshot["v"] == 1:
+            raise OSError("disk full")
+        written.append(snapshot)
+
+    writer = RuntimeStateWriter(write_snapshot, lambda records: None, on_error=errors.append)
+    writer.start()
+    try:
+        writer.submit_snapshot({"v": 1})
+        assert writer.flush(timeout=5) is False
+        assert isinstance(writer.last_error(), OSError)
+        writer.submit_snapshot({"v": 2})
+        assert writer.flush(timeout=5) is True
+        assert writer.last_error() is None
+    finally:
+        writer.stop(timeout=5)
+
+    assert len(errors) == 1
+    assert isinstance(errors[0], OSError)
+    assert written == [{"v": 2}]
+
+
+def test_writer_keeps_a_failed_write_until_a_snapshot_supersedes_it():
+    fail = [True]
+    commits = []
+
+    def write_snapshot(snapshot):
+        if fail[0]:
+            raise OSError("disk full")
+
+    writer = RuntimeStateWriter(write_snapshot, lambda records: None, on_commit=commits.append)
+    writer.start()
+    try:
+        first = writer.submit_snapshot({"v": 1})
+        assert writer.flush(timeout=5) is False
+        fail[0] = False
+        # The records written here are deltas on top of the lost snapshot.
+        writer.submit_journal([{"n": "a", "d": 1}])
+        assert writer.flush(timeout=5) is False
+        last = writer.submit_snapshot({"v": 2})
+        assert writer.flush(timeout=5) is True
+    finally:
+        writer.stop(timeout=5)
+
+    assert first == 1
+    assert commits == [last]
+
+
+def test_writer_stop_drains_pending_work():
+    written = []
+    writer = RuntimeStateWriter(written.append, lambda records: None)
+    writer.start()
+    writer.submit_snapshot({"v": 1})
+    writer.stop(timeout=5)
+
+    assert written == [{"v": 1}]
+    assert writer.is_alive() is False
+
+
+def test_writer_group_commit_shares_one_write_across_a_burst():
+    written = []
+    journal = []
+    writer = RuntimeStateWriter(written.append, journal.append, commit_delay=30)
+    writer.start()
+    try:
+        writer.submit_snapshot({"v": 1})
+        writer.submit_journal([{"n": "a", "d": 1}])
+        writer.submit_snapshot({"v": 2})
+        writer.submit_journal([{"n": "a", "d": 2}])
+
+        assert written == []
+        assert writer.flush(timeout=5) is True
+    finally:
+        writer.stop(timeout=5)
+
+    stats = writer.stats()
+    assert written == [{"v": 2}]
+    assert journal == [[{"n": "a", "d": 2}]]
+    assert stats["commits"] == 1
+    assert stats["submissions"] == 4
+    assert stats["submissions_per_commit"] == 4.0
+    assert stats["commit_delay_ms"] == 30000.0
+
+
+def test_writer_stop_cuts_the_group_commit_wait_short():
+    written = []
+    writer = RuntimeStateWriter(written.append, lambda records: None, commit_delay=30)
+    writer.start()
+    writer.submit_snapshot({"v": 1})
+    writer.stop(timeout=5)
+
+    assert written == [{"v": 1}]
+    assert writer.is_alive() is False
+
+
+def test_plugin_durability_setting_maps_to_writer_commit_delay():
+    plugin = build_plugin(load=False)
+    plugin._runtime_writer = RuntimeStateWriter(lambda snapshot: None, lambda records: None)
+    delays = {}
+    for durability in ("strict", "group", "periodic", "bogus"):
+        plugin._settings = FakeSettings({"persist_durability": durability, "persist_group_commit_ms": 40})
+        plugin._load_persist_settings()
+        delays[durability] = plugin.get_persist_stats()["runtime"]["commit_delay_ms"]
+
+    assert delays == {"strict": 0.0, "group": 40.0, "periodic": 60000.0, "bogus": 40.0}
+    assert plugin.get_persist_stats()["durability"] == "group"
+    assert plugin.get_persist_stats()["inventory"] is None
+
+
+def _start_plugin_writer(tmp_path, write_snapshot):
+    plugin = build_plugin(tmp_path)
+    plugin._write_runtime_snapshot = write_snapshot
+    plugin._start_runtime_writer()
+    return plugin
+
+
+def test_plugin_clears_runtime_dirty_only_once_the_snapshot_is_written(tmp_path):
+    sink = _BlockingSink()
+    plugin = _start_plugin_writer(tmp_path, sink.write_snapshot)
+    try:
+        with plugin._lock:
+            plugin._phase1_runtime_dirty = True
+            assert plugin._save_phase1_settings(tool_state_only=True) is True
+        assert sink.started.wait(5)
+        assert plugin._phase1_runtime_dirty is True
+
+        sink.release.set()
+        assert plugin._flush_runtime_writer(timeout=5) is True
+        assert plugin._phase1_runtime_dirty is False
+    finally:
+        plugin._runtime_writer.stop(timeout=5)
+
+
+def test_plugin_reports_a_failed_runtime_write_and_skips_the_stable_save(tmp_path):
+    def write_snapshot(snapshot):
+        raise OSError("disk full")
+
+    plugin = _start_plugin_writer(tmp_path, write_snapshot)
+    inventory_saves = []
+    plugin._save_inventory_state = lambda: inventory_saves.append(True)
+    try:
+        with plugin._lock:
+            plugin._phase1_runtime_dirty = True
+            plugin._save_phase1_settings(tool_state_only=True)
+        assert plugin._flush_runtime_writer(timeout=5) is False
+        assert plugin._phase1_runtime_dirty is True
+
+        with plugin._lock:
+            assert plugin._save_phase1_settings(tool_state_only=False) is False
+        assert inventory_saves == []
+    finally:
+        plugin._runtime_writer.stop(timeout=5)
+
+
+def test_plugin_shutdown_detects_a_failed_final_persist(tmp_path, caplog):
+    def write_snapshot(snapshot):
+        raise OSError("disk full")
+
+    plugin = _start_plugin_writer(tmp_path, write_snapshot)
+    plugin.on_shutdown()
+
+    assert "Runtime-state flush during shutdown did not complete" in caplog.text
@@ -0,0 +1,174 @@
+import random
+import threading
+
+from octoprint_nozzlelifetracker.state_snapshot import PersistentMap
+from tests.conftest import build_printing_plugin
+
+
+class _CollidingKey(object):
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return self.value % 3
+
+    def __eq__(self, other):
+        return isinstance(other, _CollidingKey) and other.value == self.value
+
+
+def test_persistent_map_matches_a_dict_under_random_updates():
+    rng = random.Random(7)
+    keys = ["n{}".format(index) for index in range(500)] + [_CollidingKey(index) for index in range(12)] + [-1, 2 ** 64]
+    expected = {}
+    current = PersistentMap()
+    for _ in range(20000):
+        key = rng.choice(keys)
+        previous, previous_expected = current, dict(expected)
+        if rng.random() < 0.3:
+            current = current.discard(key)
+            expected.pop(key, None)
+        else:
+            value = rng.random()
+            current = current.set(key, value)
+            expected[key] = value
+        assert len(current) == len(expected)
+        # The map an update was derived from is left untouched.
+        assert len(previous) == len(previous_expected)
+
+    assert dict(current.items()) == expected
+    assert all(current[key] == value for key, value in expected.items())
+    assert PersistentMap(expected) == current
+
+
+def test_persistent_map_update_shares_untouched_nodes():
+    base = PersistentMap(("n{}".format(index), index) for index in range(100000))
+    updated = base.set("n42", -1)
+
+    shared = sum(1 for left, right in zip(base._root, updated._root) if left is right)
+    assert shared == len(base._root) - 1
+    assert base["n42"] == 42
+    assert updated["n42"] == -1
+    assert base.set("n42", 42) is base
+
+
+def _build_plugin():
+    return build_printing_plugin(tools=2, last_tick_ts=0.0)
+
+
+def test_published_snapshot_is_immutable_and_replaces_only_changed_entries():
+    plugin = _build_plugin()
+    before = plugin._current_state_snapshot()
+
+    with plugin._lock:
+        plugin._phase1_tick_locked(now_ts=30.0, persist_if_due=False)
+    after = plugin._current_state_snapshot()
+
+    assert after is not before
+    assert before.nozzles["n0"]["accumulated_seconds"] == 0
+    assert after.nozzles["n0"]["accumulated_seconds"] == 30
+    assert after.nozzles["n1"] is before.nozzles["n1"]
+    assert after.tool_map is before.tool_map
+    assert plugin.get_api_status()["meta"]["active_nozzle"]["accumulated_seconds"] == 30
+
+
+
+def test_status_reads_the_published_nozzle_map_without_copying_it(monkeypatch):
+    plugin = _build_plugin()
+    plugin._current_state_snapshot()
+
+    def _copy_forbidden(self):
+        raise AssertionError("status copied the persistent nozzle map")
+
+    monkeypatch.setattr(PersistentMap, "items", _copy_forbidden)
+    status = plugin.get_api_status()
+
+    assert [entry["id"] for entry in status["nozzles"]] == ["n0", "n1"]
+    assert status["meta"]["active_nozzle"]["id"] == "n0"
+
+def test_readers_do_not_wait_for_a_writer_holding_the_lock():
+    plugin = _build_plugin()
+    plugin._current_state_snapshot()
+    results = []
+
+    with plugin._lock:
+        reader = threading.Thread(target=lambda: results.append(plugin.get_api_status()))
+        reader.start()
+        reader.join(timeout=5)
+
+    assert not reader.is_alive()
+    assert results[0]["meta"]["active_tool_id"] == "T0"
+
+
+def test_status_deltas_and_nozzle_queries_do_not_wait_for_a_writer():
+    plugin = _build_plugin()
+    base_version = plugin._current_state_snapshot().version
+    with plugin._lock:
+        plugin._phase1_tick_locked(now_ts=30.0, persist_if_due=False)
+    results = []
+
+    def _reader():
+        snapshot = plugin._current_state_snapshot()
+        results.append(plugin._snapshot_status_delta(snapshot, base_version)[1])
+        results.append(plugin.query_nozzles({"sort": "hours", "order": "desc"}))
+
+    with plugin._lock:
+        reader = threading.Thread(target=_reader)
+        reader.start()
+        reader.join(timeout=5)
+        finished_while_locked = not reader.is_alive()
+
+    assert finished_while_locked
+    delta, page = results
+    assert delta["full"] is False
+    assert [entry["id"] for entry in delta["nozzles"]["upsert"]] == ["n0"]
+    assert [entry["id"] for entry in page["nozzles"]] == ["n0", "n1"]
+
+
+def test_nozzle_queries_follow_published_snapshots():
+    plugin = _build_plugin()
+    assert [entry["id"] for entry in plugin.query_nozzles({"sort": "hours"})["nozzles"]] == ["n0", "n1"]
+
+    with plugin._lock:
+        plugin._phase1_handle_tool_change_locked("T1", now_ts=0.0)
+        plugin._phase1_tick_locked(now_ts=30.0, persist_if_due=False)
+    page = plugin.query_nozzles({"sort": "hours"})
+
+    assert [entry["id"] for entry in page["nozzles"]] == ["n0", "n1"]
+    assert [entry["accumulated_seconds"] for entry in page["nozzles"]] == [0, 30]
+    with plugin._lock:
+        plugin._nozzles["n0"]["accumulated_seconds"] = 100
+        plugin._record_status_change_locked(nozzle_ids=("n0",))
+    assert [entry["id"] for entry in plugin.query_nozzles({"sort": "hours"})["nozzles"]] == ["n1", "n0"]
+
+def test_concurrent_readers_always_see_consistent_snapshots():
+    plugin = _build_plugin()
+    stop = threading.Event()
+    failures = []
+
+    def _reader():
+        while not stop.is_set():
+            status = plugin.get_api_status()
+            nozzles = {entry["id"]: entry for entry in status["nozzles"]}
+            for tool in status["tools"]:
+                # A tool row is derived from its nozzle; a torn read would split them.
+                if tool["accumulated_seconds"] != nozzles[tool["active_nozzle_id"]]["accumulated_seconds"]:
+                    failures.append(status)
+
+    readers = [threading.Thread(target=_reader) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    now_ts = 0.0
+    for step in range(2000):
+        now_ts += 1.0
+        with plugin._lock:
+            if step % 7 == 0:
+                plugin._phase1_handle_tool_change_locked("T1" if plugin._active_tool_id == "T0" else "T0", now_ts=now_ts)
+            else:
+                plugin._phase1_tick_locked(now_ts=now_ts, persist_if_due=False)
+    stop.set()
+    for reader in readers:
+        reader.join(timeout=5)
+
+    assert failures == []
+    final = plugin.get_api_status()
+    assert sum(entry["accumulated_seconds"] for entry in final["nozzles"]) == 2000
@@ -0,0 +1,55 @@
+from tests.conftest import build_printing_plugin
+
+
+class _FakePluginManager(object):
+    def __init__(self):
+        self.messages = []
+
+    def send_plugin_message(self, identifier, message):
+        self.messages.append((identifier, message))
+
+
+def _build_plugin():
+    plugin = build_printing_plugin(last_tick_ts=0.0)
+    plugin._identifier = "nozzlelifetracker"
+    plugin._plugin_manager = _FakePluginManager()
+    return plugin
+
+
+def test_publish_status_update_is_idle_without_changes():
+    plugin = _build_plugin()
+
+    assert plugin._publish_status_update(now_ts=100.0) is False
+    assert plugin._plugin_manager.messages == []
+
+
+def test_publish_status_update_coalesces_ticks_into_one_delta():
+    plugin = _build_plugin()
+    plugin._publish_status_update(now_ts=0.0)
+    for now_ts in (5.0, 10.0, 15.0):
+        plugin._phase1_tick_locked(now_ts=now_ts, persist_if_due=False)
+
+    assert plugin._publish_status_update(now_ts=100.0) is True
+
+    identifier, message = plugin._plugin_manager.messages[-1]
+    assert identifier == "nozzlelifetracker"
+    assert message["type"] == "status"
+    assert message["full"] is False
+    assert message["since"] == 0
+    assert message["version"] == plugin._status_version
+    assert [n["accumulated_seconds"] for n in message["nozzles"]["upsert"]] == [15]
+
+
+def test_publish_status_update_is_throttled_to_max_rate():
+    plugin = _build_plugin()
+    plugin._status_push_min_interval = 2.0
+    plugin._phase1_tick_locked(now_ts=5.0, persist_if_due=False)
+    assert plugin._publish_status_update(now_ts=100.0) is True
+
+    plugin._phase1_tick_locked(now_ts=10.0, persist_if_due=False)
+    assert plugin._publish_status_update(now_ts=101.0) is False
+    assert plugin._status_push_delay_locked(101.0) == 1.0
+    assert plugin._publish_status_update(now_ts=102.0) is True
+
+    assert len(plugin._plugin_manager.messages) == 2
+    assert plugin._plugin_manager.messages[-1][1]["since"] == plugin._plugin_manager.messages[0][1]["version"]
@@ -0,0 +1,93 @@
+import time
+
+from octoprint_nozzlelifetracker import PHASE1_PERSIST_INTERVAL_SECONDS
+from tests.conftest import build_plugin, build_printing_plugin
+
+
+def _build_plugin(mode="tickless"):
+    return build_printing_plugin(settings={"accounting_mode": mode})
+
+
+def test_status_read_shows_the_open_interval_live_without_settling_it():
+    plugin = _build_plugin()
+    opened_at = time.monotonic() - 12.75
+    with plugin._lock:
+        plugin._last_tick_ts = opened_at
+        plugin._runtime_carry_units[("n", "n0")] = 500000
+    snapshot = plugin._current_state_snapshot()
+
+    status = plugin.get_api_status()
+
+    assert status["nozzles"][0]["accumulated_seconds"] == 13
+    assert status["tools"][0]["accumulated_seconds"] == 13
+    assert status["meta"]["active_nozzle"]["accumulated_seconds"] == 13
+    # Reads leave the counters, the interval and the published generation alone.
+    assert plugin._nozzles["n0"]["accumulated_seconds"] == 0
+    assert plugin._last_tick_ts == opened_at
+    assert plugin._current_state_snapshot() is snapshot
+
+
+def test_status_etag_follows_the_live_seconds_of_an_open_interval():
+    plugin = _build_plugin()
+    with plugin._lock:
+        plugin._last_tick_ts = time.monotonic() - 5.5
+    snapshot = plugin._current_state_snapshot()
+
+    first_etag = plugin._snapshot_status(snapshot)[0]
+    with plugin._lock:
+        plugin._last_tick_ts -= 10
+    second_etag = plugin._snapshot_status(plugin._current_state_snapshot())[0]
+
+    assert first_etag != second_etag
+    assert plugin._state_generation == snapshot.generation
+
+
+def test_settle_is_a_no_op_in_tick_mode_or_when_idle():
+    plugin = _build_plugin(mode="tick")
+    plugin._last_tick_ts = time.monotonic() - 30
+
+    with plugin._lock:
+        assert plugin._settle_open_interval_locked() == 0
+
+    plugin = _build_plugin()
+    plugin._is_printing = False
+    plugin._last_tick_ts = time.monotonic() - 30
+
+    with plugin._lock:
+        assert plugin._settle_open_interval_locked() == 0
+    assert plugin._nozzles["n0"]["accumulated_seconds"] == 0
+
+
+def test_worker_sleeps_until_the_persist_deadline_or_indefinitely_when_idle():
+    plugin = _build_plugin()
+    plugin._last_phase1_persist_ts = 1000.0
+
+    with plugin._lock:
+        assert plugin._tickless_deadline_locked(0.0) == 1000.0 + PHASE1_PERSIST_INTERVAL_SECONDS
+        # A settle that did not persist still pushes the deadline out.
+        assert plugin._tickless_deadline_locked(1100.0) == 1100.0 + PHASE1_PERSIST_INTERVAL_SECONDS
+        plugin._is_printing = False
+        assert plugin._tickless_deadline_locked(1100.0) is None
+
+
+def test_unknown_accounting_mode_falls_back_to_tick():
+    plugin = _build_plugin(mode="sometimes")
+
+    assert plugin._tickless_accounting is False
+
+
+def test_persist_interval_ignores_a_backward_wall_clock_step(tmp_path, monkeypatch):
+    plugin = build_plugin(tmp_path)
+    with plugin._lock:
+        plugin._is_printing = True
+        plugin._phase1_runtime_dirty = True
+        plugin._last_phase1_persist_ts = time.monotonic() - PHASE1_PERSIST_INTERVAL_SECONDS - 1
+    wall_clock = time.time()
+    monkeypatch.setattr(time, "time", lambda: wall_clock - 3600)
+
+    with plugin._lock:
+        assert plugin._maybe_persist_phase1_tool_state_locked(force=False) is True
+        deadline_ts = plugin._tickless_deadline_locked(0.0)
+
+    # Stamped on the monotonic clock, the next deadline is one interval out.
+    assert 0 < deadline_ts - time.monotonic() <= PHASE1_PERSIST_INTERVAL_SECONDS
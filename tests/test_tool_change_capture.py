@@ -0,0 +1,44 @@
+import time
+
+from tests.conftest import build_printing_plugin
+
+
+def _build_plugin():
+    return build_printing_plugin(tools=2)
+
+
+def test_hook_queues_tool_change_without_taking_the_plugin_lock():
+    plugin = _build_plugin()
+
+    with plugin._lock:
+        plugin.hook_gcode_queuing(None, "queuing", "T1", None, "T")
+        plugin.hook_gcode_queuing(None, "queuing", "G1 X10", None, "G1")
+
+    assert [tool_id for tool_id, _ in plugin._pending_tool_changes] == ["T1"]
+    assert plugin._active_tool_id == "T0"
+
+
+def test_drain_applies_tool_changes_at_their_capture_time():
+    plugin = _build_plugin()
+    plugin._last_tick_ts = time.monotonic() - 100
+    plugin._pending_tool_changes.append(("T1", time.monotonic() - 40))
+
+    with plugin._lock:
+        assert plugin._drain_tool_changes_locked() == 1
+        plugin._phase1_tick_locked(now_ts=time.monotonic(), persist_if_due=False)
+
+    assert plugin._active_tool_id == "T1"
+    assert 59 <= plugin._nozzles["n0"]["accumulated_seconds"] <= 60
+    assert 39 <= plugin._nozzles["n1"]["accumulated_seconds"] <= 40
+
+
+def test_late_drained_change_does_not_rewind_the_tick_clock():
+    plugin = _build_plugin()
+    plugin._last_tick_ts = time.monotonic()
+    plugin._pending_tool_changes.append(("T1", time.monotonic() - 30))
+
+    with plugin._lock:
+        plugin._drain_tool_changes_locked()
+
+    assert plugin._last_tick_ts >= time.monotonic() - 1
+    assert plugin._nozzles["n0"]["accumulated_seconds"] == 0
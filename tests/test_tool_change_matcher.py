@@ -0,0 +1,70 @@
+from octoprint_nozzlelifetracker.tool_change_matcher import ToolChangeMatcher, build_tool_change_matcher
+from tests.conftest import build_plugin
+
+
+PATTERNS = [
+    {"command": "ACTIVATE_EXTRUDER", "pattern": r"EXTRUDER=(\w+)", "tools": {"extruder": "T0", "extruder1": "T1"}},
+    {"command": "SELECT_TOOL", "pattern": r"T=(\d+)"},
+    {"command": "M1001", "tool": "t3"},
+]
+
+
+def test_default_matcher_only_recognizes_bare_tool_numbers():
+    matcher = ToolChangeMatcher()
+
+    assert matcher.match("T1") == "T1"
+    assert matcher.match("  t02 ; comment") == "T2"
+    assert matcher.match("T1 S2") is None
+    assert matcher.match("SELECT_TOOL T=2") is None
+    assert matcher.gcodes == frozenset({"T"})
+
+
+def test_configured_patterns_map_macros_to_tool_ids():
+    matcher, errors = build_tool_change_matcher(PATTERNS)
+
+    assert errors == []
+    assert matcher.match("ACTIVATE_EXTRUDER EXTRUDER=extruder1") == "T1"
+    assert matcher.match("activate_extruder EXTRUDER=extruder") == "T0"
+    assert matcher.match("ACTIVATE_EXTRUDER EXTRUDER=extruder7") is None
+    assert matcher.match("SELECT_TOOL T=2") == "T2"
+    assert matcher.match("M1001") == "T3"
+    assert matcher.match("ACTIVATE_EXTRUDER EXTRUDER=\u00b2") is None
+    assert matcher.match("T\u0661") is None
+    assert matcher.match("M10011") is None
+    assert matcher.match("T4") == "T4"
+    assert {"M1001", "SELECT_TOOL", "T"} <= matcher.gcodes
+    assert {"A", "s", "M"} <= matcher.first_chars
+
+
+def test_invalid_patterns_are_reported_and_skipped():
+    matcher, errors = build_tool_change_matcher(
+        [
+            {"command": "BAD CMD", "tool": "T1"},
+            {"command": "SELECT_TOOL", "pattern": "T=("},
+            {"command": "SELECT_TOOL", "pattern": r"(?P<x>\d)"},
+            {"command": "SELECT_TOOL", "pattern": r"(\d)(\d)"},
+            {"command": "PARK"},
+            "nonsense",
+            {"command": "M1001", "tool": "T1"},
+        ]
+    )
+
+    assert len(errors) == 6
+    assert matcher.match("M1001") == "T1"
+    assert matcher.match("SELECT_TOOL T=2") is None
+
+
+def test_hook_queues_macro_tool_changes_from_settings():
+    plugin = build_plugin(settings={"tool_change_patterns": PATTERNS}, load=False)
+    plugin._load_tool_change_settings()
+
+    for cmd, gcode in (
+        ("G1 X1 Y2 E0.1", "G1"),
+        ("ACTIVATE_EXTRUDER EXTRUDER=extruder1", None),
+        ("M1001", "M1001"),
+        ("M104 S200", "M104"),
+        ("SELECT_TOOL T=0", None),
+    ):
+        plugin.hook_gcode_queuing(None, "queuing", cmd, None, gcode)
+
+    assert [tool_id for tool_id, _ in plugin._pending_tool_changes] == ["T1", "T3", "T0"]